@@ -0,0 +1,7 @@
+"""Performance benchmarks for the reservation system.
+
+Run ``python -m benchmarks run --size 10k --output results.json`` to
+time every public ``ReservationSystem`` method against each storage
+mode, and ``python -m benchmarks compare baseline.json results.json`` to
+fail when a result regressed past a threshold.
+"""
@@ -0,0 +1,70 @@
+"""Command-line entry point: ``python -m benchmarks run|compare``."""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from benchmarks.compare import DEFAULT_METRICS, METRICS, compare, load_report
+from benchmarks.generator import parse_size
+from benchmarks.runner import MODES, run_suite, write_report
+
+
+def _run(args: argparse.Namespace) -> int:
+    report = run_suite(
+        parse_size(args.size), args.modes.split(","), args.iterations,
+        cached=not args.uncached, seed_value=args.seed)
+    write_report(report, Path(args.output))
+    for result in report["results"]:
+        print(
+            f"{result['mode']:>8} {result['case']:<31} "
+            f"p50 {result['p50_us']:>10.1f}us "
+            f"p99 {result['p99_us']:>10.1f}us "
+            f"{result['ops_per_sec']:>10.1f} ops/s "
+            f"{result['peak_bytes']:>10} B")
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    regressions = compare(
+        load_report(Path(args.baseline)), load_report(Path(args.current)),
+        args.threshold, tuple(args.metrics.split(",")))
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if regressions:
+        return 1
+    print("No regressions.")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse arguments and run the requested command."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the suite")
+    run.add_argument("--size", default="1k",
+                     help="1k, 10k, 100k, 1m or a reservation count")
+    run.add_argument("--modes", default=",".join(MODES))
+    run.add_argument("--iterations", type=int, default=200)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--uncached", action="store_true")
+    run.add_argument("--output", default="benchmark-results.json")
+    run.set_defaults(handler=_run)
+
+    check = commands.add_parser(
+        "compare", help="fail if current regressed against baseline")
+    check.add_argument("baseline")
+    check.add_argument("current")
+    check.add_argument("--threshold", type=float, default=0.25)
+    check.add_argument(
+        "--metrics", default=",".join(DEFAULT_METRICS),
+        help=f"comma-separated subset of {', '.join(METRICS)}")
+    check.set_defaults(handler=_compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
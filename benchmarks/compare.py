@@ -0,0 +1,59 @@
+"""Compare two benchmark reports and flag regressions."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+# Metric name -> True when a higher value is better.
+METRICS = {
+    "p50_us": False,
+    "p99_us": False,
+    "ops_per_sec": True,
+    "peak_bytes": False,
+}
+DEFAULT_METRICS = ("p50_us", "ops_per_sec")
+
+
+def load_report(path: Path) -> dict[str, Any]:
+    """Read a report written by ``benchmarks run``."""
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def _by_key(report: dict[str, Any]) -> dict[tuple[str, str], dict]:
+    return {(r["mode"], r["case"]): r for r in report["results"]}
+
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float = 0.25,
+    metrics: tuple[str, ...] = DEFAULT_METRICS,
+) -> list[str]:
+    """Return one message per metric that got worse by more than
+    ``threshold`` (a fraction of the baseline value).
+
+    Cases missing from either report are ignored.
+    """
+    for metric in metrics:
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}.")
+
+    regressions = []
+    old_results = _by_key(baseline)
+    for key, new in _by_key(current).items():
+        old = old_results.get(key)
+        if old is None:
+            continue
+        for metric in metrics:
+            before, after = old[metric], new[metric]
+            if not before:
+                continue
+            change = (after - before) / before
+            if METRICS[metric]:
+                change = -change
+            if change > threshold:
+                regressions.append(
+                    f"{key[0]}/{key[1]} {metric}: {before:g} -> {after:g} "
+                    f"({change:+.0%} worse)")
+    return regressions
@@ -0,0 +1,76 @@
+"""Deterministic synthetic datasets for the benchmarks."""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from reservation_system.models import Customer, Hotel, Reservation
+
+SIZES = {
+    "1k": 1_000,
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+ROOMS_PER_HOTEL = 100
+LOCATIONS = (
+    "CDMX", "Monterrey", "Guadalajara", "Puebla", "Cancun", "Merida",
+    "Oaxaca", "Tijuana")
+FIRST_DAY = date(2025, 1, 1)
+
+
+@dataclass
+class Dataset:
+    """Hotels, customers and reservations of one generated size."""
+    hotels: list[Hotel] = field(default_factory=list)
+    customers: list[Customer] = field(default_factory=list)
+    reservations: list[Reservation] = field(default_factory=list)
+
+
+def parse_size(size: str) -> int:
+    """Return the reservation count for a size name such as ``10k``."""
+    key = size.strip().lower()
+    if key in SIZES:
+        return SIZES[key]
+    try:
+        return int(key)
+    except ValueError as exc:
+        raise ValueError(f"Unknown dataset size: {size}.") from exc
+
+
+def generate(rows: int, seed: int = 0) -> Dataset:
+    """Build a dataset with ``rows`` reservations.
+
+    There is one hotel per 100 reservations and one customer per ten.
+    Every reservation is a dated stay of one to seven nights placed right
+    after the previous stay of its room, so none of them overlap. The
+    same rows and seed always produce the same dataset.
+    """
+    rng = random.Random(seed)
+    hotel_count = max(1, rows // 100)
+    customer_count = max(1, rows // 10)
+
+    dataset = Dataset()
+    for number in range(hotel_count):
+        dataset.hotels.append(Hotel(
+            f"H{number:07d}", f"Hotel {number}", ROOMS_PER_HOTEL,
+            LOCATIONS[number % len(LOCATIONS)]))
+    for number in range(customer_count):
+        dataset.customers.append(Customer(
+            f"C{number:07d}", f"Customer {number}",
+            f"customer{number}@example.com"))
+
+    next_free: dict[tuple[int, int], date] = {}
+    for number in range(rows):
+        hotel = rng.randrange(hotel_count)
+        room = rng.randrange(ROOMS_PER_HOTEL) + 1
+        check_in = next_free.get((hotel, room), FIRST_DAY)
+        check_out = check_in + timedelta(days=rng.randint(1, 7))
+        next_free[(hotel, room)] = check_out
+        dataset.reservations.append(Reservation(
+            f"R{number:08d}", f"H{hotel:07d}",
+            f"C{rng.randrange(customer_count):07d}", room,
+            check_in, check_out))
+    return dataset
@@ -0,0 +1,307 @@
+"""Time every public ReservationSystem method against each storage mode."""
+from __future__ import annotations
+
+import json
+import math
+import platform
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+from benchmarks.generator import FIRST_DAY, Dataset, generate
+from reservation_system.backends import (
+    RESERVATIONS,
+    SegmentStorage,
+    ShardedStorage,
+    SnapshotStorage,
+    SQLiteStorage,
+    Storage,
+)
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+
+BENCH_HOTEL = "HBENCH"
+BATCH = 100
+
+MODES: dict[str, Callable[[Path], Storage | None]] = {
+    "json": lambda path: None,
+    "journal": lambda path: None,
+    "sqlite": lambda path: SQLiteStorage(path / "reservations.db"),
+    "snapshot": SnapshotStorage,
+    "sharded": ShardedStorage,
+    "segments": SegmentStorage,
+}
+
+
+@dataclass
+class Result:
+    """Latency, throughput and memory of one case in one mode."""
+    mode: str
+    case: str
+    iterations: int
+    p50_us: float
+    p99_us: float
+    ops_per_sec: float
+    peak_bytes: int
+
+
+@dataclass
+class Case:
+    """One benchmarked call; ``operation(system, data, i)`` runs it once.
+
+    ``limit`` caps the iterations of calls that are O(n) by design.
+    """
+    name: str
+    operation: Callable[[ReservationSystem, Dataset, int], Any]
+    limit: int | None = None
+
+
+def _pick(items: list[Any], i: int) -> Any:
+    return items[(i * 7919) % len(items)]
+
+
+def _stay(i: int) -> dict[str, Any]:
+    check_in = FIRST_DAY + timedelta(days=i % 30)
+    return {"check_in": check_in, "check_out": check_in + timedelta(days=3)}
+
+
+def _hotel(i: int) -> Hotel:
+    return Hotel(f"HB{i:07d}", f"Bench {i}", 10, "Bench")
+
+
+def _customer(i: int) -> Customer:
+    return Customer(f"CB{i:07d}", f"Bench {i}", f"bench{i}@example.com")
+
+
+def _reservation(data: Dataset, i: int) -> Reservation:
+    return Reservation(
+        f"RB{i:08d}", BENCH_HOTEL, data.customers[0].customer_id, i + 1)
+
+
+def _batch(factory: Callable[[int], Any], i: int) -> list[Any]:
+    return [factory(i * BATCH + n) for n in range(BATCH)]
+
+
+def _group(system: ReservationSystem, data: Dataset, i: int) -> Any:
+    hotel = _pick(data.hotels, i)
+    return system.run_group([
+        partial(system.modify_hotel_information, hotel.hotel_id,
+                name=f"Group {i}.{n}")
+        for n in range(10)])
+
+
+def _resize(system: ReservationSystem, data: Dataset, i: int) -> Any:
+    # Only ever grows hotels, so no booking is stranded.
+    hotels = [_pick(data.hotels, i * 10 + n) for n in range(10)]
+    return system.resize_hotels(
+        {hotel.hotel_id: hotel.rooms + 1 + i % 2 for hotel in hotels})
+
+
+# ``close`` and ``transaction`` have no case of their own: ``open``
+# covers the system's lifecycle and ``run_group`` the grouped commit.
+CASES: tuple[Case, ...] = (
+    Case("display_hotel_info", lambda s, d, i: s.display_hotel_info(
+        _pick(d.hotels, i).hotel_id)),
+    Case("display_customer_info", lambda s, d, i: s.display_customer_info(
+        _pick(d.customers, i).customer_id)),
+    Case("list_reservations_for_hotel",
+         lambda s, d, i: s.list_reservations_for_hotel(
+             _pick(d.hotels, i).hotel_id)),
+    Case("list_reservations_for_customer",
+         lambda s, d, i: s.list_reservations_for_customer(
+             _pick(d.customers, i).customer_id)),
+    Case("free_rooms", lambda s, d, i: s.free_rooms(
+        _pick(d.hotels, i).hotel_id, 10)),
+    Case("count_free_rooms", lambda s, d, i: s.count_free_rooms(
+        _pick(d.hotels, i).hotel_id, **_stay(i))),
+    Case("find_available_hotels",
+         lambda s, d, i: s.find_available_hotels(
+             _pick(d.hotels, i).location, **_stay(i)), limit=20),
+    Case("hotel_occupancy", lambda s, d, i: s.hotel_occupancy(
+        _pick(d.hotels, i).hotel_id)),
+    Case("location_occupancy", lambda s, d, i: s.location_occupancy(
+        _pick(d.hotels, i).location)),
+    Case("customer_activity", lambda s, d, i: s.customer_activity(
+        _pick(d.customers, i).customer_id)),
+    Case("top_hotels", lambda s, d, i: s.top_hotels(10)),
+    Case("occupancy_report", lambda s, d, i: s.occupancy_report(),
+         limit=5),
+    Case("search_hotels", lambda s, d, i: s.search_hotels(
+        _pick(d.hotels, i).name[:4])),
+    Case("search_customers", lambda s, d, i: s.search_customers(
+        _pick(d.customers, i).name[:4])),
+    Case("iter_entities", lambda s, d, i: sum(
+        1 for _ in s.iter_entities(RESERVATIONS)), limit=5),
+    Case("modify_hotel_information",
+         lambda s, d, i: s.modify_hotel_information(
+             _pick(d.hotels, i).hotel_id, name=f"Renamed {i}")),
+    Case("modify_customer_information",
+         lambda s, d, i: s.modify_customer_information(
+             _pick(d.customers, i).customer_id, name=f"Renamed {i}")),
+    Case("resize_hotels", _resize, limit=20),
+    Case("run_group", _group, limit=50),
+    Case("create_hotel", lambda s, d, i: s.create_hotel(_hotel(i))),
+    Case("delete_hotel", lambda s, d, i: s.delete_hotel(_hotel(i).hotel_id)),
+    Case("create_customer", lambda s, d, i: s.create_customer(
+        _customer(i))),
+    Case("delete_customer", lambda s, d, i: s.delete_customer(
+        _customer(i).customer_id)),
+    Case("create_reservation", lambda s, d, i: s.create_reservation(
+        _reservation(d, i))),
+    Case("cancel_reservation", lambda s, d, i: s.cancel_reservation(
+        _reservation(d, i).reservation_id)),
+    Case("create_hotels", lambda s, d, i: s.create_hotels(
+        _batch(_hotel, i + 1_000_000)), limit=20),
+    Case("delete_hotels", lambda s, d, i: s.delete_hotels(
+        [h.hotel_id for h in _batch(_hotel, i + 1_000_000)]), limit=20),
+    Case("create_customers", lambda s, d, i: s.create_customers(
+        _batch(_customer, i + 1_000_000)), limit=20),
+    Case("delete_customers", lambda s, d, i: s.delete_customers(
+        [c.customer_id for c in _batch(_customer, i + 1_000_000)]),
+        limit=20),
+    Case("create_reservations", lambda s, d, i: s.create_reservations(
+        _batch(partial(_reservation, d), i + 10_000)), limit=20),
+    Case("cancel_reservations", lambda s, d, i: s.cancel_reservations([
+        r.reservation_id
+        for r in _batch(partial(_reservation, d), i + 10_000)]), limit=20),
+)
+
+
+def _percentile(samples: list[int], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    rank = max(1, math.ceil(fraction * len(samples)))
+    return samples[rank - 1] / 1000
+
+
+def open_system(
+        mode: str, data_dir: Path, cached: bool) -> ReservationSystem:
+    """Open a ReservationSystem on data_dir using a storage mode."""
+    return ReservationSystem(
+        str(data_dir), cached=cached, journal=mode == "journal",
+        storage=MODES[mode](data_dir))
+
+
+def seed(system: ReservationSystem, data: Dataset) -> None:
+    """Load a dataset into an empty system with one commit per collection."""
+    system.create_hotels(
+        data.hotels + [Hotel(BENCH_HOTEL, "Bench", 10_000_000, "Bench")])
+    system.create_customers(data.customers)
+    system.create_reservations(data.reservations)
+
+
+def _measure(
+    call: Callable[[int], Any],
+    mode: str,
+    name: str,
+    iterations: int,
+    memory_iterations: int,
+) -> Result:
+    samples = []
+    started = time.perf_counter_ns()
+    for i in range(iterations):
+        before = time.perf_counter_ns()
+        call(i)
+        samples.append(time.perf_counter_ns() - before)
+    elapsed = time.perf_counter_ns() - started
+
+    # tracemalloc slows allocation down a lot, so memory is measured on
+    # separate iterations that are not timed.
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        for i in range(iterations, iterations + memory_iterations):
+            call(i)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+    samples.sort()
+    return Result(
+        mode=mode,
+        case=name,
+        iterations=iterations,
+        p50_us=_percentile(samples, 0.50),
+        p99_us=_percentile(samples, 0.99),
+        ops_per_sec=iterations / (elapsed / 1e9) if elapsed else 0.0,
+        peak_bytes=max(0, peak),
+    )
+
+
+def run_mode(
+    mode: str,
+    data: Dataset,
+    iterations: int,
+    cached: bool = True,
+    memory_iterations: int = 5,
+    cases: tuple[Case, ...] = CASES,
+) -> list[Result]:
+    """Seed a fresh directory and run every case against one mode."""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        seeder = open_system(mode, data_dir, cached=True)
+        seed(seeder, data)
+        seeder.close()
+
+        opened: list[ReservationSystem] = []
+
+        def open_and_query(i: int) -> None:
+            system = open_system(mode, data_dir, cached)
+            opened.append(system)
+            system.display_hotel_info(_pick(data.hotels, i).hotel_id)
+
+        results = [_measure(
+            open_and_query, mode, "open", min(iterations, 3),
+            min(memory_iterations, 1))]
+        for system in opened:
+            system.close()
+
+        system = open_system(mode, data_dir, cached)
+        system.display_hotel_info(data.hotels[0].hotel_id)
+        try:
+            for case in cases:
+                count = min(iterations, case.limit or iterations)
+                results.append(_measure(
+                    partial(case.operation, system, data), mode, case.name,
+                    count, min(memory_iterations, count)))
+        finally:
+            system.close()
+        return results
+
+
+def run_suite(
+    rows: int,
+    modes: list[str],
+    iterations: int = 200,
+    cached: bool = True,
+    seed_value: int = 0,
+) -> dict[str, Any]:
+    """Run every mode on one generated dataset and return a report."""
+    for mode in modes:
+        if mode not in MODES:
+            raise ValueError(f"Unknown storage mode: {mode}.")
+    data = generate(rows, seed_value)
+    results = []
+    for mode in modes:
+        results += run_mode(mode, data, iterations, cached)
+    return {
+        "meta": {
+            "rows": rows,
+            "seed": seed_value,
+            "iterations": iterations,
+            "cached": cached,
+            "modes": modes,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+
+def write_report(report: dict[str, Any], path: Path) -> None:
+    """Write a report as pretty-printed JSON."""
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
@@ -0,0 +1,202 @@
+"""asyncio front-end with a single writer and group commit."""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import partial
+from typing import Any, Callable
+
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+
+_STOP = object()
+
+
+class AsyncReservationSystem:
+    """Serve a thread-safe ``ReservationSystem`` to asyncio code.
+
+    Reads run on a pool of reader threads, so one that has to wait (say
+    to reload after another process wrote, which waits for the commit in
+    progress) never stalls the event loop. Writes are queued and
+    applied in order by one writer thread, which gathers everything that
+    arrives within ``max_delay`` seconds (up to ``max_batch`` calls) and
+    persists it with one ``run_group`` commit. A caller's coroutine
+    returns only after the commit holding its change is on disk.
+
+    Use as ``async with AsyncReservationSystem(system) as service: ...``.
+    """
+
+    def __init__(
+        self,
+        system: ReservationSystem,
+        max_delay: float = 0.005,
+        max_batch: int = 256,
+    ) -> None:
+        if not system.thread_safe:
+            raise ValueError(
+                "AsyncReservationSystem needs a thread_safe system.")
+        self.system = system
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue[Any] | None = None
+        self._writer: asyncio.Task[None] | None = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="reservation-writer")
+        self._readers = ThreadPoolExecutor(
+            thread_name_prefix="reservation-reader")
+
+    async def __aenter__(self) -> "AsyncReservationSystem":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    def start(self) -> None:
+        """Start the writer task on the running event loop."""
+        if self._writer is None:
+            self._queue = asyncio.Queue()
+            self._writer = asyncio.get_running_loop().create_task(
+                self._write_loop())
+
+    async def close(self) -> None:
+        """Commit everything queued so far and stop the writer."""
+        if self._writer is not None and self._queue is not None:
+            await self._queue.put(_STOP)
+            await self._writer
+            self._writer = None
+        self._executor.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+
+    # ---------- Reads ----------
+    async def display_hotel_info(self, hotel_id: str) -> Hotel:
+        """Return hotel info."""
+        return await self._read(self.system.display_hotel_info, hotel_id)
+
+    async def display_customer_info(self, customer_id: str) -> Customer:
+        """Return customer info."""
+        return await self._read(
+            self.system.display_customer_info, customer_id)
+
+    async def list_reservations_for_hotel(
+            self, hotel_id: str) -> list[Reservation]:
+        """Return the reservations of a hotel."""
+        return await self._read(
+            self.system.list_reservations_for_hotel, hotel_id)
+
+    async def list_reservations_for_customer(
+            self, customer_id: str) -> list[Reservation]:
+        """Return the reservations of a customer."""
+        return await self._read(
+            self.system.list_reservations_for_customer, customer_id)
+
+    async def free_rooms(
+        self,
+        hotel_id: str,
+        limit: int | None = None,
+        check_in: date | None = None,
+        check_out: date | None = None,
+    ) -> list[int]:
+        """Return the free rooms of a hotel."""
+        return await self._read(
+            self.system.free_rooms, hotel_id, limit, check_in, check_out)
+
+    async def _read(self, method: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._readers, partial(method, *args))
+
+    # ---------- Writes ----------
+    async def create_hotel(self, hotel: Hotel) -> None:
+        """Create a new hotel."""
+        await self._submit(self.system.create_hotel, hotel)
+
+    async def delete_hotel(self, hotel_id: str) -> None:
+        """Delete hotel by ID (and its reservations)."""
+        await self._submit(self.system.delete_hotel, hotel_id)
+
+    async def modify_hotel_information(
+            self, hotel_id: str, **fields: Any) -> None:
+        """Modify hotel fields."""
+        await self._submit(
+            self.system.modify_hotel_information, hotel_id, **fields)
+
+    async def create_customer(self, customer: Customer) -> None:
+        """Create a new customer."""
+        await self._submit(self.system.create_customer, customer)
+
+    async def delete_customer(self, customer_id: str) -> None:
+        """Delete customer by ID (and its reservations)."""
+        await self._submit(self.system.delete_customer, customer_id)
+
+    async def modify_customer_information(
+            self, customer_id: str, **fields: Any) -> None:
+        """Modify customer fields."""
+        await self._submit(
+            self.system.modify_customer_information, customer_id, **fields)
+
+    async def create_reservation(self, reservation: Reservation) -> None:
+        """Create a reservation if possible."""
+        await self._submit(self.system.create_reservation, reservation)
+
+    async def cancel_reservation(self, reservation_id: str) -> None:
+        """Cancel reservation by ID."""
+        await self._submit(self.system.cancel_reservation, reservation_id)
+
+    # ---------- Writer ----------
+    async def _submit(
+        self,
+        method: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        if self._queue is None:
+            raise ValueError("AsyncReservationSystem is not started.")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((partial(method, *args, **kwargs), future))
+        return await future
+
+    async def _write_loop(self) -> None:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._commit(batch)
+
+    async def _commit(self, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        loop = asyncio.get_running_loop()
+        operations = [operation for operation, _ in batch]
+        try:
+            outcomes = await loop.run_in_executor(
+                self._executor, self.system.run_group, operations)
+        except Exception as exc:  # pylint: disable=broad-except
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, future), outcome in zip(batch, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
@@ -0,0 +1,286 @@
+"""Occupancy and booking aggregates kept in step with every write."""
+from __future__ import annotations
+
+import heapq
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from reservation_system.indexes import normalize_location
+from reservation_system.models import Hotel, Reservation
+from reservation_system.table import ReservationTable
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None  # type: ignore[assignment]
+
+
+@dataclass(frozen=True)
+class Occupancy:
+    """Rooms, rooms with bookings, bookings and booked nights."""
+    rooms: int = 0
+    occupied: int = 0
+    bookings: int = 0
+    nights: int = 0
+
+    @property
+    def rate(self) -> float:
+        """Return the share of rooms holding at least one booking."""
+        return self.occupied / self.rooms if self.rooms else 0.0
+
+
+@dataclass(frozen=True)
+class Activity:
+    """Bookings and booked nights of one customer."""
+    bookings: int = 0
+    nights: int = 0
+
+
+@dataclass
+class OccupancyReport:
+    """Every aggregate at one point in time."""
+    hotels: dict[str, Occupancy] = field(default_factory=dict)
+    locations: dict[str, Occupancy] = field(default_factory=dict)
+    customers: dict[str, Activity] = field(default_factory=dict)
+    top_hotels: list[tuple[str, int]] = field(default_factory=list)
+
+
+def nights(reservation: Reservation) -> int:
+    """Return the nights of a dated stay; undated reservations count 0."""
+    if reservation.check_in is None or reservation.check_out is None:
+        return 0
+    return (reservation.check_out - reservation.check_in).days
+
+
+@dataclass
+class _Totals:
+    hotel_bookings: Counter[str] = field(default_factory=Counter)
+    hotel_nights: Counter[str] = field(default_factory=Counter)
+    customer_bookings: Counter[str] = field(default_factory=Counter)
+    customer_nights: Counter[str] = field(default_factory=Counter)
+    # hotel_id -> room -> bookings of that room.
+    room_bookings: dict[str, Counter[int]] = field(default_factory=dict)
+
+
+def _aggregate(table: ReservationTable) -> _Totals:
+    """Count a whole table at once, vectorized when NumPy is present."""
+    if np is None or not len(table):
+        return _aggregate_rows(table)
+
+    hotel_codes = np.frombuffer(table.hotel_codes, dtype=np.intc)
+    customer_codes = np.frombuffer(table.customer_codes, dtype=np.intc)
+    rooms = np.frombuffer(table.rooms, dtype=np.intc)
+    check_ins = np.frombuffer(table.check_ins, dtype=np.intc)
+    check_outs = np.frombuffer(table.check_outs, dtype=np.intc)
+    stays = np.where(
+        (check_ins != 0) & (check_outs != 0), check_outs - check_ins, 0)
+
+    totals = _Totals()
+    for codes, pool, bookings, nights_by in (
+            (hotel_codes, table.hotels.values,
+             totals.hotel_bookings, totals.hotel_nights),
+            (customer_codes, table.customers.values,
+             totals.customer_bookings, totals.customer_nights)):
+        counts = np.bincount(codes, minlength=len(pool))
+        summed = np.bincount(codes, weights=stays, minlength=len(pool))
+        for code in np.flatnonzero(counts).tolist():
+            bookings[pool[code]] = int(counts[code])
+            nights_by[pool[code]] = int(summed[code])
+
+    keys, counts = np.unique(
+        (hotel_codes.astype(np.int64) << 32) | rooms.astype(np.int64),
+        return_counts=True)
+    for key, count in zip(keys.tolist(), counts.tolist()):
+        hotel_id = table.hotels.values[key >> 32]
+        totals.room_bookings.setdefault(
+            hotel_id, Counter())[key & 0xFFFFFFFF] = count
+    return totals
+
+
+def _aggregate_rows(table: ReservationTable) -> _Totals:
+    totals = _Totals()
+    hotels = table.hotels.values
+    customers = table.customers.values
+    for hotel_code, customer_code, room, check_in, check_out in zip(
+            table.hotel_codes, table.customer_codes, table.rooms,
+            table.check_ins, table.check_outs):
+        hotel_id = hotels[hotel_code]
+        customer_id = customers[customer_code]
+        stay = check_out - check_in if check_in and check_out else 0
+        totals.hotel_bookings[hotel_id] += 1
+        totals.hotel_nights[hotel_id] += stay
+        totals.customer_bookings[customer_id] += 1
+        totals.customer_nights[customer_id] += stay
+        totals.room_bookings.setdefault(hotel_id, Counter())[room] += 1
+    return totals
+
+
+class OccupancyAnalytics:
+    """Running per-hotel, per-location and per-customer aggregates.
+
+    ``build`` counts a whole ``ReservationTable`` in one vectorized pass
+    (plain Python without NumPy); afterwards ``add``/``remove`` and
+    ``put_hotel``/``drop_hotel`` adjust the counters, so every read is a
+    dict lookup. A room counts as occupied while it holds at least one
+    booking and lies within the hotel's capacity, as in
+    ``OccupancyIndex``. Updates and reads run under ``lock``, since
+    writers holding different stripes share the location and customer
+    counters.
+    """
+
+    def __init__(self) -> None:
+        self.rooms: dict[str, int] = {}
+        self.locations: dict[str, str] = {}
+        self.occupied: Counter[str] = Counter()
+        self.location_rooms: Counter[str] = Counter()
+        self.location_occupied: Counter[str] = Counter()
+        self.location_bookings: Counter[str] = Counter()
+        self.location_nights: Counter[str] = Counter()
+        self._totals = _Totals()
+        self.lock = threading.RLock()
+
+    @classmethod
+    def build(
+        cls,
+        hotels: Iterable[Hotel],
+        table: ReservationTable,
+    ) -> "OccupancyAnalytics":
+        """Compute every aggregate from scratch."""
+        analytics = cls()
+        analytics._totals = _aggregate(table)
+        for hotel in hotels:
+            analytics.put_hotel(hotel)
+        return analytics
+
+    # ---------- Updates ----------
+    def put_hotel(self, hotel: Hotel) -> None:
+        """Add a hotel or apply a change to its capacity or location."""
+        with self.lock:
+            hotel_id = hotel.hotel_id
+            if hotel_id in self.rooms:
+                self._detach(hotel_id)
+            self.rooms[hotel_id] = hotel.rooms
+            self.locations[hotel_id] = normalize_location(hotel.location)
+            booked = self._totals.room_bookings.get(hotel_id, {})
+            self.occupied[hotel_id] = sum(
+                1 for room in booked if 0 < room <= hotel.rooms)
+            self._attach(hotel_id)
+
+    def drop_hotel(self, hotel_id: str) -> None:
+        """Forget a hotel; its bookings stay counted until removed."""
+        with self.lock:
+            if hotel_id not in self.rooms:
+                return
+            self._detach(hotel_id)
+            del self.rooms[hotel_id]
+            del self.locations[hotel_id]
+            del self.occupied[hotel_id]
+
+    def add(self, reservation: Reservation) -> None:
+        """Count a new reservation."""
+        with self.lock:
+            self._count(reservation, 1)
+
+    def remove(self, reservation: Reservation) -> None:
+        """Stop counting a reservation."""
+        with self.lock:
+            self._count(reservation, -1)
+
+    def _count(self, reservation: Reservation, sign: int) -> None:
+        totals = self._totals
+        hotel_id = reservation.hotel_id
+        stay = nights(reservation) * sign
+        _bump(totals.hotel_bookings, hotel_id, sign)
+        _bump(totals.hotel_nights, hotel_id, stay)
+        _bump(totals.customer_bookings, reservation.customer_id, sign)
+        _bump(totals.customer_nights, reservation.customer_id, stay)
+
+        booked = totals.room_bookings.setdefault(hotel_id, Counter())
+        before = booked[reservation.room]
+        _bump(booked, reservation.room, sign)
+        if not booked:
+            del totals.room_bookings[hotel_id]
+
+        location = self.locations.get(hotel_id)
+        if location is None:
+            return
+        self.location_bookings[location] += sign
+        self.location_nights[location] += stay
+        if 0 < reservation.room <= self.rooms[hotel_id] and (
+                (before == 0) != (before + sign == 0)):
+            self.occupied[hotel_id] += sign
+            self.location_occupied[location] += sign
+
+    def _attach(self, hotel_id: str) -> None:
+        location = self.locations[hotel_id]
+        self.location_rooms[location] += self.rooms[hotel_id]
+        self.location_occupied[location] += self.occupied[hotel_id]
+        self.location_bookings[location] += (
+            self._totals.hotel_bookings[hotel_id])
+        self.location_nights[location] += self._totals.hotel_nights[hotel_id]
+
+    def _detach(self, hotel_id: str) -> None:
+        location = self.locations[hotel_id]
+        for counter, value in (
+                (self.location_rooms, self.rooms[hotel_id]),
+                (self.location_occupied, self.occupied[hotel_id]),
+                (self.location_bookings,
+                 self._totals.hotel_bookings[hotel_id]),
+                (self.location_nights, self._totals.hotel_nights[hotel_id])):
+            _bump(counter, location, -value)
+
+    # ---------- Reads ----------
+    def hotel(self, hotel_id: str) -> Occupancy:
+        """Return the occupancy of one hotel."""
+        with self.lock:
+            return Occupancy(
+                self.rooms.get(hotel_id, 0), self.occupied[hotel_id],
+                self._totals.hotel_bookings[hotel_id],
+                self._totals.hotel_nights[hotel_id])
+
+    def location(self, location: str) -> Occupancy:
+        """Return the combined occupancy of the hotels at a location."""
+        with self.lock:
+            key = normalize_location(location)
+            return Occupancy(
+                self.location_rooms[key], self.location_occupied[key],
+                self.location_bookings[key], self.location_nights[key])
+
+    def customer(self, customer_id: str) -> Activity:
+        """Return the bookings and nights of one customer."""
+        with self.lock:
+            return Activity(
+                self._totals.customer_bookings[customer_id],
+                self._totals.customer_nights[customer_id])
+
+    def top_hotels(self, count: int) -> list[tuple[str, int]]:
+        """Return (hotel ID, bookings) of the most booked hotels."""
+        with self.lock:
+            bookings = self._totals.hotel_bookings
+            return heapq.nlargest(
+                count, ((h, bookings[h]) for h in self.rooms),
+                key=lambda item: item[1])
+
+    def report(self, top: int = 10) -> OccupancyReport:
+        """Return every aggregate."""
+        with self.lock:
+            return OccupancyReport(
+                hotels={h: self.hotel(h) for h in self.rooms},
+                locations={
+                    loc: self.location(loc) for loc in self.location_rooms},
+                customers={
+                    c: self.customer(c)
+                    for c in self._totals.customer_bookings},
+                top_hotels=self.top_hotels(top),
+            )
+
+
+def _bump(counter: Counter, key: object, delta: int) -> None:
+    """Add delta to a counter, dropping keys that fall to zero."""
+    value = counter[key] + delta
+    if value:
+        counter[key] = value
+    else:
+        counter.pop(key, None)
@@ -0,0 +1,1075 @@
+"""Storage backends the service layer persists its collections through."""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from contextlib import AbstractContextManager, contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping, Protocol
+
+from reservation_system.journal import Journal
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.snapshot import SUFFIX, Fields, Snapshot
+from reservation_system.snapshot import encode_snapshot
+from reservation_system.storage import (
+    file_lock,
+    file_signature,
+    load_list,
+    save_list,
+    write_atomic,
+)
+
+HOTELS = "hotels"
+CUSTOMERS = "customers"
+RESERVATIONS = "reservations"
+
+COLLECTIONS = (HOTELS, CUSTOMERS, RESERVATIONS)
+
+KEYS = {
+    HOTELS: "hotel_id",
+    CUSTOMERS: "customer_id",
+    RESERVATIONS: "reservation_id",
+}
+
+MODELS: dict[str, Any] = {
+    HOTELS: Hotel,
+    CUSTOMERS: Customer,
+    RESERVATIONS: Reservation,
+}
+
+
+class Storage(Protocol):
+    """Persistence for the three collections of the reservation system.
+
+    ``write`` receives every entity of the collection plus the keys that
+    changed or were removed, so each backend can pick the cheapest way to
+    persist: rewrite everything, append a record, or touch single rows.
+    ``signature`` returns a value that changes whenever another writer
+    modifies the collection; the service reloads when it differs.
+    ``lock`` returns an exclusive lock shared with other processes using
+    the same storage, held while signatures are checked and writes made.
+
+    A backend that can commit writes to several collections as one unit
+    may also offer ``atomic()``, a context manager grouping the enclosed
+    writes; the service then needs no intent file for such commits. A
+    backend that can answer ``exists(collection, key)`` and
+    ``room_conflict(hotel_id, room, check_in, check_out)`` itself lets an
+    uncached service validate single writes without loading anything.
+    ``iter_records(collection)`` yields records without holding the
+    whole collection; see ``iter_records`` below for the fallback.
+    """
+
+    def lock(self) -> AbstractContextManager[Any]:
+        """Return the cross-process write lock."""
+
+    def signature(self, collection: str) -> Any:
+        """Return a change marker for a collection."""
+
+    def load(self, collection: str) -> list[dict[str, Any]]:
+        """Return every record of a collection."""
+
+    def get(self, collection: str, key: str) -> dict[str, Any] | None:
+        """Return one record by ID, or None."""
+
+    def write(
+        self,
+        collection: str,
+        entities: Mapping[str, Any],
+        changed: Iterable[str],
+        removed: Iterable[str],
+    ) -> None:
+        """Persist a change to a collection."""
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class JsonStorage:
+    """One pretty-printed JSON list file per collection."""
+
+    def __init__(self, data_dir: Path) -> None:
+        self.data_dir = Path(data_dir)
+        self.paths = {
+            name: self.data_dir / f"{name}.json" for name in COLLECTIONS}
+
+    def lock(self) -> AbstractContextManager[Any]:
+        """Lock the data directory."""
+        return file_lock(self.data_dir / ".lock")
+
+    def signature(self, collection: str) -> Any:
+        """Return the stat signature of the collection file."""
+        return file_signature(self.paths[collection])
+
+    def load(self, collection: str) -> list[dict[str, Any]]:
+        """Parse the whole collection file."""
+        return load_list(self.paths[collection])
+
+    def get(self, collection: str, key: str) -> dict[str, Any] | None:
+        """Scan the collection file for one record."""
+        field = KEYS[collection]
+        for item in self.load(collection):
+            if str(item.get(field)) == key:
+                return item
+        return None
+
+    def write(
+        self,
+        collection: str,
+        entities: Mapping[str, Any],
+        changed: Iterable[str],
+        removed: Iterable[str],
+    ) -> None:
+        """Rewrite the whole collection file."""
+        # list() snapshots the values in one step, so writers on other
+        # threads cannot resize the dict while it is being serialized.
+        save_list(
+            self.paths[collection],
+            [e.to_dict() for e in list(entities.values())])
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class JournalStorage:
+    """JSON snapshots plus an append-only journal per collection."""
+
+    def __init__(self, data_dir: Path, **journal_options: Any) -> None:
+        self.data_dir = Path(data_dir)
+        self.journals = {
+            name: Journal(
+                self.data_dir / f"{name}.json", KEYS[name],
+                **journal_options)
+            for name in COLLECTIONS}
+
+    def lock(self) -> AbstractContextManager[Any]:
+        """Lock the data directory."""
+        return file_lock(self.data_dir / ".lock")
+
+    def signature(self, collection: str) -> Any:
+        """Return the signature of the snapshot and journal files."""
+        return self.journals[collection].signature()
+
+    def load(self, collection: str) -> list[dict[str, Any]]:
+        """Replay the snapshot and journal of a collection."""
+        return self.journals[collection].load()
+
+    def get(self, collection: str, key: str) -> dict[str, Any] | None:
+        """Replay the collection and return one record."""
+        field = KEYS[collection]
+        for item in self.load(collection):
+            if str(item.get(field)) == key:
+                return item
+        return None
+
+    def write(
+        self,
+        collection: str,
+        entities: Mapping[str, Any],
+        changed: Iterable[str],
+        removed: Iterable[str],
+    ) -> None:
+        """Append one record per changed or removed entity."""
+        self.journals[collection].append(
+            [entities[key].to_dict() for key in changed], removed)
+
+    def close(self) -> None:
+        """Flush every journal."""
+        for journal in self.journals.values():
+            journal.close()
+
+
+_SNAPSHOT_FIELDS: dict[str, Fields] = {
+    HOTELS: (
+        ("hotel_id", "s"), ("name", "s"), ("rooms", "q"),
+        ("location", "s")),
+    CUSTOMERS: (("customer_id", "s"), ("name", "s"), ("email", "s")),
+    RESERVATIONS: (
+        ("reservation_id", "s"), ("hotel_id", "s"), ("customer_id", "s"),
+        ("room", "q"), ("check_in", "d"), ("check_out", "d")),
+}
+
+
+class SnapshotStorage:
+    """One binary snapshot per collection, read through mmap.
+
+    Opening a directory costs nothing until a collection is touched, and
+    ``get`` looks one record up through the snapshot's hash index without
+    decoding the rest. Writes rewrite the snapshot atomically; a reader
+    holding the previous mapping keeps seeing the old file until its
+    signature check maps the new one.
+    """
+
+    def __init__(self, data_dir: Path) -> None:
+        self.data_dir = Path(data_dir)
+        self.paths = {
+            name: self.data_dir / f"{name}{SUFFIX}" for name in COLLECTIONS}
+        self._lock = threading.Lock()
+        self._snapshots: dict[str, tuple[Any, Snapshot]] = {}
+        # Readers currently using each mapping; a replaced mapping is
+        # closed as soon as its last reader is done.
+        self._readers: dict[Snapshot, int] = {}
+
+    def lock(self) -> AbstractContextManager[Any]:
+        """Lock the data directory."""
+        return file_lock(self.data_dir / ".lock")
+
+    def signature(self, collection: str) -> Any:
+        """Return the stat signature of the snapshot file."""
+        return file_signature(self.paths[collection])
+
+    @contextmanager
+    def _snapshot(self, collection: str) -> Iterator[Snapshot | None]:
+        """Hold the current mapping of a collection for one read."""
+        path = self.paths[collection]
+        with self._lock:
+            signature = file_signature(path)
+            current = self._snapshots.get(collection)
+            if signature is None:
+                snapshot = None
+            elif current is not None and current[0] == signature:
+                snapshot = current[1]
+            else:
+                snapshot = Snapshot(path, _SNAPSHOT_FIELDS[collection])
+                self._snapshots[collection] = (signature, snapshot)
+                if current is not None:
+                    self._release(current[1])
+            if snapshot is not None:
+                self._readers[snapshot] = self._readers.get(snapshot, 0) + 1
+        try:
+            yield snapshot
+        finally:
+            if snapshot is not None:
+                with self._lock:
+                    self._readers[snapshot] -= 1
+                    self._release(snapshot)
+
+    def _release(self, snapshot: Snapshot) -> None:
+        """Unmap a snapshot that is neither current nor being read."""
+        if self._readers.get(snapshot):
+            return
+        self._readers.pop(snapshot, None)
+        if all(snapshot is not s for _, s in self._snapshots.values()):
+            snapshot.close()
+
+    def load(self, collection: str) -> list[dict[str, Any]]:
+        """Decode every record of a collection."""
+        with self._snapshot(collection) as snapshot:
+            return [] if snapshot is None else list(snapshot)
+
+    def get(self, collection: str, key: str) -> dict[str, Any] | None:
+        """Look one record up through the snapshot's hash index."""
+        with self._snapshot(collection) as snapshot:
+            return None if snapshot is None else snapshot.get(key)
+
+    def iter_records(self, collection: str) -> Iterator[dict[str, Any]]:
+        """Decode records one at a time from the current mapping."""
+        with self._snapshot(collection) as snapshot:
+            if snapshot is not None:
+                yield from snapshot
+
+    def write(
+        self,
+        collection: str,
+        entities: Mapping[str, Any],
+        changed: Iterable[str],
+        removed: Iterable[str],
+    ) -> None:
+        """Rewrite the whole snapshot file."""
+        write_atomic(
+            self.paths[collection],
+            encode_snapshot(
+                _SNAPSHOT_FIELDS[collection],
+                [e.to_dict() for e in list(entities.values())]))
+
+    def close(self) -> None:
+        """Unmap every snapshot."""
+        with self._lock:
+            for _, snapshot in self._snapshots.values():
+                snapshot.close()
+            for snapshot in self._readers:
+                snapshot.close()
+            self._snapshots.clear()
+            self._readers.clear()
+
+
+class ShardedStorage:
+    """JSON hotels and customers plus reservations sharded by hotel.
+
+    Reservations live in ``reservations/shard-NNNN.json``, one bucket per
+    hash of the hotel ID, so every reservation of a hotel shares a shard.
+    ``reservations/directory/NNNN.json`` buckets map reservation IDs to
+    their shard, which lets a cancel find its shard; each entry is just
+    an ID and a small integer. ``reservations/manifest.json`` records the
+    layout and a generation bumped on every write, and its signature is
+    the signature of the whole collection.
+
+    A write rewrites only the shards and directory buckets it touches.
+    Directory entries are added before and removed after the shard write,
+    so a crash can leave a stale entry (harmless) but never an unlisted
+    reservation. ``load`` returns reservations grouped by shard.
+    """
+
+    def __init__(
+        self,
+        data_dir: Path,
+        shards: int = 64,
+        directory_buckets: int = 16,
+    ) -> None:
+        self.data_dir = Path(data_dir)
+        self.root = self.data_dir / RESERVATIONS
+        self.manifest_path = self.root / "manifest.json"
+        self._plain = JsonStorage(self.data_dir)
+
+        manifest = self._manifest()
+        self.shards = int(manifest.get("shards", shards))
+        self.directory_buckets = int(
+            manifest.get("directory_buckets", directory_buckets))
+
+    def _manifest(self) -> dict[str, Any]:
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        if not isinstance(data, dict) or data.get("format") != "sharded":
+            raise ValueError(f"Invalid shard manifest: {self.manifest_path}")
+        return data
+
+    def _shard_path(self, shard: int) -> Path:
+        return self.root / f"shard-{shard:04d}.json"
+
+    def _directory_path(self, bucket: int) -> Path:
+        return self.root / "directory" / f"{bucket:04d}.json"
+
+    def shard_of(self, hotel_id: str) -> int:
+        """Return the shard holding the reservations of a hotel."""
+        return zlib.crc32(hotel_id.encode("utf-8")) % self.shards
+
+    def _bucket_of(self, reservation_id: str) -> int:
+        return (zlib.crc32(reservation_id.encode("utf-8"))
+                % self.directory_buckets)
+
+    def _read_directory(self, bucket: int) -> dict[str, int]:
+        path = self._directory_path(bucket)
+        if not path.exists():
+            return {}
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _read_shard(self, shard: int) -> list[dict[str, Any]]:
+        path = self._shard_path(shard)
+        return load_list(path) if path.exists() else []
+
+    def lock(self) -> AbstractContextManager[Any]:
+        """Lock the data directory."""
+        return file_lock(self.data_dir / ".lock")
+
+    def signature(self, collection: str) -> Any:
+        """Return the manifest signature for reservations."""
+        if collection == RESERVATIONS:
+            return file_signature(self.manifest_path)
+        return self._plain.signature(collection)
+
+    def load(self, collection: str) -> list[dict[str, Any]]:
+        """Read a collection; reservations are read shard by shard.
+
+        The shards are read again if another process wrote meanwhile.
+        """
+        if collection != RESERVATIONS:
+            return self._plain.load(collection)
+        while True:
+            before = file_signature(self.manifest_path)
+            items: list[dict[str, Any]] = []
+            for shard in range(self.shards):
+                items.extend(self._read_shard(shard))
+            if file_signature(self.manifest_path) == before:
+                return items
+
+    def iter_records(self, collection: str) -> Iterator[dict[str, Any]]:
+        """Yield reservations one shard at a time.
+
+        Unlike ``load`` this is not retried, so a write by another
+        process meanwhile may be seen in part.
+        """
+        if collection != RESERVATIONS:
+            yield from self._plain.load(collection)
+            return
+        for shard in range(self.shards):
+            yield from self._read_shard(shard)
+
+    def get(self, collection: str, key: str) -> dict[str, Any] | None:
+        """Return one record; reservations are found via the directory."""
+        if collection != RESERVATIONS:
+            return self._plain.get(collection, key)
+        shard = self._read_directory(self._bucket_of(key)).get(key)
+        if shard is None:
+            return None
+        for item in self._read_shard(shard):
+            if str(item.get(KEYS[RESERVATIONS])) == key:
+                return item
+        return None
+
+    def write(
+        self,
+        collection: str,
+        entities: Mapping[str, Any],
+        changed: Iterable[str],
+        removed: Iterable[str],
+    ) -> None:
+        """Rewrite only the shards and directory buckets that changed."""
+        if collection != RESERVATIONS:
+            self._plain.write(collection, entities, changed, removed)
+            return
+
+        directories: dict[int, dict[str, int]] = {}
+        puts: dict[int, dict[str, dict[str, Any]]] = {}
+        deletes: dict[int, set[str]] = {}
+
+        def directory(reservation_id: str) -> dict[str, int]:
+            bucket = self._bucket_of(reservation_id)
+            if bucket not in directories:
+                directories[bucket] = self._read_directory(bucket)
+            return directories[bucket]
+
+        for key in changed:
+            data = entities[key].to_dict()
+            shard = self.shard_of(str(data["hotel_id"]))
+            previous = directory(key).get(key)
+            if previous is not None and previous != shard:
+                deletes.setdefault(previous, set()).add(key)
+            puts.setdefault(shard, {})[key] = data
+            directory(key)[key] = shard
+        removed = list(removed)
+        for key in removed:
+            previous = directory(key).get(key)
+            if previous is not None:
+                deletes.setdefault(previous, set()).add(key)
+
+        for bucket, entries in directories.items():
+            write_atomic(self._directory_path(bucket), json.dumps(entries))
+        for shard in puts.keys() | deletes.keys():
+            self._write_shard(
+                shard, puts.get(shard, {}), deletes.get(shard, set()))
+        pruned = set()
+        for key in removed:
+            bucket = self._bucket_of(key)
+            if directories[bucket].pop(key, None) is not None:
+                pruned.add(bucket)
+        for bucket in pruned:
+            write_atomic(
+                self._directory_path(bucket), json.dumps(directories[bucket]))
+        self._write_manifest()
+
+    def _write_shard(
+        self,
+        shard: int,
+        puts: dict[str, dict[str, Any]],
+        deletes: set[str],
+    ) -> None:
+        key = KEYS[RESERVATIONS]
+        items = []
+        for item in self._read_shard(shard):
+            item_key = str(item.get(key))
+            if item_key in deletes:
+                continue
+            items.append(puts.pop(item_key, item))
+        items.extend(puts.values())
+        if items:
+            save_list(self._shard_path(shard), items)
+        else:
+            self._shard_path(shard).unlink(missing_ok=True)
+
+    def _write_manifest(self) -> None:
+        generation = int(self._manifest().get("generation", 0)) + 1
+        write_atomic(self.manifest_path, json.dumps({
+            "format": "sharded",
+            "version": 1,
+            "shards": self.shards,
+            "directory_buckets": self.directory_buckets,
+            "generation": generation,
+        }, indent=2))
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+SEGMENTS = "segments"
+
+
+class _Segments:
+    """What a SegmentStorage last saw of one collection."""
+
+    def __init__(self) -> None:
+        self.signature: Any = None
+        self.generation = 0
+        # segment number -> current file name, and -> keys it holds.
+        self.files: dict[int, str] = {}
+        self.members: dict[int, dict[str, None]] = {}
+        self.placement: dict[str, int] = {}
+
+
+class SegmentStorage:
+    """Each collection split into fixed-size JSON segment files.
+
+    ``segments/<collection>/manifest.json`` names the current file of
+    every segment. A write marks dirty the segments holding a changed or
+    removed entity, writes a new file for each under the next generation,
+    atomically replaces the manifest and only then deletes the files it
+    replaced. Files are never modified in place, so a crash leaves the
+    old or the new manifest with every file it names; unreferenced files
+    are swept by the next write. New entities fill the last segment up to
+    ``segment_size``, so the cost of a save follows the dirty segments,
+    not the size of the collection.
+
+    Because segment files are immutable, their bytes are kept in an
+    in-process cache keyed by file name: reloading after a write reads
+    back only the segments that another process rewrote.
+    """
+
+    def __init__(self, data_dir: Path, segment_size: int = 1024) -> None:
+        self.data_dir = Path(data_dir)
+        self.root = self.data_dir / SEGMENTS
+        self._lock = threading.RLock()
+        self._state = {name: _Segments() for name in COLLECTIONS}
+        self._bytes: dict[str, dict[str, bytes]] = {
+            name: {} for name in COLLECTIONS}
+        for collection in COLLECTIONS:
+            segment_size = int(self._manifest(collection).get(
+                "segment_size", segment_size))
+        self.segment_size = segment_size
+
+    def _manifest_path(self, collection: str) -> Path:
+        return self.root / collection / "manifest.json"
+
+    def _manifest(self, collection: str) -> dict[str, Any]:
+        path = self._manifest_path(collection)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        if not isinstance(data, dict) or data.get("format") != SEGMENTS:
+            raise ValueError(f"Invalid segment manifest: {path}")
+        return data
+
+    def _segment(self, collection: str, name: str) -> list[dict[str, Any]]:
+        cache = self._bytes[collection]
+        data = cache.get(name)
+        if data is None:
+            data = (self.root / collection / name).read_bytes()
+            cache[name] = data
+        return json.loads(data)
+
+    def _refresh(self, collection: str) -> tuple[_Segments, list[Any]]:
+        """Bring the segment map up to date with the manifest on disk.
+
+        Returns the state and, when segments had to be read, their
+        records in segment order; an up-to-date state returns [] and
+        callers needing the records read them again.
+        """
+        state = self._state[collection]
+        while True:
+            signature = self.signature(collection)
+            if signature == state.signature and signature is not None:
+                return state, []
+            manifest = self._manifest(collection)
+            fresh = _Segments()
+            fresh.generation = int(manifest.get("generation", 0))
+            fresh.files = {
+                int(number): name
+                for number, name in manifest.get("segments", {}).items()}
+            field = KEYS[collection]
+            records: list[Any] = []
+            try:
+                for number in sorted(fresh.files):
+                    items = self._segment(collection, fresh.files[number])
+                    keys = {str(item[field]): None for item in items}
+                    fresh.members[number] = keys
+                    fresh.placement.update(dict.fromkeys(keys, number))
+                    records.extend(items)
+            except FileNotFoundError:
+                if self.signature(collection) == signature:
+                    raise
+                continue  # Replaced by a writer meanwhile; read again.
+            if self.signature(collection) != signature:
+                continue
+            fresh.signature = signature
+            self._state[collection] = fresh
+            live = set(fresh.files.values())
+            cache = self._bytes[collection]
+            for name in set(cache) - live:
+                del cache[name]
+            return fresh, records
+
+    def lock(self) -> AbstractContextManager[Any]:
+        """Lock the data directory."""
+        return file_lock(self.data_dir / ".lock")
+
+    def signature(self, collection: str) -> Any:
+        """Return the stat signature of the collection manifest."""
+        return file_signature(self._manifest_path(collection))
+
+    def load(self, collection: str) -> list[dict[str, Any]]:
+        """Read every segment, from the byte cache where possible."""
+        with self._lock:
+            state, records = self._refresh(collection)
+            if records or not state.files:
+                return records
+            return [
+                item for number in sorted(state.files)
+                for item in self._segment(collection, state.files[number])]
+
+    def get(self, collection: str, key: str) -> dict[str, Any] | None:
+        """Read the one segment holding a record."""
+        with self._lock:
+            state, _ = self._refresh(collection)
+            number = state.placement.get(key)
+            if number is None:
+                return None
+            field = KEYS[collection]
+            for item in self._segment(collection, state.files[number]):
+                if str(item[field]) == key:
+                    return item
+            return None
+
+    def write(
+        self,
+        collection: str,
+        entities: Mapping[str, Any],
+        changed: Iterable[str],
+        removed: Iterable[str],
+    ) -> None:
+        """Rewrite only the segments holding changed or removed keys."""
+        with self._lock:
+            state, _ = self._refresh(collection)
+            dirty: set[int] = set()
+            for key in removed:
+                number = state.placement.pop(key, None)
+                if number is not None:
+                    del state.members[number][key]
+                    dirty.add(number)
+            last = max(state.members, default=-1)
+            for key in changed:
+                number = state.placement.get(key)
+                if number is None:
+                    if (last < 0 or len(state.members[last])
+                            >= self.segment_size):
+                        last += 1
+                        state.members[last] = {}
+                    number = last
+                    state.members[number][key] = None
+                    state.placement[key] = number
+                dirty.add(number)
+            if not dirty:
+                return
+            self._commit(collection, state, entities, dirty)
+
+    def _commit(
+        self,
+        collection: str,
+        state: _Segments,
+        entities: Mapping[str, Any],
+        dirty: set[int],
+    ) -> None:
+        # The map is edited in place; forget it until the manifest is
+        # written so a failure makes the next call re-read the disk.
+        state.signature = None
+        directory = self.root / collection
+        generation = state.generation + 1
+        cache = self._bytes[collection]
+        replaced = []
+        for number in sorted(dirty):
+            if number in state.files:
+                replaced.append(state.files.pop(number))
+            keys = state.members[number]
+            if not keys:
+                del state.members[number]
+                continue
+            name = f"{number:06d}-{generation:08d}.json"
+            data = json.dumps(
+                [entities[key].to_dict() for key in keys]).encode("utf-8")
+            write_atomic(directory / name, data)
+            cache[name] = data
+            state.files[number] = name
+
+        write_atomic(self._manifest_path(collection), json.dumps({
+            "format": SEGMENTS,
+            "version": 1,
+            "segment_size": self.segment_size,
+            "generation": generation,
+            "segments": {
+                str(number): name
+                for number, name in sorted(state.files.items())},
+        }, indent=2))
+        state.generation = generation
+        state.signature = self.signature(collection)
+
+        live = set(state.files.values())
+        for name in replaced:
+            cache.pop(name, None)
+        for path in directory.glob("*.json"):
+            if path.name not in live and path.name != "manifest.json":
+                path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Drop the byte cache."""
+        with self._lock:
+            for cache in self._bytes.values():
+                cache.clear()
+
+
+def open_storage(data_dir: Path, journal: bool = False) -> Storage:
+    """Return the backend matching the files found in a data directory.
+
+    Binary snapshots win when any collection has one, then segment
+    files, then a sharded reservation layout; otherwise the JSON files
+    are used, with a journal on top if requested.
+    """
+    data_dir = Path(data_dir)
+    if any((data_dir / f"{name}{SUFFIX}").exists() for name in COLLECTIONS):
+        return SnapshotStorage(data_dir)
+    if (data_dir / SEGMENTS).is_dir():
+        return SegmentStorage(data_dir)
+    if (data_dir / RESERVATIONS / "manifest.json").exists():
+        return ShardedStorage(data_dir)
+    if journal:
+        return JournalStorage(data_dir)
+    return JsonStorage(data_dir)
+
+
+def iter_records(
+    storage: Storage,
+    collection: str,
+) -> Iterator[dict[str, Any]]:
+    """Yield every record of a collection, streamed where the backend can.
+
+    SQLite, binary snapshots and sharded reservations are read a page,
+    record or shard at a time; the other backends parse the whole
+    collection first, as their files must be read as a whole.
+    """
+    stream = getattr(storage, "iter_records", None)
+    if stream is None:
+        return iter(storage.load(collection))
+    return stream(collection)
+
+
+def copy_storage(source: Storage, target: Storage) -> None:
+    """Write every collection of source into target.
+
+    Converts a data directory between formats, e.g. JSON to binary
+    snapshots, or snapshots back to JSON for export.
+    """
+    for collection in COLLECTIONS:
+        model = MODELS[collection]
+        entities = {
+            str(data[KEYS[collection]]): model.from_dict(data)
+            for data in source.load(collection)}
+        with target.lock():
+            target.write(collection, entities, list(entities), [])
+
+
+def migrate_to_shards(
+    data_dir: Path,
+    shards: int = 64,
+    directory_buckets: int = 16,
+) -> int:
+    """Move the reservations of a single-file directory into shards.
+
+    Journals are folded into the hotel and customer files and replayed
+    for reservations. The old reservation files are kept, renamed with a
+    ``.premigration`` suffix, and the number of migrated reservations is
+    returned.
+    """
+    data_dir = Path(data_dir)
+    sharded = ShardedStorage(data_dir, shards, directory_buckets)
+    if sharded.manifest_path.exists():
+        raise ValueError(f"{data_dir} already uses sharded reservations.")
+
+    source = JournalStorage(data_dir)
+    with source.lock():
+        records = source.load(RESERVATIONS)
+        entities = {
+            str(data[KEYS[RESERVATIONS]]): Reservation.from_dict(data)
+            for data in records}
+        sharded.write(RESERVATIONS, entities, list(entities), [])
+        for collection in (HOTELS, CUSTOMERS):
+            source.journals[collection].compact()
+        source.close()
+        journal = source.journals[RESERVATIONS]
+        for path in (journal.path, journal.pending_path,
+                     journal.journal_path):
+            if path.exists():
+                os.replace(path, path.with_name(path.name + ".premigration"))
+    return len(entities)
+
+
+def migrate_to_segments(data_dir: Path, segment_size: int = 1024) -> int:
+    """Move every collection of a JSON directory into segment files.
+
+    Journals are replayed first. The old files are kept, renamed with a
+    ``.premigration`` suffix, and the number of migrated records is
+    returned.
+    """
+    data_dir = Path(data_dir)
+    if (data_dir / SEGMENTS).exists():
+        raise ValueError(f"{data_dir} already uses segment files.")
+    if (data_dir / RESERVATIONS / "manifest.json").exists():
+        raise ValueError(f"{data_dir} uses sharded reservations.")
+
+    source = JournalStorage(data_dir)
+    target = SegmentStorage(data_dir, segment_size)
+    count = 0
+    with source.lock():
+        for collection in COLLECTIONS:
+            model = MODELS[collection]
+            entities = {
+                str(data[KEYS[collection]]): model.from_dict(data)
+                for data in source.load(collection)}
+            target.write(collection, entities, list(entities), [])
+            count += len(entities)
+        source.close()
+        for journal in source.journals.values():
+            for path in (journal.path, journal.pending_path,
+                         journal.journal_path):
+                if path.exists():
+                    os.replace(
+                        path, path.with_name(path.name + ".premigration"))
+    return count
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hotels (
+    hotel_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    rooms INTEGER NOT NULL,
+    location TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS customers (
+    customer_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reservations (
+    reservation_id TEXT PRIMARY KEY,
+    hotel_id TEXT NOT NULL,
+    customer_id TEXT NOT NULL,
+    room INTEGER NOT NULL,
+    check_in TEXT,
+    check_out TEXT
+);
+CREATE INDEX IF NOT EXISTS reservations_by_customer
+    ON reservations (customer_id);
+CREATE INDEX IF NOT EXISTS reservations_by_room
+    ON reservations (hotel_id, room, check_in);
+CREATE UNIQUE INDEX IF NOT EXISTS reservations_undated_room
+    ON reservations (hotel_id, room) WHERE check_in IS NULL;
+"""
+
+# Databases created before stays had dates carry an inline
+# UNIQUE (hotel_id, room) constraint, which only a table rebuild removes.
+_MIGRATE_UNDATED = """
+ALTER TABLE reservations RENAME TO reservations_undated;
+CREATE TABLE reservations (
+    reservation_id TEXT PRIMARY KEY,
+    hotel_id TEXT NOT NULL,
+    customer_id TEXT NOT NULL,
+    room INTEGER NOT NULL,
+    check_in TEXT,
+    check_out TEXT
+);
+INSERT INTO reservations (reservation_id, hotel_id, customer_id, room)
+    SELECT reservation_id, hotel_id, customer_id, room
+    FROM reservations_undated ORDER BY rowid;
+DROP TABLE reservations_undated;
+"""
+
+_COLUMNS = {
+    HOTELS: ("hotel_id", "name", "rooms", "location"),
+    CUSTOMERS: ("customer_id", "name", "email"),
+    RESERVATIONS: (
+        "reservation_id", "hotel_id", "customer_id", "room",
+        "check_in", "check_out"),
+}
+
+
+def _statements(collection: str) -> dict[str, str]:
+    columns = _COLUMNS[collection]
+    key = KEYS[collection]
+    updates = ", ".join(f"{c} = excluded.{c}" for c in columns[1:])
+    return {
+        "load": f"SELECT {', '.join(columns)} FROM {collection} "
+                "ORDER BY rowid",
+        "get": f"SELECT {', '.join(columns)} FROM {collection} "
+               f"WHERE {key} = ?",
+        "upsert": f"INSERT INTO {collection} ({', '.join(columns)}) "
+                  f"VALUES ({', '.join('?' for _ in columns)}) "
+                  f"ON CONFLICT ({key}) DO UPDATE SET {updates}",
+        "delete": f"DELETE FROM {collection} WHERE {key} = ?",
+        "exists": f"SELECT 1 FROM {collection} WHERE {key} = ?",
+        "page": f"SELECT rowid, {', '.join(columns)} FROM {collection} "
+                "WHERE rowid > ? ORDER BY rowid LIMIT ?",
+    }
+
+
+# A stay overlaps a booking of the same room unless both are dated and
+# disjoint; undated bookings hold the room forever.
+_ROOM_CONFLICT = """
+SELECT reservation_id FROM reservations
+WHERE hotel_id = :hotel_id AND room = :room
+    AND (check_in IS NULL OR :check_in IS NULL
+         OR (check_in < :check_out AND check_out > :check_in))
+LIMIT 1
+"""
+
+
+class SQLiteStorage:
+    """SQLite database with one indexed table per collection.
+
+    The database runs in WAL mode so readers in other processes are not
+    blocked by a writer, and a unique index on (hotel_id, room) for
+    undated reservations rejects a double booking even if two processes
+    validated against stale state. Dated stays are checked for overlap by
+    the service layer; with ``cached=False`` it does so through
+    ``room_conflict``, which runs on the (hotel_id, room, check_in)
+    index. ``atomic`` groups writes to several tables into one SQL
+    transaction.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._in_atomic = False
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        self._conn.executescript(_SCHEMA)
+        self._sql = {name: _statements(name) for name in COLLECTIONS}
+
+    def lock(self) -> AbstractContextManager[Any]:
+        """Lock a sidecar file next to the database."""
+        return file_lock(self.path.with_name(self.path.name + ".lock"))
+
+    @contextmanager
+    def atomic(self) -> Iterator[None]:
+        """Commit every write in the block in one transaction."""
+        with self._lock:
+            if self._in_atomic:
+                yield
+                return
+            self._in_atomic = True
+            try:
+                with self._conn:
+                    yield
+            finally:
+                self._in_atomic = False
+
+    def _migrate(self) -> None:
+        columns = [
+            row[1] for row in self._conn.execute(
+                "PRAGMA table_info(reservations)")]
+        if columns and "check_in" not in columns:
+            with self._conn:
+                self._conn.executescript(_MIGRATE_UNDATED)
+
+    def signature(self, collection: str) -> Any:
+        """Return the database data_version, bumped by other writers."""
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def load(self, collection: str) -> list[dict[str, Any]]:
+        """Return every row of a table in insertion order."""
+        columns = _COLUMNS[collection]
+        with self._lock:
+            rows = self._conn.execute(self._sql[collection]["load"])
+            return [dict(zip(columns, row)) for row in rows]
+
+    def iter_records(
+        self,
+        collection: str,
+        page_size: int = 1000,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield rows in insertion order, fetching a page at a time.
+
+        The lock is only held per page, so other threads can use the
+        connection between pages.
+        """
+        columns = _COLUMNS[collection]
+        last = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    self._sql[collection]["page"],
+                    (last, page_size)).fetchall()
+            for row in rows:
+                yield dict(zip(columns, row[1:]))
+            if len(rows) < page_size:
+                return
+            last = rows[-1][0]
+
+    def get(self, collection: str, key: str) -> dict[str, Any] | None:
+        """Look one row up through the primary key index."""
+        with self._lock:
+            row = self._conn.execute(
+                self._sql[collection]["get"], (key,)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(_COLUMNS[collection], row))
+
+    def exists(self, collection: str, key: str) -> bool:
+        """Return True if a row with this key exists."""
+        with self._lock:
+            row = self._conn.execute(
+                self._sql[collection]["exists"], (key,)).fetchone()
+        return row is not None
+
+    def room_conflict(
+        self,
+        hotel_id: str,
+        room: int,
+        check_in: date | None,
+        check_out: date | None,
+    ) -> str | None:
+        """Return the ID of a reservation overlapping the stay, if any."""
+        with self._lock:
+            row = self._conn.execute(_ROOM_CONFLICT, {
+                "hotel_id": hotel_id,
+                "room": room,
+                "check_in": check_in and check_in.isoformat(),
+                "check_out": check_out and check_out.isoformat(),
+            }).fetchone()
+        return None if row is None else row[0]
+
+    def write(
+        self,
+        collection: str,
+        entities: Mapping[str, Any],
+        changed: Iterable[str],
+        removed: Iterable[str],
+    ) -> None:
+        """Upsert changed rows and delete removed ones in one transaction."""
+        columns = _COLUMNS[collection]
+        sql = self._sql[collection]
+        upserts = []
+        for key in changed:
+            data = entities[key].to_dict()
+            upserts.append(tuple(data.get(c) for c in columns))
+        deletes = [(key,) for key in removed]
+
+        with self._lock:
+            try:
+                with self.atomic():
+                    self._conn.executemany(sql["delete"], deletes)
+                    self._conn.executemany(sql["upsert"], upserts)
+            except sqlite3.IntegrityError as exc:
+                if "hotel_id, reservations.room" in str(exc):
+                    raise ValueError("Room already reserved.") from exc
+                raise ValueError(f"Storage constraint failed: {exc}") from exc
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,6 +1,16 @@
 """Command-line interface for the Reservation System."""
 from __future__ import annotations
 
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass
+from functools import partial
+from itertools import islice
+from typing import Any, Iterable, TextIO
+
+from reservation_system.commands import execute
 from reservation_system.models import Customer, Hotel, Reservation
 from reservation_system.services import ReservationSystem
 
@@ -16,6 +26,105 @@ def _menu() -> None:
     print("0) Exit")
 
 
+@dataclass
+class BatchSummary:
+    """Outcome counts and duration of one batch run."""
+    commands: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        rate = self.commands / self.seconds if self.seconds else 0.0
+        return (
+            f"{self.commands} commands ({self.failed} failed) in "
+            f"{self.seconds:.3f}s, {rate:.0f} commands/s")
+
+
+def _parse_lines(lines: Iterable[str]) -> Iterable[tuple[int, Any]]:
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield number, exc
+
+
+def run_batch(
+    system: ReservationSystem,
+    lines: Iterable[str],
+    output: TextIO,
+    group_size: int = 1,
+) -> BatchSummary:
+    """Run JSONL commands (see ``commands``) and write one result each.
+
+    Every result line carries the input ``line`` number. With
+    ``group_size`` > 1 that many commands are committed together through
+    ``run_group``; their results are written once the group is on disk.
+    """
+    summary = BatchSummary()
+    started = time.perf_counter()
+    parsed = _parse_lines(lines)
+    while True:
+        chunk = list(islice(parsed, max(1, group_size)))
+        if not chunk:
+            break
+        calls = [
+            partial(_run_line, system, command) for _, command in chunk]
+        if len(calls) == 1:
+            results = [calls[0]()]
+        else:
+            results = system.run_group(calls)
+        for (number, _), result in zip(chunk, results):
+            result["line"] = number
+            summary.commands += 1
+            summary.failed += not result["ok"]
+            output.write(json.dumps(result) + "\n")
+    summary.seconds = time.perf_counter() - started
+    return summary
+
+
+def _run_line(system: ReservationSystem, command: Any) -> dict[str, Any]:
+    if isinstance(command, json.JSONDecodeError):
+        return {"ok": False, "error": f"Invalid JSON: {command}"}
+    return execute(system, command)
+
+
+def batch_main(argv: list[str] | None = None) -> int:
+    """Entry point of the non-interactive batch mode."""
+    parser = argparse.ArgumentParser(
+        prog="python -m reservation_system.cli",
+        description="Run JSONL commands against one loaded system.")
+    parser.add_argument(
+        "--batch", required=True, metavar="FILE",
+        help="JSONL command file, or - for stdin")
+    parser.add_argument("--output", default="-",
+                        help="result file, or - for stdout")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--journal", action="store_true")
+    parser.add_argument("--group", type=int, default=1,
+                        help="commands committed together")
+    args = parser.parse_args(argv)
+
+    system = ReservationSystem(
+        args.data_dir, cached=True, journal=args.journal)
+    source = (
+        sys.stdin if args.batch == "-"
+        else open(args.batch, encoding="utf-8"))
+    target = (
+        sys.stdout if args.output == "-"
+        else open(args.output, "w", encoding="utf-8"))
+    try:
+        summary = run_batch(system, source, target, args.group)
+    finally:
+        for stream in (source, target):
+            if stream not in (sys.stdin, sys.stdout):
+                stream.close()
+        system.close()
+    print(summary, file=sys.stderr)
+    return 0
+
+
 def main() -> None:
     """Run the interactive command-line reservation system."""
     system = ReservationSystem("data")
@@ -45,8 +154,18 @@ def main() -> None:
                 hotel_id = input("Hotel ID: ").strip()
                 customer_id = input("Customer ID: ").strip()
                 room = int(input("Room (int): ").strip())
-                system.create_reservation(Reservation(
-                    reservation_id, hotel_id, customer_id, room))
+                check_in = input(
+                    "Check-in (YYYY-MM-DD, blank for none): ").strip()
+                check_out = input(
+                    "Check-out (YYYY-MM-DD, blank for none): ").strip()
+                system.create_reservation(Reservation.from_dict({
+                    "reservation_id": reservation_id,
+                    "hotel_id": hotel_id,
+                    "customer_id": customer_id,
+                    "room": room,
+                    "check_in": check_in,
+                    "check_out": check_out,
+                }))
                 print("Reservation created.")
 
             elif choice == "4":
@@ -76,4 +195,6 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(batch_main())
     main()
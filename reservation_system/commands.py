@@ -0,0 +1,156 @@
+"""JSON command dispatcher shared by the batch CLI and other front-ends.
+
+A command is a JSON object such as::
+
+    {"command": "create_hotel", "args": {"hotel": {"hotel_id": "H1", ...}}}
+    {"command": "cancel_reservation", "args": {"reservation_id": "R1"}}
+
+``args`` are the keyword arguments of the ``ReservationSystem`` method of
+the same name; entities are given as their ``to_dict`` form and dates as
+ISO strings. An optional ``id`` is echoed back in the result, which is
+``{"ok": true, "result": ...}`` or ``{"ok": false, "error": "..."}``.
+"""
+from __future__ import annotations
+
+import inspect
+from dataclasses import asdict, is_dataclass
+from datetime import date
+from typing import Any, Callable
+
+from reservation_system.models import (
+    Customer,
+    Hotel,
+    Reservation,
+    parse_date,
+)
+from reservation_system.services import BatchResult, ReservationSystem
+
+COMMANDS = frozenset({
+    "create_hotel", "create_hotels", "delete_hotel", "delete_hotels",
+    "display_hotel_info", "modify_hotel_information", "resize_hotels",
+    "create_customer", "create_customers", "delete_customer",
+    "delete_customers", "display_customer_info",
+    "modify_customer_information",
+    "create_reservation", "create_reservations", "cancel_reservation",
+    "cancel_reservations", "list_reservations_for_hotel",
+    "list_reservations_for_customer",
+    "free_rooms", "count_free_rooms", "find_available_hotels",
+    "hotel_occupancy", "location_occupancy", "customer_activity",
+    "top_hotels", "occupancy_report", "search_hotels", "search_customers",
+})
+
+_ENTITIES: dict[str, Callable[[dict[str, Any]], Any]] = {
+    "hotel": Hotel.from_dict,
+    "customer": Customer.from_dict,
+    "reservation": Reservation.from_dict,
+}
+_ENTITY_LISTS = {
+    "hotels": Hotel.from_dict,
+    "customers": Customer.from_dict,
+    "reservations": Reservation.from_dict,
+}
+_DATES = ("check_in", "check_out")
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+# Checks of the other arguments by their annotation, as the methods do
+# not check JSON types themselves; "X | None" also accepts null.
+_JSON_TYPES: dict[str, tuple[Callable[[Any], bool], str]] = {
+    "str": (lambda value: isinstance(value, str), "a string"),
+    "int": (_is_int, "an integer"),
+    "bool": (lambda value: isinstance(value, bool), "true or false"),
+    "Iterable[str]": (
+        lambda value: isinstance(value, list) and all(
+            isinstance(item, str) for item in value),
+        "a list of strings"),
+    "Mapping[str, int]": (
+        lambda value: isinstance(value, dict) and all(
+            _is_int(item) for item in value.values()),
+        "a JSON object of integers"),
+}
+
+
+def _decode_args(args: dict[str, Any]) -> dict[str, Any]:
+    kwargs = dict(args)
+    for name, parse in _ENTITIES.items():
+        if name in kwargs:
+            if not isinstance(kwargs[name], dict):
+                raise TypeError(f"{name} must be a JSON object.")
+            kwargs[name] = parse(kwargs[name])
+    for name, parse in _ENTITY_LISTS.items():
+        if name in kwargs:
+            items = kwargs[name]
+            if not isinstance(items, list) or not all(
+                    isinstance(item, dict) for item in items):
+                raise TypeError(f"{name} must be a list of JSON objects.")
+            kwargs[name] = [parse(item) for item in items]
+    for name in _DATES:
+        if name in kwargs:
+            kwargs[name] = parse_date(kwargs[name])
+    return kwargs
+
+
+def _check_args(method: Callable[..., Any], kwargs: dict[str, Any]) -> None:
+    """Raise TypeError unless kwargs fit the method's signature."""
+    signature = inspect.signature(method)
+    signature.bind(**kwargs)
+    for name, value in kwargs.items():
+        annotation = str(signature.parameters[name].annotation)
+        if value is None and annotation.endswith(" | None"):
+            continue
+        check = _JSON_TYPES.get(annotation.removesuffix(" | None"))
+        if check is not None and not check[0](value):
+            raise TypeError(f"{name} must be {check[1]}.")
+
+
+def encode(value: Any) -> Any:
+    """Convert a ReservationSystem return value into JSON-ready data."""
+    if isinstance(value, (list, tuple)):
+        return [encode(item) for item in value]
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, BatchResult):
+        return asdict(value)
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    return value
+
+
+def execute(system: ReservationSystem, command: Any) -> dict[str, Any]:
+    """Run one command and return its result object; never raises for
+    bad input or business errors.
+
+    Arguments are checked against the method's signature before the
+    call, so any other exception from the method itself (a bug) is
+    raised rather than reported as invalid arguments.
+    """
+    result: dict[str, Any] = {}
+    if isinstance(command, dict) and "id" in command:
+        result["id"] = command["id"]
+
+    try:
+        if not isinstance(command, dict):
+            raise ValueError("Command must be a JSON object.")
+        name = command.get("command")
+        if name not in COMMANDS:
+            raise ValueError(f"Unknown command: {name}.")
+        args = command.get("args", {})
+        if not isinstance(args, dict):
+            raise ValueError("args must be a JSON object.")
+        method = getattr(system, name)
+        try:
+            kwargs = _decode_args(args)
+            _check_args(method, kwargs)
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"Invalid arguments: {exc}") from exc
+        value = method(**kwargs)
+    except ValueError as exc:
+        result.update(ok=False, error=str(exc))
+    else:
+        result.update(ok=True, result=encode(value))
+    return result
@@ -0,0 +1,236 @@
+"""Serve one warm ReservationSystem over a local Unix-domain socket.
+
+The protocol is JSON lines: the client writes one command per line, in
+the format of ``reservation_system.commands``, and the server answers
+each line with one result line, in order. A client may send many
+commands before reading any result (pipelining).
+
+Start a server with ``python -m reservation_system.daemon --data-dir data
+--socket /tmp/reservations.sock`` and talk to it with
+``ReservationClient``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from reservation_system.backends import HOTELS
+from reservation_system.commands import COMMANDS, encode, execute
+from reservation_system.services import ReservationSystem
+
+DEFAULT_SOCKET = "/tmp/reservations.sock"
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "ReservationServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                command = json.loads(line)
+            except json.JSONDecodeError as exc:
+                result: dict[str, Any] = {
+                    "ok": False, "error": f"Invalid JSON: {exc}"}
+            else:
+                result = execute(self.server.system, command)
+            self.wfile.write(json.dumps(result).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class ReservationServer(socketserver.ThreadingUnixStreamServer):
+    """Threaded Unix socket server around one thread-safe system.
+
+    Each connection gets its own thread; the system's lock striping lets
+    writes for different hotels proceed in parallel while reads use the
+    shared in-memory indexes.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, system: ReservationSystem, socket_path: str) -> None:
+        if not system.thread_safe:
+            raise ValueError("ReservationServer needs a thread_safe system.")
+        self.system = system
+        self.socket_path = socket_path
+        _remove_stale_socket(socket_path)
+        super().__init__(socket_path, _Handler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        Path(self.socket_path).unlink(missing_ok=True)
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """Delete a socket file left by a dead server; refuse a live one."""
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.unlink(socket_path)
+    else:
+        raise ValueError(f"A server is already listening on {socket_path}.")
+    finally:
+        probe.close()
+
+
+class _Connection:
+    def __init__(self, socket_path: str, timeout: float | None) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(socket_path)
+        self.reader = self.sock.makefile("rb")
+
+    def send(self, commands: Iterable[dict[str, Any]]) -> None:
+        self.sock.sendall(b"".join(
+            json.dumps(command).encode("utf-8") + b"\n"
+            for command in commands))
+
+    def receive(self) -> dict[str, Any]:
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection.")
+        return json.loads(line)
+
+    def close(self) -> None:
+        self.reader.close()
+        self.sock.close()
+
+
+class ReservationClient:
+    """Pooled client for a ``ReservationServer``.
+
+    Up to ``pool_size`` connections are kept open and shared between
+    threads. Every command of ``COMMANDS`` is available as a method, e.g.
+    ``client.create_hotel(hotel=Hotel(...))`` or
+    ``client.display_hotel_info(hotel_id="H1")``; arguments are keyword
+    arguments as for ``ReservationSystem``, and return values come back
+    as JSON data (entities as dicts). Business errors raise ValueError.
+    """
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET,
+        pool_size: int = 4,
+        timeout: float | None = 30.0,
+    ) -> None:
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._idle: queue.LifoQueue[_Connection] = queue.LifoQueue(
+            maxsize=pool_size)
+
+    def __enter__(self) -> "ReservationClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name in COMMANDS:
+            return partial(self.call, name)
+        raise AttributeError(name)
+
+    def call(self, command: str, **args: Any) -> Any:
+        """Run one command and return its result."""
+        (result,) = self.pipeline([(command, args)])
+        if not result["ok"]:
+            raise ValueError(result["error"])
+        return result["result"]
+
+    def pipeline(
+        self,
+        commands: Iterable[tuple[str, dict[str, Any]]],
+        window: int = 256,
+    ) -> list[dict[str, Any]]:
+        """Send many (command, args) pairs on one connection and return
+        their raw result objects in order.
+
+        Commands go out ``window`` at a time before their results are
+        read, which keeps both socket buffers from filling up.
+        """
+        payload = [
+            {"command": name,
+             "args": {key: encode(value) for key, value in args.items()}}
+            for name, args in commands]
+        connection = self._acquire()
+        results: list[dict[str, Any]] = []
+        try:
+            for start in range(0, len(payload), window):
+                chunk = payload[start:start + window]
+                connection.send(chunk)
+                results.extend(connection.receive() for _ in chunk)
+        except BaseException:
+            connection.close()
+            raise
+        self._release(connection)
+        return results
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _acquire(self) -> _Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return _Connection(self.socket_path, self.timeout)
+
+    def _release(self, connection: _Connection) -> None:
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+
+def serve(
+    data_dir: str,
+    socket_path: str = DEFAULT_SOCKET,
+    journal: bool = False,
+    ready: threading.Event | None = None,
+) -> None:
+    """Load data_dir once and serve it until interrupted."""
+    system = ReservationSystem(data_dir, thread_safe=True, journal=journal)
+    # Any read loads every collection in thread-safe mode, so the first
+    # client does not pay for parsing.
+    next(system.iter_entities(HOTELS), None)
+    try:
+        with ReservationServer(system, socket_path) as server:
+            if ready is not None:
+                ready.set()
+            server.serve_forever()
+    finally:
+        system.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the daemon from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m reservation_system.daemon",
+        description="Serve a ReservationSystem over a Unix socket.")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    parser.add_argument("--journal", action="store_true")
+    args = parser.parse_args(argv)
+    try:
+        serve(args.data_dir, args.socket, args.journal)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
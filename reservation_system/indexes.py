@@ -0,0 +1,352 @@
+"""In-memory indexes kept in sync with the reservation collection."""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from typing import Any, Iterable, Iterator, Mapping
+
+from reservation_system.models import Hotel, Reservation
+from reservation_system.table import ReservationTable
+
+
+def stay(reservation: Reservation) -> tuple[date, date]:
+    """Return the half-open stay of a reservation; undated means forever."""
+    return (
+        reservation.check_in or date.min,
+        reservation.check_out or date.max,
+    )
+
+
+class RoomSchedule:
+    """Sorted, non-overlapping stays booked for one room.
+
+    Stays are kept ordered by check-in, so a new stay can only collide
+    with its immediate neighbours and the overlap check is O(log n).
+    """
+
+    def __init__(self) -> None:
+        self._stays: list[tuple[date, date, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._stays)
+
+    def ids(self) -> list[str]:
+        """Return the reservation IDs, ordered by check-in."""
+        return [stay[2] for stay in self._stays]
+
+    def conflict(self, start: date, end: date) -> str | None:
+        """Return the ID of a reservation overlapping [start, end)."""
+        stays = self._stays
+        i = bisect_right(stays, start, key=lambda s: s[0])
+        if i > 0 and stays[i - 1][1] > start:
+            return stays[i - 1][2]
+        if i < len(stays) and stays[i][0] < end:
+            return stays[i][2]
+        return None
+
+    def add(self, start: date, end: date, reservation_id: str) -> None:
+        """Insert a stay, keeping the list ordered."""
+        insort(self._stays, (start, end, reservation_id))
+
+    def remove(self, start: date, end: date, reservation_id: str) -> None:
+        """Remove a previously added stay."""
+        self._stays.remove((start, end, reservation_id))
+
+
+class ReservationIndex:
+    """Reservations keyed by ID plus occupancy and foreign-key indexes.
+
+    The reservations themselves live in a columnar ``ReservationTable``;
+    the secondary indexes only hold reservation IDs. Every write goes
+    through ``add``/``remove`` so they never drift from the table.
+    Per-hotel and per-customer buckets are dicts rather than sets to keep
+    reservations in insertion order, and ``by_room`` holds a
+    ``RoomSchedule`` per (hotel_id, room). ``booked_rooms`` keeps the
+    numbers of each hotel's booked rooms sorted, so the bookings above a
+    room number are found by bisection.
+
+    Every method runs under ``lock``, so readers never see a row or a
+    bucket half written by a thread that holds other stripes. It is only
+    held for the call and never around another lock.
+    """
+
+    def __init__(self, reservations: Iterable[Reservation] = ()) -> None:
+        self.table = ReservationTable()
+        self.by_room: dict[tuple[str, int], RoomSchedule] = {}
+        self.by_hotel: dict[str, dict[str, None]] = {}
+        self.by_customer: dict[str, dict[str, None]] = {}
+        self.booked_rooms: dict[str, list[int]] = {}
+        self.lock = threading.RLock()
+        for reservation in reservations:
+            self.add(reservation)
+
+    @classmethod
+    def from_records(
+            cls, records: Iterable[dict[str, Any]]) -> "ReservationIndex":
+        """Build the index straight from stored records."""
+        index = cls()
+        table = index.table
+        for data in records:
+            table.add_record(data)
+        for row, reservation_id in enumerate(table.ids):
+            index._link(
+                reservation_id,
+                table.hotels.values[table.hotel_codes[row]],
+                table.customers.values[table.customer_codes[row]],
+                table.rooms[row],
+                table.check_ins[row], table.check_outs[row])
+        return index
+
+    def __contains__(self, reservation_id: object) -> bool:
+        with self.lock:
+            return reservation_id in self.table
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.table)
+
+    def __iter__(self) -> Iterator[Reservation]:
+        with self.lock:
+            return iter(list(self.table.values()))
+
+    def get(self, reservation_id: str) -> Reservation | None:
+        """Return the reservation with this ID, if any."""
+        with self.lock:
+            return self.table.get(reservation_id)
+
+    def room_holder(
+        self,
+        hotel_id: str,
+        room: int,
+        check_in: date | None = None,
+        check_out: date | None = None,
+    ) -> str | None:
+        """Return the ID of a reservation overlapping the stay, if any."""
+        with self.lock:
+            schedule = self.by_room.get((hotel_id, room))
+            if schedule is None:
+                return None
+            return schedule.conflict(
+                check_in or date.min, check_out or date.max)
+
+    def for_hotel(self, hotel_id: str) -> list[Reservation]:
+        """Return the reservations of one hotel."""
+        with self.lock:
+            return [
+                self.table[rid] for rid in self.by_hotel.get(hotel_id, ())]
+
+    def rooms_booked(
+        self,
+        hotel_id: str,
+        low: int = 1,
+        high: int | None = None,
+    ) -> list[int]:
+        """Return a hotel's booked room numbers in [low, high], in order."""
+        with self.lock:
+            rooms = self.booked_rooms.get(hotel_id, [])
+            end = len(rooms) if high is None else bisect_right(rooms, high)
+            return rooms[bisect_left(rooms, low):end]
+
+    def beyond(self, hotel_id: str, capacity: int) -> list[Reservation]:
+        """Return the reservations of rooms numbered above capacity,
+        ordered by room and check-in, in O(log n + found)."""
+        with self.lock:
+            return [
+                self.table[rid]
+                for room in self.rooms_booked(hotel_id, capacity + 1)
+                for rid in self.by_room[(hotel_id, room)].ids()]
+
+    def for_customer(self, customer_id: str) -> list[Reservation]:
+        """Return the reservations of one customer."""
+        with self.lock:
+            return [
+                self.table[rid]
+                for rid in self.by_customer.get(customer_id, ())]
+
+    def rows(self) -> Mapping[str, Reservation]:
+        """Return a view of the table that reads each row under ``lock``,
+        for storage writes, which must not hold it for their whole I/O."""
+        return _LockedRows(self)
+
+    def add(self, reservation: Reservation) -> None:
+        """Insert or replace a reservation and update every index."""
+        with self.lock:
+            if reservation.reservation_id in self.table:
+                self.remove(reservation.reservation_id)
+
+            self.table.add(reservation)
+            row = self.table.rows[reservation.reservation_id]
+            self._link(
+                self.table.ids[row], reservation.hotel_id,
+                reservation.customer_id, reservation.room,
+                self.table.check_ins[row], self.table.check_outs[row])
+
+    def remove(self, reservation_id: str) -> Reservation:
+        """Remove a reservation from every index and return it."""
+        with self.lock:
+            reservation = self.table.remove(reservation_id)
+
+            room_key = (reservation.hotel_id, reservation.room)
+            schedule = self.by_room[room_key]
+            schedule.remove(*stay(reservation), reservation_id)
+            if not schedule:
+                del self.by_room[room_key]
+                rooms = self.booked_rooms[reservation.hotel_id]
+                del rooms[bisect_left(rooms, reservation.room)]
+                if not rooms:
+                    del self.booked_rooms[reservation.hotel_id]
+            _discard(self.by_hotel, reservation.hotel_id, reservation_id)
+            _discard(self.by_customer, reservation.customer_id, reservation_id)
+            return reservation
+
+    def _link(
+        self,
+        reservation_id: str,
+        hotel_id: str,
+        customer_id: str,
+        room: int,
+        check_in: int,
+        check_out: int,
+    ) -> None:
+        """Add one table row, given by its column values, to the indexes."""
+        start = date.fromordinal(check_in) if check_in else date.min
+        end = date.fromordinal(check_out) if check_out else date.max
+        schedule = self.by_room.get((hotel_id, room))
+        if schedule is None:
+            schedule = self.by_room[(hotel_id, room)] = RoomSchedule()
+            insort(self.booked_rooms.setdefault(hotel_id, []), room)
+        schedule.add(start, end, reservation_id)
+        self.by_hotel.setdefault(hotel_id, {})[reservation_id] = None
+        self.by_customer.setdefault(customer_id, {})[reservation_id] = None
+
+
+class _LockedRows(Mapping[str, Reservation]):
+    """Table view whose every access holds the index lock only briefly.
+
+    Rows removed by another thread after the keys were listed are
+    skipped by ``values``.
+    """
+
+    def __init__(self, index: ReservationIndex) -> None:
+        self._index = index
+
+    def __getitem__(self, reservation_id: str) -> Reservation:
+        with self._index.lock:
+            return self._index.table[reservation_id]
+
+    def __iter__(self) -> Iterator[str]:
+        with self._index.lock:
+            return iter(list(self._index.table))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def values(self) -> Iterator[Reservation]:  # type: ignore[override]
+        for reservation_id in self:
+            reservation = self._index.get(reservation_id)
+            if reservation is not None:
+                yield reservation
+
+
+def _discard(
+    buckets: dict[str, dict[str, Any]],
+    key: str,
+    member: str,
+) -> None:
+    bucket = buckets.get(key)
+    if bucket is None:
+        return
+    bucket.pop(member, None)
+    if not bucket:
+        del buckets[key]
+
+
+def normalize_location(location: str) -> str:
+    """Return the form of a location used as an index key."""
+    return location.strip().casefold()
+
+
+class OccupancyIndex:
+    """Per-hotel room bitmaps plus a location -> hotels index.
+
+    Byte ``room - 1`` of a hotel's bitmap is 1 while the room has at least
+    one reservation. Counting and finding free rooms then run as
+    ``bytearray.count``/``find`` over contiguous memory instead of Python
+    loops over reservations.
+    """
+
+    def __init__(self) -> None:
+        self.bitmaps: dict[str, bytearray] = {}
+        self.locations: dict[str, str] = {}
+        self.by_location: dict[str, dict[str, None]] = {}
+
+    @classmethod
+    def build(
+        cls,
+        hotels: Iterable[Hotel],
+        reservations: ReservationIndex,
+    ) -> "OccupancyIndex":
+        """Build the index from the current hotels and reservations."""
+        index = cls()
+        for hotel in hotels:
+            index.put_hotel(hotel)
+        for hotel_id, room in reservations.by_room:
+            index.set_room(hotel_id, room, True)
+        return index
+
+    def put_hotel(self, hotel: Hotel) -> None:
+        """Add a hotel or apply a change to its capacity or location."""
+        bitmap = self.bitmaps.get(hotel.hotel_id)
+        if bitmap is None:
+            self.bitmaps[hotel.hotel_id] = bytearray(hotel.rooms)
+        elif len(bitmap) < hotel.rooms:
+            bitmap.extend(bytes(hotel.rooms - len(bitmap)))
+        else:
+            del bitmap[hotel.rooms:]
+
+        location = normalize_location(hotel.location)
+        previous = self.locations.get(hotel.hotel_id)
+        if previous != location:
+            if previous is not None:
+                _discard(self.by_location, previous, hotel.hotel_id)
+            self.locations[hotel.hotel_id] = location
+            self.by_location.setdefault(location, {})[hotel.hotel_id] = None
+
+    def drop_hotel(self, hotel_id: str) -> None:
+        """Forget a hotel."""
+        self.bitmaps.pop(hotel_id, None)
+        location = self.locations.pop(hotel_id, None)
+        if location is not None:
+            _discard(self.by_location, location, hotel_id)
+
+    def set_room(self, hotel_id: str, room: int, occupied: bool) -> None:
+        """Mark a room as holding reservations or not."""
+        bitmap = self.bitmaps.get(hotel_id)
+        if bitmap is not None and 0 < room <= len(bitmap):
+            bitmap[room - 1] = 1 if occupied else 0
+
+    def free_count(self, hotel_id: str) -> int:
+        """Return how many rooms of a hotel have no reservations; a hotel
+        dropped meanwhile by another thread has none."""
+        return self.bitmaps.get(hotel_id, bytearray()).count(0)
+
+    def rooms_with(
+        self,
+        hotel_id: str,
+        occupied: bool,
+        limit: int | None = None,
+    ) -> Iterator[int]:
+        """Yield room numbers that are (or are not) occupied, in order."""
+        bitmap = self.bitmaps.get(hotel_id, bytearray())
+        needle = 1 if occupied else 0
+        found = 0
+        position = bitmap.find(needle)
+        while position != -1 and (limit is None or found < limit):
+            yield position + 1
+            found += 1
+            position = bitmap.find(needle, position + 1)
+
+    def hotels_in(self, location: str) -> list[str]:
+        """Return the IDs of the hotels at a location."""
+        return list(self.by_location.get(normalize_location(location), {}))
@@ -0,0 +1,253 @@
+"""Append-only JSONL journal on top of a JSON snapshot file."""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterable, TextIO
+
+from reservation_system.storage import (
+    FileSignature,
+    file_lock,
+    file_signature,
+    load_list,
+    write_atomic,
+)
+
+DEFAULT_COMPACT_BYTES = 4 * 1024 * 1024
+
+
+class Journal:
+    """Snapshot plus journal for one collection.
+
+    The snapshot is the regular JSON list file. Every change is appended
+    to ``<name>.journal`` as one JSON record per line, either
+    ``{"op": "put", "item": {...}}`` or ``{"op": "delete", "key": ...}``.
+    Both operations are idempotent, so replaying a record twice is safe.
+
+    Appends are fsynced once per ``group_size`` calls. When the journal
+    grows past ``compact_bytes`` it is rotated to ``<name>.compacting``
+    and folded into a new snapshot on a background thread, while new
+    appends go to a fresh journal. Callers sharing the files across
+    processes must append under the storage lock; the journal reopens
+    its file when another process has rotated it. Folds hold
+    ``<name>.compact.lock``, so only one process folds a rotated journal
+    and the others find it gone.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        key: str,
+        compact_bytes: int = DEFAULT_COMPACT_BYTES,
+        group_size: int = 1,
+    ) -> None:
+        self.path = path
+        self.key = key
+        self.compact_bytes = compact_bytes
+        self.group_size = max(1, group_size)
+        self.journal_path = path.with_name(path.stem + ".journal")
+        self.pending_path = path.with_name(path.stem + ".compacting")
+        self.compact_lock_path = path.with_name(path.stem + ".compact.lock")
+
+        self._lock = threading.RLock()
+        self._handle: TextIO | None = None
+        self._unsynced = 0
+        self._compactor: threading.Thread | None = None
+
+    def signature(self) -> tuple[FileSignature | None, ...]:
+        """Return the combined signature of the snapshot and journals."""
+        with self._lock:
+            return (
+                file_signature(self.path),
+                file_signature(self.pending_path),
+                file_signature(self.journal_path),
+            )
+
+    def load(self) -> list[dict[str, Any]]:
+        """Rebuild the collection from the snapshot and the journals.
+
+        Another process may compact between reading the snapshot and the
+        journals, so the files are read again until their signature is
+        the same before and after.
+        """
+        with self._lock:
+            while True:
+                before = self.signature()
+                items: dict[str, dict[str, Any]] = {}
+                for item in load_list(self.path):
+                    if self.key in item:
+                        items[str(item[self.key])] = item
+                _replay(self.pending_path, self.key, items)
+                _replay(self.journal_path, self.key, items)
+                if self.signature() == before:
+                    return list(items.values())
+
+    def append(
+        self,
+        puts: Iterable[dict[str, Any]] = (),
+        deletes: Iterable[str] = (),
+    ) -> None:
+        """Append put/delete records for one logical change."""
+        lines = [json.dumps({"op": "put", "item": item}) for item in puts]
+        lines += [json.dumps({"op": "delete", "key": key}) for key in deletes]
+        if not lines:
+            return
+
+        with self._lock:
+            handle = self._open()
+            handle.write("\n".join(lines) + "\n")
+            handle.flush()
+            self._unsynced += 1
+            if self._unsynced >= self.group_size:
+                os.fsync(handle.fileno())
+                self._unsynced = 0
+            size = handle.tell()
+
+        if size >= self.compact_bytes:
+            self.compact(background=True)
+
+    def flush(self) -> None:
+        """Force any appended but not yet fsynced records to disk."""
+        with self._lock:
+            if self._handle is not None and self._unsynced:
+                os.fsync(self._handle.fileno())
+            self._unsynced = 0
+
+    def compact(self, background: bool = False) -> None:
+        """Fold the journal into a new snapshot."""
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            if not self.pending_path.exists():
+                if not self.journal_path.exists():
+                    return
+                self.flush()
+                self._close()
+                try:
+                    # Unlike a rename, link fails if another process has
+                    # rotated its journal meanwhile.
+                    os.link(self.journal_path, self.pending_path)
+                except FileExistsError:
+                    pass
+                else:
+                    self.journal_path.unlink()
+
+            if background:
+                self._compactor = threading.Thread(
+                    target=self._fold_pending, daemon=True)
+                self._compactor.start()
+                return
+        self._fold_pending()
+
+    def wait(self) -> None:
+        """Block until a running background compaction has finished."""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def close(self) -> None:
+        """Flush the journal and release its file handle."""
+        self.wait()
+        with self._lock:
+            self.flush()
+            self._close()
+
+    def _fold_pending(self) -> None:
+        with file_lock(self.compact_lock_path):
+            # Another process may have folded it while we waited.
+            if not self.pending_path.exists():
+                return
+            items: dict[str, dict[str, Any]] = {}
+            for item in load_list(self.path):
+                if self.key in item:
+                    items[str(item[self.key])] = item
+            _replay(self.pending_path, self.key, items)
+
+            # Replaying the pending journal over the new snapshot is
+            # harmless, and load() retries if it raced with the unlink.
+            write_atomic(self.path, json.dumps(list(items.values())))
+            self.pending_path.unlink()
+
+    def _open(self) -> TextIO:
+        if self._handle is not None and self._rotated(self._handle):
+            self._close()
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            _repair_tail(self.journal_path)
+            self._handle = self.journal_path.open("a", encoding="utf-8")
+        return self._handle
+
+    def _rotated(self, handle: TextIO) -> bool:
+        """Return True if another process moved the journal away."""
+        try:
+            current = os.stat(self.journal_path)
+        except FileNotFoundError:
+            return True
+        return os.fstat(handle.fileno()).st_ino != current.st_ino
+
+    def _close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+def _repair_tail(path: Path) -> None:
+    """Cut a torn final line left by a crashed append, so the records
+    appended next start on a line of their own."""
+    try:
+        handle = path.open("rb+")
+    except FileNotFoundError:
+        return
+
+    with handle:
+        size = end = handle.seek(0, os.SEEK_END)
+        while end:
+            step = min(end, 4096)
+            handle.seek(end - step)
+            newline = handle.read(step).rfind(b"\n")
+            if newline != -1:
+                end -= step - newline - 1
+                break
+            end -= step
+        if end != size:
+            handle.truncate(end)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+
+def _replay(path: Path, key: str, items: dict[str, dict[str, Any]]) -> None:
+    """Apply journal records from path onto items, in order.
+
+    A final line without its newline, or that does not parse, is a torn
+    append and is skipped; a bad line before the last raises ValueError.
+    """
+    try:
+        handle = path.open("r", encoding="utf-8")
+    except FileNotFoundError:
+        return
+
+    with handle:
+        lines = iter(handle)
+        line = next(lines, None)
+        number = 1
+        while line is not None:
+            following = next(lines, None)
+            if following is None and not line.endswith("\n"):
+                break
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                if following is None:
+                    break
+                raise ValueError(
+                    f"Corrupt journal record at {path}:{number}.") from exc
+            if record.get("op") == "put":
+                item = record.get("item")
+                if isinstance(item, dict) and key in item:
+                    items[str(item[key])] = item
+            elif record.get("op") == "delete":
+                items.pop(str(record.get("key")), None)
+            line = following
+            number += 1
@@ -0,0 +1,269 @@
+"""In-process counters and latency histograms with a Prometheus dump."""
+from __future__ import annotations
+
+import functools
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+Labels = tuple[tuple[str, str], ...]
+
+# Upper bounds in seconds, from 50 microseconds to 10 seconds.
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+DESCRIPTIONS = {
+    "reservation_operations_total": "ReservationSystem calls.",
+    "reservation_operation_errors_total":
+        "ReservationSystem calls that raised, by error category.",
+    "reservation_operation_seconds": "ReservationSystem call latency.",
+    "reservation_phase_seconds":
+        "Time writes spend validating in memory and committing.",
+    "reservation_write_retries_total":
+        "Writes retried after another process changed the data.",
+    "reservation_query_cache_total":
+        "Query cache lookups, by hit or miss.",
+    "reservation_storage_read_bytes_total": "Bytes read by load_list.",
+    "reservation_storage_written_bytes_total": "Bytes written by save_list.",
+    "reservation_storage_read_seconds": "Disk time of load_list.",
+    "reservation_storage_parse_seconds": "JSON parse time of load_list.",
+    "reservation_storage_serialize_seconds":
+        "JSON serialize time of save_list.",
+    "reservation_storage_write_seconds": "Disk time of save_list.",
+}
+
+
+@dataclass
+class Sample:
+    """One recorded value, as passed to hooks."""
+    kind: str
+    name: str
+    value: float
+    labels: dict[str, str]
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """Return (upper bound, count of values <= bound) pairs."""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+def _labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def error_category(error: BaseException) -> str:
+    """Reduce an error message to a short label, e.g. ``hotel_not_found``.
+
+    Text after a colon is dropped so messages carrying IDs or paths do
+    not create a new category each.
+    """
+    message = str(error).split(":", 1)[0].strip().lower()
+    category = re.sub(r"[^a-z0-9]+", "_", message).strip("_")[:48]
+    return category or type(error).__name__.lower()
+
+
+def _escape(value: str) -> str:
+    return (value.replace("\\", "\\\\").replace("\n", "\\n")
+            .replace('"', '\\"'))
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{key}="{_escape(value)}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Metrics:
+    """Thread-safe registry of counters and histograms.
+
+    Hooks added with ``add_hook`` receive every ``Sample`` as it is
+    recorded, e.g. to forward timings to a tracing system. An exception
+    raised by a hook is swallowed so it cannot break the operation.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counters: dict[tuple[str, Labels], float] = {}
+        self.histograms: dict[tuple[str, Labels], Histogram] = {}
+        self.hooks: list[Callable[[Sample], None]] = []
+
+    def add_hook(self, hook: Callable[[Sample], None]) -> None:
+        """Call hook with every sample recorded from now on."""
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[Sample], None]) -> None:
+        """Stop calling a hook."""
+        self.hooks.remove(hook)
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Add value to a counter."""
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+        self._notify("counter", name, value, labels)
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record a value, in seconds for timings, in a histogram."""
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+        self._notify("histogram", name, value, labels)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Observe the duration of the enclosed block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def counter(self, name: str, **labels: Any) -> float:
+        """Return the current value of a counter."""
+        with self._lock:
+            return self.counters.get((name, _labels(labels)), 0)
+
+    def histogram(self, name: str, **labels: Any) -> Histogram | None:
+        """Return a histogram, or None if nothing was recorded."""
+        with self._lock:
+            return self.histograms.get((name, _labels(labels)))
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return every counter and histogram as plain data."""
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(
+                        self.counters.items())],
+                "histograms": [
+                    {"name": name, "labels": dict(labels),
+                     "count": h.count, "sum": h.sum,
+                     "buckets": h.cumulative()}
+                    for (name, labels), h in sorted(
+                        self.histograms.items())],
+            }
+
+    def reset(self) -> None:
+        """Forget every recorded value; hooks stay registered."""
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        seen: set[str] = set()
+
+        def header(name: str, kind: str) -> None:
+            if name in seen:
+                return
+            seen.add(name)
+            if name in DESCRIPTIONS:
+                lines.append(f"# HELP {name} {DESCRIPTIONS[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                header(name, "counter")
+                lines.append(f"{name}{_format_labels(labels)} {value:g}")
+            for (name, labels), hist in sorted(self.histograms.items()):
+                header(name, "histogram")
+                buckets = [
+                    (f"{bound:g}", count)
+                    for bound, count in hist.cumulative()]
+                buckets.append(("+Inf", hist.count))
+                for bound, count in buckets:
+                    bucket_labels = _format_labels(labels, f'le="{bound}"')
+                    lines.append(f"{name}_bucket{bucket_labels} {count}")
+                lines.append(
+                    f"{name}_sum{_format_labels(labels)} {hist.sum:.9g}")
+                lines.append(
+                    f"{name}_count{_format_labels(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Path) -> None:
+        """Atomically write ``to_prometheus()`` to a file, e.g. for the
+        node_exporter textfile collector."""
+        # Imported here because storage records its own metrics.
+        from reservation_system.storage import write_atomic
+
+        write_atomic(Path(path), self.to_prometheus())
+
+    def _notify(
+        self,
+        kind: str,
+        name: str,
+        value: float,
+        labels: dict[str, Any],
+    ) -> None:
+        if not self.hooks:
+            return
+        sample = Sample(kind, name, value, {
+            key: str(label) for key, label in labels.items()})
+        for hook in list(self.hooks):
+            try:
+                hook(sample)
+            except Exception:  # pylint: disable=broad-except
+                continue
+
+
+registry = Metrics()
+
+
+def instrumented(method: F) -> F:
+    """Count, time and categorize the errors of a ReservationSystem call."""
+    operation = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        except Exception as exc:
+            registry.increment(
+                "reservation_operation_errors_total",
+                operation=operation, category=error_category(exc))
+            raise
+        finally:
+            registry.increment(
+                "reservation_operations_total", operation=operation)
+            registry.observe(
+                "reservation_operation_seconds",
+                time.perf_counter() - started, operation=operation)
+
+    return wrapper  # type: ignore[return-value]
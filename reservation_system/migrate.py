@@ -0,0 +1,35 @@
+"""Command-line tool converting a data directory to a scalable layout.
+
+Usage: ``python -m reservation_system.migrate DATA_DIR [--shards N]`` for
+sharded reservations, or ``--segments`` to split every collection into
+segment files.
+"""
+from __future__ import annotations
+
+import argparse
+
+from reservation_system.backends import migrate_to_segments, migrate_to_shards
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Migrate a data directory into shards or segment files."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("data_dir")
+    parser.add_argument("--shards", type=int, default=64)
+    parser.add_argument("--directory-buckets", type=int, default=16)
+    parser.add_argument("--segments", action="store_true")
+    parser.add_argument("--segment-size", type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    if args.segments:
+        count = migrate_to_segments(args.data_dir, args.segment_size)
+        print(f"Migrated {count} records into segments of "
+              f"{args.segment_size}.")
+        return
+    count = migrate_to_shards(
+        args.data_dir, args.shards, args.directory_buckets)
+    print(f"Migrated {count} reservations into {args.shards} shards.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import date
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Hotel:
     """Hotel entity."""
     hotel_id: str
@@ -33,7 +34,7 @@ class Hotel:
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Customer:
     """Customer entity."""
     customer_id: str
@@ -58,22 +59,34 @@ class Customer:
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Reservation:
-    """Reservation entity."""
+    """Reservation entity.
+
+    ``check_in``/``check_out`` are optional and describe the half-open stay
+    ``[check_in, check_out)``. A reservation without dates holds its room
+    indefinitely, which is how records created before dates existed load.
+    """
     reservation_id: str
     hotel_id: str
     customer_id: str
     room: int
+    check_in: date | None = None
+    check_out: date | None = None
 
     def to_dict(self) -> dict[str, Any]:
         """Convert reservation to dictionary for JSON storage."""
-        return {
+        data: dict[str, Any] = {
             "reservation_id": self.reservation_id,
             "hotel_id": self.hotel_id,
             "customer_id": self.customer_id,
             "room": self.room,
         }
+        if self.check_in is not None:
+            data["check_in"] = self.check_in.isoformat()
+        if self.check_out is not None:
+            data["check_out"] = self.check_out.isoformat()
+        return data
 
     @staticmethod
     def from_dict(data: dict[str, Any]) -> "Reservation":
@@ -83,4 +96,15 @@ class Reservation:
             hotel_id=str(data["hotel_id"]),
             customer_id=str(data["customer_id"]),
             room=int(data["room"]),
+            check_in=parse_date(data.get("check_in")),
+            check_out=parse_date(data.get("check_out")),
         )
+
+
+def parse_date(value: Any) -> date | None:
+    """Parse an ISO date, passing through None and date objects."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
@@ -0,0 +1,184 @@
+"""Bounded LRU/TTL cache for read query results."""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterable, Mapping
+
+Tag = tuple[str, str]
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how well the cache is doing."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Return hits / lookups, or 0.0 before the first lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class _Entry:
+    value: Any
+    tags: tuple[Tag, ...]
+    expires: float | None
+
+
+class QueryCache:
+    """LRU result cache with precise, tag-based invalidation.
+
+    Each entry is stored with the tags of the entities it was computed
+    from, e.g. ``("hotel", "H1")``, and ``invalidate`` drops exactly the
+    entries carrying a tag. Entries also depend on whole collections: the
+    cache remembers the storage signature of each collection, and a
+    lookup under a different signature (another process wrote) drops
+    every entry reading that collection. The owner calls ``advance``
+    after its own writes, having invalidated the affected tags, so the
+    other entries survive.
+
+    ``put`` takes the ``generation`` read before the result was computed
+    and ignores the result if anything was invalidated meanwhile, so a
+    slow reader cannot store data a concurrent writer just replaced.
+
+    At most ``max_entries`` results are kept, least recently used first
+    out; with ``ttl`` (seconds) entries also expire by age.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0.")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._by_tag: dict[Tag, set[Hashable]] = {}
+        self._signatures: dict[str, Any] = {}
+        self._stats = CacheStats()
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        key: Hashable,
+        signatures: Mapping[str, Any],
+    ) -> tuple[bool, Any]:
+        """Return (True, value) on a hit, (False, None) on a miss.
+
+        ``signatures`` are the current storage signatures of the
+        collections the query reads.
+        """
+        with self._lock:
+            self._check_signatures(signatures)
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires is not None and (
+                    self._clock() >= entry.expires):
+                self._remove(key)
+                self._stats.expirations += 1
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return True, entry.value
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        tags: Iterable[Tag],
+        collections: Iterable[str],
+        generation: int,
+    ) -> None:
+        """Store a result of the given collections, computed after
+        ``generation`` was read."""
+        with self._lock:
+            if generation != self.generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            entry_tags = tuple(tags) + tuple(
+                ("collection", c) for c in collections)
+            expires = None if self.ttl is None else self._clock() + self.ttl
+            self._entries[key] = _Entry(value, entry_tags, expires)
+            for tag in entry_tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def invalidate(self, *tags: Tag) -> None:
+        """Drop every entry carrying one of the tags."""
+        with self._lock:
+            self.generation += 1
+            for tag in tags:
+                self._drop_tag(tag)
+
+    def invalidate_collection(self, collection: str) -> None:
+        """Drop every entry that reads a collection."""
+        with self._lock:
+            self.generation += 1
+            self._drop_tag(("collection", collection))
+            self._signatures.pop(collection, None)
+
+    def advance(self, collection: str, signature: Any) -> None:
+        """Declare the remaining entries valid under a new signature."""
+        with self._lock:
+            self._signatures[collection] = signature
+
+    def clear(self) -> None:
+        """Drop every entry; statistics are kept."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._by_tag.clear()
+            self._signatures.clear()
+
+    def stats(self) -> CacheStats:
+        """Return a copy of the hit/miss statistics."""
+        with self._lock:
+            return CacheStats(
+                self._stats.hits, self._stats.misses, self._stats.evictions,
+                self._stats.expirations, self._stats.invalidations,
+                len(self._entries))
+
+    def _check_signatures(self, signatures: Mapping[str, Any]) -> None:
+        for collection, signature in signatures.items():
+            if collection not in self._signatures:
+                self._signatures[collection] = signature
+            elif self._signatures[collection] != signature:
+                self.generation += 1
+                self._drop_tag(("collection", collection))
+                self._signatures[collection] = signature
+
+    def _drop_tag(self, tag: Tag) -> None:
+        for key in list(self._by_tag.get(tag, ())):
+            self._remove(key)
+            self._stats.invalidations += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
@@ -0,0 +1,80 @@
+"""Write-ahead intent record for commits spanning several collections."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+from reservation_system.backends import KEYS, MODELS, Storage
+from reservation_system.storage import write_atomic
+
+INTENT_NAME = ".commit-intent.json"
+
+
+class CommitLog:
+    """Records a multi-collection commit before any collection is written.
+
+    ``record`` writes every put and delete of the commit to one file,
+    atomically and fsynced. The collections are then written one by one
+    and ``clear`` removes the record. If the process dies in between, the
+    record is still there and ``replay`` rolls the commit forward; if it
+    dies before the record is complete, nothing was written and the
+    commit is simply gone. Puts and deletes are idempotent, so replaying
+    a commit that had partly reached the collections is safe.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.path = Path(directory) / INTENT_NAME
+
+    def pending(self) -> bool:
+        """Return True if an unfinished commit is recorded."""
+        return self.path.exists()
+
+    def record(
+        self,
+        collections: Iterable[str],
+        entities: Mapping[str, Mapping[str, Any]],
+        changed: Mapping[str, Iterable[str]],
+        removed: Mapping[str, Iterable[str]],
+    ) -> None:
+        """Durably write the intent of a commit."""
+        intent = {
+            collection: {
+                "put": [
+                    entities[collection][key].to_dict()
+                    for key in changed[collection]],
+                "delete": list(removed[collection]),
+            }
+            for collection in collections}
+        write_atomic(self.path, json.dumps(intent))
+
+    def clear(self) -> None:
+        """Mark the recorded commit as fully applied."""
+        self.path.unlink(missing_ok=True)
+
+    def replay(self, storage: Storage) -> bool:
+        """Apply a leftover commit to storage; return True if there was one.
+
+        Call with the storage lock held.
+        """
+        try:
+            intent = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return False
+
+        for collection, change in intent.items():
+            key = KEYS[collection]
+            model = MODELS[collection]
+            items = {
+                str(data[key]): data for data in storage.load(collection)}
+            puts = [str(data[key]) for data in change["put"]]
+            for data in change["put"]:
+                items[str(data[key])] = data
+            for item_key in change["delete"]:
+                items.pop(item_key, None)
+            entities = {
+                item_key: model.from_dict(data)
+                for item_key, data in items.items()}
+            storage.write(collection, entities, puts, change["delete"])
+        self.clear()
+        return True
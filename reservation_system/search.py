@@ -0,0 +1,232 @@
+"""Prefix and substring search over hotel and customer text fields."""
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Generic, Iterable, Iterator, TypeVar
+
+from reservation_system.models import Customer, Hotel
+
+T = TypeVar("T")
+
+# Fields searched for each kind of entity.
+HOTEL_FIELDS = ("name", "location")
+CUSTOMER_FIELDS = ("name", "email")
+
+
+def normalize_text(text: str) -> str:
+    """Return the form of a value used for matching."""
+    return " ".join(text.casefold().split())
+
+
+def _terms(value: str) -> list[str]:
+    """Return the indexed terms of a normalized value: the whole value and
+    every tail starting at a word, so "ana garcia" is found by "garc" too.
+    """
+    terms = [value]
+    space = value.find(" ")
+    while space != -1:
+        terms.append(value[space + 1:])
+        space = value.find(" ", space + 1)
+    return terms
+
+
+def _grams(value: str) -> set[str]:
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+@dataclass
+class SearchPage(Generic[T]):
+    """One page of search results and the offset of the next page."""
+    items: list[T] = field(default_factory=list)
+    next_offset: int | None = None
+
+
+class TextIndex:
+    """Sorted (term, ID) pairs for one field, plus an optional trigram
+    index for substring queries.
+
+    Prefix queries bisect to the first term starting with the prefix and
+    walk forward, so they cost O(log n) plus the page. The trigram index
+    is only built by the first substring query and maintained after.
+    """
+
+    def __init__(self) -> None:
+        self.keys: list[tuple[str, str]] = []
+        self.values: dict[str, str] = {}
+        self.grams: dict[str, set[str]] | None = None
+
+    @classmethod
+    def build(cls, items: Iterable[tuple[str, str]]) -> "TextIndex":
+        """Build from (ID, raw value) pairs with one sort."""
+        index = cls()
+        index.values = {key: normalize_text(value) for key, value in items}
+        index.keys = [
+            (term, key)
+            for key, value in index.values.items() for term in _terms(value)]
+        index.keys.sort()
+        return index
+
+    def put(self, key: str, value: str) -> None:
+        """Index or re-index an entity's value."""
+        value = normalize_text(value)
+        previous = self.values.get(key)
+        if previous == value:
+            return
+        if previous is not None:
+            self.remove(key)
+        self.values[key] = value
+        for term in _terms(value):
+            insort(self.keys, (term, key))
+        if self.grams is not None:
+            for gram in _grams(value):
+                self.grams.setdefault(gram, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        """Forget an entity."""
+        value = self.values.pop(key, None)
+        if value is None:
+            return
+        for term in _terms(value):
+            i = bisect_left(self.keys, (term, key))
+            if i < len(self.keys) and self.keys[i] == (term, key):
+                del self.keys[i]
+        if self.grams is not None:
+            for gram in _grams(value):
+                keys = self.grams[gram]
+                keys.discard(key)
+                if not keys:
+                    del self.grams[gram]
+
+    def prefix(self, text: str) -> Iterator[tuple[str, str]]:
+        """Yield (term, ID) for terms starting with text, in order."""
+        keys = self.keys
+        i = bisect_left(keys, (text, ""))
+        while True:
+            try:
+                pair = keys[i]
+            except IndexError:  # the end, or shrunk by another thread
+                return
+            if not pair[0].startswith(text):
+                return
+            yield pair
+            i += 1
+
+    def build_grams(self) -> None:
+        """Build the trigram index if it does not exist yet."""
+        if self.grams is not None:
+            return
+        grams: dict[str, set[str]] = {}
+        for key, value in self.values.items():
+            for gram in _grams(value):
+                grams.setdefault(gram, set()).add(key)
+        self.grams = grams
+
+    def substring(self, text: str) -> list[str]:
+        """Return the IDs whose value contains text."""
+        if len(text) < 3:
+            return [k for k, v in list(self.values.items()) if text in v]
+        self.build_grams()
+        grams = self.grams or {}
+        postings = sorted(
+            (grams.get(gram, set()) for gram in _grams(text)), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        # Skip IDs another thread removed since the postings were read.
+        return [k for k in candidates if text in self.values.get(k, "")]
+
+
+class SearchIndex:
+    """One ``TextIndex`` per searched field of a kind of entity."""
+
+    def __init__(self, fields: tuple[str, ...]) -> None:
+        self.fields = fields
+        self.indexes = {name: TextIndex() for name in fields}
+
+    @classmethod
+    def build(
+        cls,
+        fields: tuple[str, ...],
+        entities: Iterable[tuple[str, Any]],
+    ) -> "SearchIndex":
+        """Build from (ID, entity) pairs."""
+        index = cls(fields)
+        entities = list(entities)
+        for name in fields:
+            index.indexes[name] = TextIndex.build(
+                (key, getattr(entity, name)) for key, entity in entities)
+        return index
+
+    def put(self, key: str, entity: Any) -> None:
+        """Index or re-index an entity."""
+        for name, index in self.indexes.items():
+            index.put(key, getattr(entity, name))
+
+    def remove(self, key: str) -> None:
+        """Forget an entity."""
+        for index in self.indexes.values():
+            index.remove(key)
+
+    def grams_ready(self, fields: Iterable[str] | None = None) -> bool:
+        """Return True if substring search on the fields needs no build."""
+        return all(
+            self.indexes[name].grams is not None
+            for name in self._fields(fields))
+
+    def build_grams(self, fields: Iterable[str] | None = None) -> None:
+        """Build the trigram indexes of the fields."""
+        for name in self._fields(fields):
+            self.indexes[name].build_grams()
+
+    def _fields(self, fields: Iterable[str] | None) -> tuple[str, ...]:
+        names = self.fields if fields is None else tuple(fields)
+        unknown = set(names) - set(self.fields)
+        if unknown:
+            raise ValueError(f"Unknown search field: {sorted(unknown)[0]}.")
+        return names
+
+    def search(
+        self,
+        query: str,
+        fields: Iterable[str] | None = None,
+        substring: bool = False,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> tuple[list[str], bool]:
+        """Return a page of matching IDs and whether more follow.
+
+        Prefix matches come ordered by the matched term; substring
+        matches by ID. An ID matching several fields is listed once.
+        """
+        text = normalize_text(query)
+        indexes = [self.indexes[name] for name in self._fields(fields)]
+
+        if substring:
+            ids: Iterator[str] = iter(sorted(
+                {k for index in indexes for k in index.substring(text)}))
+        else:
+            ids = _unique(
+                key for _, key in heapq.merge(
+                    *(index.prefix(text) for index in indexes)))
+        page = list(islice(ids, offset, offset + limit + 1))
+        return page[:limit], len(page) > limit
+
+
+def _unique(keys: Iterable[str]) -> Iterator[str]:
+    seen: set[str] = set()
+    for key in keys:
+        if key not in seen:
+            seen.add(key)
+            yield key
+
+
+def hotel_index(hotels: Iterable[Hotel]) -> SearchIndex:
+    """Build the search index of the hotels."""
+    return SearchIndex.build(HOTEL_FIELDS, ((h.hotel_id, h) for h in hotels))
+
+
+def customer_index(customers: Iterable[Customer]) -> SearchIndex:
+    """Build the search index of the customers."""
+    return SearchIndex.build(
+        CUSTOMER_FIELDS, ((c.customer_id, c) for c in customers))
@@ -1,43 +1,979 @@
 """Business logic for managing hotels, customers, and reservations."""
 from __future__ import annotations
 
+import threading
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, replace
+from functools import partial
+from datetime import date
+from itertools import chain, takewhile
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, Mapping, TypeVar
 
-from reservation_system.models import Customer, Hotel, Reservation
-from reservation_system.storage import load_list, save_list
+from reservation_system.analytics import (
+    Activity,
+    Occupancy,
+    OccupancyAnalytics,
+    OccupancyReport,
+)
+from reservation_system.backends import (
+    COLLECTIONS,
+    CUSTOMERS,
+    HOTELS,
+    MODELS,
+    RESERVATIONS,
+    Storage,
+    iter_records,
+    open_storage,
+)
+from reservation_system.indexes import (
+    OccupancyIndex,
+    ReservationIndex,
+    RoomSchedule,
+    normalize_location,
+    stay,
+)
+from reservation_system.metrics import instrumented, registry
+from reservation_system.models import (
+    Customer,
+    Hotel,
+    Reservation,
+    parse_date,
+)
+from reservation_system.query_cache import QueryCache, Tag
+from reservation_system.recovery import CommitLog
+from reservation_system.search import (
+    SearchIndex,
+    SearchPage,
+    customer_index,
+    hotel_index,
+)
+
+T = TypeVar("T")
+
+# (needs the catalog lock, hotel IDs, customer IDs) an operation will touch.
+Scope = tuple[bool, Iterable[str], Iterable[str]]
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one item of a bulk operation."""
+    ok: bool
+    error: str | None = None
+
+
+class ChangeSet:
+    """Keys put or deleted per collection by one or more operations."""
+
+    def __init__(self) -> None:
+        # Dicts are used as insertion-ordered sets.
+        self.changed: dict[str, dict[str, None]] = {
+            name: {} for name in COLLECTIONS}
+        self.removed: dict[str, dict[str, None]] = {
+            name: {} for name in COLLECTIONS}
+
+    def __bool__(self) -> bool:
+        return any(self.changed.values()) or any(self.removed.values())
+
+    def put(self, collection: str, key: str) -> None:
+        """Record that an entity was created or replaced."""
+        self.removed[collection].pop(key, None)
+        self.changed[collection][key] = None
+
+    def delete(self, collection: str, key: str) -> None:
+        """Record that an entity was removed."""
+        self.changed[collection].pop(key, None)
+        self.removed[collection][key] = None
+
+    def touched(self) -> list[str]:
+        """Return the collections with at least one change."""
+        return [
+            name for name in COLLECTIONS
+            if self.changed[name] or self.removed[name]]
+
+    def copy(self) -> "ChangeSet":
+        """Return an independent copy, e.g. to restore after an undo."""
+        other = ChangeSet()
+        for name in COLLECTIONS:
+            other.changed[name] = dict(self.changed[name])
+            other.removed[name] = dict(self.removed[name])
+        return other
+
+
+class _CallState(threading.local):
+    """Per-thread bookkeeping for the operation currently running."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.depth = 0
+        self.checked: set[str] = set()
+        self.locks = 0
+        self.pending: ChangeSet | None = None
+        self.undo: list[Callable[[], None]] | None = None
 
 
 class ReservationSystem:
     """Business logic for hotels, customers,
-    and reservations with JSON persistence."""
+    and reservations with pluggable persistence.
+
+    The collections live behind a ``Storage`` backend. By default that is
+    one JSON file per collection in ``data_dir``, or ``SnapshotStorage``
+    or ``ShardedStorage`` when the directory holds binary snapshots or
+    sharded reservations (see ``open_storage``); ``journal=True`` selects
+    ``JournalStorage`` and ``storage=`` accepts any other backend, such as
+    ``SQLiteStorage``.
 
-    def __init__(self, data_dir: str = "data") -> None:
+    With ``cached=True`` the collections are kept in memory as dicts keyed
+    by ID and written through to the backend on every change. A collection
+    is loaded again only when the backend signature (for files: mtime,
+    size and inode) no longer matches the last load or save, so changes
+    made by other processes are still picked up.
+
+    Writes are optimistic: an operation validates against what it loaded,
+    then takes the storage lock and commits only if none of the
+    collections it read changed meanwhile. Otherwise it reloads and runs
+    again, up to ``write_retries`` times.
+
+    A commit that spans collections (a cascading delete, a
+    ``transaction()``) is first written to an intent file, so a crash
+    between the collection writes is finished when the directory is next
+    opened, and a write that fails is finished before the call returns.
+
+    With ``query_cache_size`` > 0 the results of the display, listing
+    and availability calls are kept in a ``QueryCache`` (``query_cache``)
+    of that many entries, optionally expiring after ``query_cache_ttl``
+    seconds. Writes drop only the entries of the hotels, customers and
+    locations they touch; a change by another process drops every entry
+    of the collection it changed.
+
+    Public calls are counted and timed in ``metrics.registry``, along with
+    the apply and commit phases of writes and the I/O of the JSON files.
+
+    With ``thread_safe=True`` (which implies ``cached``) one instance can
+    be shared by many threads. Reads take no stripes, only the brief
+    locks of the in-memory indexes, which writers never hold during I/O.
+    Writes lock only the stripes of the hotels and customers they touch,
+    so bookings for different hotels validate in parallel; catalog
+    changes and cascading deletes also take a catalog lock, and every
+    lock is acquired in one fixed order. Reloading after another process
+    wrote takes every lock, so only then do reads wait for writers.
+    """
+
+    def __init__(
+        self,
+        data_dir: str = "data",
+        cached: bool = False,
+        journal: bool = False,
+        storage: Storage | None = None,
+        write_retries: int = 5,
+        thread_safe: bool = False,
+        lock_stripes: int = 64,
+        query_cache_size: int = 0,
+        query_cache_ttl: float | None = None,
+    ) -> None:
         self.data_dir = Path(data_dir)
-        self.hotels_path = self.data_dir / "hotels.json"
-        self.customers_path = self.data_dir / "customers.json"
-        self.reservations_path = self.data_dir / "reservations.json"
+        if storage is None:
+            storage = open_storage(self.data_dir, journal)
+        self.storage = storage
+        self.cached = cached or thread_safe
+        self.write_retries = write_retries
+        self.thread_safe = thread_safe
+
+        self._hotels: dict[str, Hotel] = {}
+        self._customers: dict[str, Customer] = {}
+        self._reservations = ReservationIndex()
+        self._signatures: dict[str, Any] = {}
+        self._call = _CallState()
+
+        self._catalog_lock = threading.RLock()
+        self._hotel_stripes = [
+            threading.RLock() for _ in range(lock_stripes)]
+        self._customer_stripes = [
+            threading.RLock() for _ in range(lock_stripes)]
+        self._commit_lock = threading.RLock()
+
+        self._occupancy: OccupancyIndex | None = None
+        self._occupancy_source: tuple[Any, Any] | None = None
+        # Indexes built on first use by _derived.
+        self._derived_sources: dict[str, tuple[Any, ...]] = {}
+        self._analytics: OccupancyAnalytics | None = None
+        self._hotel_search: SearchIndex | None = None
+        self._customer_search: SearchIndex | None = None
+        self.query_cache = (
+            QueryCache(query_cache_size, query_cache_ttl)
+            if query_cache_size > 0 else None)
+
+        # Backends that commit several collections at once need no
+        # intent file; the others keep it next to their files.
+        self._commit_log: CommitLog | None = None
+        if getattr(storage, "atomic", None) is None:
+            self._commit_log = CommitLog(
+                getattr(storage, "data_dir", self.data_dir))
+        if self._commit_log is not None and self._commit_log.pending():
+            with self.storage.lock():
+                self._commit_log.replay(self.storage)
+
+    def close(self) -> None:
+        """Release the storage backend."""
+        self.storage.close()
 
     # ---------- Helpers ----------
-    def _load_hotels(self) -> list[Hotel]:
-        return [Hotel.from_dict(x) for x in load_list(self.hotels_path)]
+    def _is_fresh(self, collection: str) -> bool:
+        # A writer thread may drop the signature at any point, so it is
+        # read once.
+        loaded = self._signatures.get(collection)
+        if not self.cached or loaded is None:
+            return False
+        return self.storage.signature(collection) == loaded
 
-    def _save_hotels(self, hotels: list[Hotel]) -> None:
-        save_list(self.hotels_path, [h.to_dict() for h in hotels])
+    def _remember(self, collection: str, signature: Any) -> None:
+        self._signatures[collection] = (
+            signature if signature is not None
+            else self.storage.signature(collection))
 
-    def _load_customers(self) -> list[Customer]:
-        return [Customer.from_dict(x) for x in load_list(self.customers_path)]
+    def _sync(self, collection: str) -> None:
+        """Make sure the in-memory copy of a collection is current.
 
-    def _save_customers(self, customers: list[Customer]) -> None:
-        save_list(self.customers_path, [c.to_dict() for c in customers])
+        Inside ``_pinned`` a collection is checked at most once, so one
+        operation works against a single consistent load.
+        """
+        call = self._call
+        if collection in call.checked:
+            return
+        if self.thread_safe:
+            # Shared state is only replaced under every lock, by
+            # _ensure_loaded, which also picks up writes made by other
+            # processes. A thread already holding stripes carries on with
+            # what it has; its commit will see the collection as stale and
+            # retry after releasing them.
+            if not call.locks and not self._is_fresh(collection):
+                self._ensure_loaded((collection,))
+        elif not self._is_fresh(collection):
+            self._load_collection(collection)
+        if call.depth:
+            call.checked.add(collection)
 
-    def _load_reservations(self) -> list[Reservation]:
-        return [
-            Reservation.from_dict(x) for x in load_list(
-                self.reservations_path)]
+    def _load_collection(self, collection: str) -> None:
+        signature = self.storage.signature(collection)
+        if collection == HOTELS:
+            self._hotels = {h.hotel_id: h for h in self._load_hotels()}
+        elif collection == CUSTOMERS:
+            self._customers = {
+                c.customer_id: c for c in self._load_customers()}
+        else:
+            self._reservations = ReservationIndex.from_records(
+                self.storage.load(RESERVATIONS))
+        self._remember(collection, signature)
+
+    def _hotel_map(self) -> dict[str, Hotel]:
+        self._sync(HOTELS)
+        return self._hotels
+
+    def _customer_map(self) -> dict[str, Customer]:
+        self._sync(CUSTOMERS)
+        return self._customers
+
+    def _reservation_index(self) -> ReservationIndex:
+        self._sync(RESERVATIONS)
+        return self._reservations
+
+    def _write_through(
+        self,
+        collection: str,
+        entities: Mapping[str, Any],
+        changed: Iterable[str],
+        removed: Iterable[str],
+    ) -> None:
+        # The signature stays until the write succeeds, so readers keep
+        # serving memory meanwhile; a failed write forces a reload.
+        try:
+            self.storage.write(collection, entities, changed, removed)
+        except BaseException:
+            self._signatures.pop(collection, None)
+            raise
+        self._remember(collection, None)
+        if self.query_cache is not None:
+            # The write's own entries were dropped by the _put_* and
+            # _drop_* helpers; the rest stay valid for the new version.
+            self.query_cache.advance(
+                collection, self._signatures[collection])
+
+    @contextmanager
+    def _pinned(self) -> Iterator[None]:
+        """Load each collection at most once for the enclosed operations."""
+        call = self._call
+        call.depth += 1
+        try:
+            yield
+        finally:
+            call.depth -= 1
+            if not call.depth:
+                call.checked.clear()
+
+    def _invalidate(self, collections: Iterable[str]) -> None:
+        """Forget in-memory state so the next access reloads it."""
+        for collection in collections:
+            self._signatures.pop(collection, None)
+            self._call.checked.discard(collection)
+            if self.query_cache is not None:
+                self.query_cache.invalidate_collection(collection)
+
+    def _flush(self, changes: ChangeSet) -> None:
+        """Persist every collection touched by a change set."""
+        entities = {
+            HOTELS: self._hotels,
+            CUSTOMERS: self._customers,
+            # Threads holding other stripes may be changing reservations
+            # meanwhile; the view reads each row under the index lock.
+            RESERVATIONS: self._reservations.rows(),
+        }
+        touched = changes.touched()
+        spanning = len(touched) > 1
+        commit_log = self._commit_log if spanning else None
+        # A commit spanning collections is recorded first, so a crash
+        # between the collection writes is rolled forward on restart,
+        # unless the backend can write them all in one transaction.
+        if commit_log is not None:
+            commit_log.record(
+                touched, entities, changes.changed, changes.removed)
+        try:
+            with (self.storage.atomic()  # type: ignore[attr-defined]
+                  if spanning and commit_log is None else ExitStack()):
+                for collection in touched:
+                    self._write_through(
+                        collection, entities[collection],
+                        changes.changed[collection],
+                        changes.removed[collection])
+        except Exception as exc:
+            if commit_log is None:
+                raise
+            # The commit is recorded, so it is finished now rather than
+            # by whichever write comes next, after the caller was told it
+            # failed.
+            try:
+                commit_log.replay(self.storage)
+            except Exception:
+                exc.add_note(
+                    "The commit is recorded and will be completed by the "
+                    "next write.")
+                raise exc
+            self._invalidate(touched)
+            return
+        if commit_log is not None:
+            commit_log.clear()
+
+    def _commit(self, changes: ChangeSet) -> bool:
+        """Persist a change set unless another writer got there first.
+
+        Under the storage lock, every collection the operation read is
+        compared with the signature it was loaded at. If any of them moved
+        the in-memory state is discarded and False is returned so the
+        caller can retry against fresh data.
+        """
+        if not changes:
+            return True
+        with self._commit_lock, self.storage.lock():
+            if self._commit_log is not None and self._commit_log.pending():
+                # Another process died mid-commit; finish its commit and
+                # retry against the result.
+                self._commit_log.replay(self.storage)
+                self._invalidate(COLLECTIONS)
+                return False
+            stale = [
+                c for c in self._call.checked
+                if self.storage.signature(c) != self._signatures.get(c)]
+            if stale:
+                self._invalidate(set(stale) | set(changes.touched()))
+                return False
+            try:
+                self._flush(changes)
+            except Exception:
+                self._invalidate(changes.touched())
+                raise
+        return True
+
+    def _querying_storage(self) -> Any | None:
+        """Return the backend if it can validate a single write itself.
+
+        That holds for an uncached system, outside transactions and
+        groups, whose backend offers ``exists`` and ``room_conflict``
+        (``SQLiteStorage``). Such writes then check and persist one record
+        through the database instead of loading every collection.
+        """
+        if self.cached or self._call.pending is not None:
+            return None
+        if getattr(self.storage, "room_conflict", None) is None:
+            return None
+        return self.storage
+
+    def _write_record(
+        self,
+        collection: str,
+        key: str,
+        entity: Any | None,
+    ) -> None:
+        """Persist one put (``entity``) or delete straight to storage."""
+        with registry.timer("reservation_phase_seconds", phase="commit"):
+            self.storage.write(
+                collection, {} if entity is None else {key: entity},
+                [] if entity is None else [key],
+                [key] if entity is None else [])
+
+    def _ensure_loaded(self, stale: Iterable[str] = ()) -> None:
+        """(Re)load missing collections, and those of ``stale`` changed in
+        storage since they were loaded, while holding every lock."""
+        def outdated() -> list[str]:
+            return [
+                c for c in COLLECTIONS
+                if c not in self._signatures
+                or (c in stale and not self._is_fresh(c))]
+
+        if not outdated():
+            return
+        with self._exclusive():
+            for collection in outdated():
+                self._load_collection(collection)
+            self._occupancy = None
+            self._analytics = None
+            self._hotel_search = self._customer_search = None
+            self._occupancy_index()
+
+    def _stripes(
+        self,
+        stripes: list[threading.RLock],
+        keys: Iterable[str],
+    ) -> list[int]:
+        return sorted({hash(key) % len(stripes) for key in keys})
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Hold the catalog lock and every stripe, in the fixed order."""
+        with ExitStack() as stack:
+            stack.enter_context(self._catalog_lock)
+            for lock in self._hotel_stripes + self._customer_stripes:
+                stack.enter_context(lock)
+            self._call.locks += 1
+            try:
+                yield
+            finally:
+                self._call.locks -= 1
+
+    @contextmanager
+    def _locked(self, scope: Callable[[], Scope] | None) -> Iterator[None]:
+        """Hold the locks an operation needs; ``None`` means all of them.
+
+        The scope is computed from the current state, so it is computed
+        again once the locks are held; if it grew meanwhile (say a booking
+        for another customer arrived during a cascade) the locks are
+        released and taken again.
+        """
+        if not self.thread_safe:
+            yield
+            return
+        if scope is None:
+            self._ensure_loaded()
+            with self._exclusive():
+                yield
+            return
+
+        while True:
+            self._ensure_loaded()
+            catalog, hotel_ids, customer_ids = scope()
+            hotel_stripes = self._stripes(self._hotel_stripes, hotel_ids)
+            customer_stripes = self._stripes(
+                self._customer_stripes, customer_ids)
+            with ExitStack() as stack:
+                if catalog:
+                    stack.enter_context(self._catalog_lock)
+                for i in hotel_stripes:
+                    stack.enter_context(self._hotel_stripes[i])
+                for i in customer_stripes:
+                    stack.enter_context(self._customer_stripes[i])
 
-    def _save_reservations(self, reservations: list[Reservation]) -> None:
-        save_list(self.reservations_path, [r.to_dict() for r in reservations])
+                catalog_now, hotel_ids, customer_ids = scope()
+                if (all(c in self._signatures for c in COLLECTIONS)
+                        and catalog_now <= catalog
+                        and set(self._stripes(
+                            self._hotel_stripes, hotel_ids)) <= set(
+                                hotel_stripes)
+                        and set(self._stripes(
+                            self._customer_stripes, customer_ids)) <= set(
+                                customer_stripes)):
+                    self._call.locks += 1
+                    try:
+                        yield
+                    finally:
+                        self._call.locks -= 1
+                    return
+
+    def _run(
+        self,
+        apply: Callable[[ChangeSet], None],
+        scope: Callable[[], Scope] | None = None,
+    ) -> None:
+        """Apply one operation to memory and persist it, retrying when
+        another process wrote in between.
+
+        Inside ``run_group`` the change is only recorded; the group commits
+        it together with the others.
+        """
+        pending = self._call.pending
+        if pending is not None:
+            with self._locked(scope), self._pinned():
+                apply(pending)
+            return
+
+        for attempt in range(self.write_retries):
+            if attempt:
+                registry.increment("reservation_write_retries_total")
+            changes = ChangeSet()
+            with self._locked(scope), self._pinned():
+                try:
+                    with registry.timer(
+                            "reservation_phase_seconds", phase="apply"):
+                        apply(changes)
+                except BaseException:
+                    self._invalidate(changes.touched())
+                    raise
+                with registry.timer(
+                        "reservation_phase_seconds", phase="commit"):
+                    committed = self._commit(changes)
+                if committed:
+                    return
+        raise ValueError("Concurrent modification; please retry.")
+
+    def _run_batch(
+        self,
+        items: Iterable[T],
+        apply: Callable[[T, ChangeSet], None],
+        atomic: bool,
+    ) -> list[BatchResult]:
+        """Apply many operations against one load and persist them once.
+
+        Each item is validated against the current state, which already
+        includes the earlier items of the batch. With ``atomic=True`` a
+        single failure discards the whole batch; otherwise the valid items
+        are kept and saved.
+        """
+        items = list(items)
+        pending = self._call.pending
+        if pending is not None:
+            return self._stage_batch(items, apply, atomic, pending)
+
+        for attempt in range(self.write_retries):
+            if attempt:
+                registry.increment("reservation_write_retries_total")
+            changes = ChangeSet()
+            results: list[BatchResult] = []
+            with self._locked(None), self._pinned():
+                with registry.timer(
+                        "reservation_phase_seconds", phase="apply"):
+                    try:
+                        for item in items:
+                            try:
+                                apply(item, changes)
+                            except ValueError as exc:
+                                results.append(BatchResult(False, str(exc)))
+                            else:
+                                results.append(BatchResult(True))
+                    except BaseException:
+                        self._invalidate(changes.touched())
+                        raise
+
+                if atomic and not all(r.ok for r in results):
+                    self._invalidate(changes.touched())
+                    return [
+                        r if not r.ok else BatchResult(
+                            False, "Batch rolled back.")
+                        for r in results]
+
+                with registry.timer(
+                        "reservation_phase_seconds", phase="commit"):
+                    committed = self._commit(changes)
+                if committed:
+                    return results
+        raise ValueError("Concurrent modification; please retry.")
+
+    def _stage_batch(
+        self,
+        items: list[T],
+        apply: Callable[[T, ChangeSet], None],
+        atomic: bool,
+        pending: ChangeSet,
+    ) -> list[BatchResult]:
+        """Apply a batch into a transaction or group without committing.
+
+        A failed atomic batch is undone step by step, leaving the earlier
+        changes of the enclosing transaction in place.
+        """
+        saved = pending.copy()
+        results: list[BatchResult] = []
+        with self._locked(None), self._pinned(), self._undo_log() as undo:
+            def discard() -> None:
+                undo()
+                pending.changed, pending.removed = (
+                    saved.changed, saved.removed)
+
+            try:
+                for item in items:
+                    try:
+                        apply(item, pending)
+                    except ValueError as exc:
+                        results.append(BatchResult(False, str(exc)))
+                    else:
+                        results.append(BatchResult(True))
+            except BaseException:
+                discard()
+                raise
+
+            if atomic and not all(r.ok for r in results):
+                discard()
+                return [
+                    r if not r.ok else BatchResult(
+                        False, "Batch rolled back.")
+                    for r in results]
+        return results
+
+    @contextmanager
+    def _undo_log(self) -> Iterator[Callable[[], None]]:
+        """Record inverse steps of the in-memory writes in the block.
+
+        Yields a function that reverts them, newest first.
+        """
+        call = self._call
+        log: list[Callable[[], None]] = []
+        outer = call.undo
+        call.undo = log
+
+        def undo() -> None:
+            call.undo = None
+            try:
+                for step in reversed(log):
+                    step()
+            finally:
+                log.clear()
+                call.undo = log
+                # Bitmaps cannot be restored piecewise after a shrink.
+                self._occupancy = None
+
+        try:
+            yield undo
+        finally:
+            call.undo = outer
+            if outer is not None:
+                outer.extend(log)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Stage every write in the block and commit them all at once.
+
+        Writes inside the block are applied to memory immediately, so
+        later calls see them, but nothing reaches storage until the block
+        exits. The commit is then recorded in an fsynced intent file and
+        applied to each collection, so it survives a crash as a whole;
+        an interrupted commit is finished the next time the data
+        directory is opened. If the block raises, every staged change is
+        discarded. If another process wrote meanwhile the commit is
+        abandoned with ValueError, since the block cannot be re-run
+        automatically.
+
+        In thread-safe mode the transaction holds every lock until it
+        ends. Transactions do not nest.
+        """
+        call = self._call
+        if call.pending is not None:
+            raise ValueError("A transaction or group is already running.")
+        changes = ChangeSet()
+        with self._locked(None), self._pinned():
+            call.pending = changes
+            try:
+                yield
+            except BaseException:
+                self._invalidate(changes.touched())
+                raise
+            finally:
+                call.pending = None
+            if not self._commit(changes):
+                raise ValueError("Concurrent modification; please retry.")
+
+    @instrumented
+    def run_group(
+        self,
+        operations: list[Callable[[], Any]],
+    ) -> list[Any]:
+        """Run several write calls and commit all their changes at once.
+
+        Each operation is a zero-argument callable that invokes one of the
+        single-item write methods, e.g. ``partial(system.create_hotel, h)``.
+        Operations see the changes of the earlier ones. The returned list
+        holds each call's return value, or the ``ValueError`` it raised.
+        If another process wrote in between, the whole group is run again
+        against fresh data.
+        """
+        for _ in range(self.write_retries):
+            outcomes: list[Any] = []
+            pending = ChangeSet()
+            with self._pinned():
+                self._call.pending = pending
+                try:
+                    for operation in operations:
+                        try:
+                            outcomes.append(operation())
+                        except ValueError as exc:
+                            outcomes.append(exc)
+                finally:
+                    self._call.pending = None
+                if self._commit(pending):
+                    return outcomes
+        raise ValueError("Concurrent modification; please retry.")
+
+    def _occupancy_index(self) -> OccupancyIndex:
+        """Return the room bitmaps, rebuilding them after a reload.
+
+        In thread-safe mode a reader rebuilds them under every lock, so
+        no writer changes the hotels or bookings meanwhile.
+        """
+        hotels = self._hotel_map()
+        reservations = self._reservation_index()
+
+        def current() -> OccupancyIndex | None:
+            occupancy, source = self._occupancy, self._occupancy_source
+            if (occupancy is None or source is None
+                    or source[0] is not hotels
+                    or source[1] is not reservations):
+                return None
+            return occupancy
+
+        occupancy = current()
+        if occupancy is None:
+            with (self._exclusive()
+                  if self.thread_safe and not self._call.locks
+                  else ExitStack()):
+                occupancy = current()
+                if occupancy is None:
+                    occupancy = OccupancyIndex.build(
+                        hotels.values(), reservations)
+                    self._occupancy = occupancy
+                    self._occupancy_source = (hotels, reservations)
+        return occupancy
+
+    def _loaded(self, collection: str) -> Any:
+        return {
+            HOTELS: self._hotels,
+            CUSTOMERS: self._customers,
+            RESERVATIONS: self._reservations,
+        }[collection]
+
+    def _derived(
+        self,
+        attr: str,
+        collections: tuple[str, ...],
+        build: Callable[[], T],
+    ) -> T:
+        """Return the derived index kept in ``attr``, building it on first
+        use and again once any of ``collections`` has been reloaded.
+
+        The _put_* and _drop_* helpers keep a built index up to date. In
+        thread-safe mode the build runs under every lock.
+        """
+        def current() -> T | None:
+            sources = self._derived_sources.get(attr)
+            if sources is None or any(
+                    source is not self._loaded(collection)
+                    for source, collection in zip(sources, collections)):
+                return None
+            return getattr(self, attr)
+
+        for collection in collections:
+            self._sync(collection)
+        index = current()
+        if index is None:
+            with self._exclusive() if self.thread_safe else ExitStack():
+                index = current()
+                if index is None:
+                    index = build()
+                    setattr(self, attr, index)
+                    self._derived_sources[attr] = tuple(
+                        self._loaded(collection)
+                        for collection in collections)
+        return index
+
+    def _occupancy_analytics(self) -> OccupancyAnalytics:
+        """Return the running booking aggregates."""
+        return self._derived(
+            "_analytics", (HOTELS, RESERVATIONS),
+            lambda: OccupancyAnalytics.build(
+                self._hotels.values(), self._reservations.table))
+
+    def _search_index(self, collection: str) -> SearchIndex:
+        """Return the text search index of hotels or customers."""
+        if collection == HOTELS:
+            return self._derived(
+                "_hotel_search", (HOTELS,),
+                lambda: hotel_index(self._hotels.values()))
+        return self._derived(
+            "_customer_search", (CUSTOMERS,),
+            lambda: customer_index(self._customers.values()))
+
+    def _cached_query(
+        self,
+        key: tuple[Any, ...],
+        collections: tuple[str, ...],
+        compute: Callable[[], tuple[T, Iterable[Tag]]],
+    ) -> T:
+        """Return a read result from the query cache or compute it.
+
+        ``compute`` returns the result and the tags of the entities it
+        depends on. Errors are not cached, and neither is anything read
+        inside a transaction or group, where memory holds uncommitted
+        changes.
+        """
+        cache = self.query_cache
+        if cache is None or self._call.pending is not None:
+            return compute()[0]
+        with self._pinned():
+            if self.cached:
+                for collection in collections:
+                    self._sync(collection)
+                signatures = {
+                    c: self._signatures.get(c) for c in collections}
+            else:
+                signatures = {
+                    c: self.storage.signature(c) for c in collections}
+            hit, value = cache.get(key, signatures)
+            registry.increment(
+                "reservation_query_cache_total",
+                result="hit" if hit else "miss")
+            if not hit:
+                generation = cache.generation
+                value, tags = compute()
+                cache.put(key, value, tags, collections, generation)
+        # Callers get their own list to modify.
+        return list(value) if isinstance(value, list) else value
+
+    def _forget_queries(self, *tags: Tag) -> None:
+        if self.query_cache is not None:
+            self.query_cache.invalidate(*tags)
+
+    # Every in-memory write goes through these helpers so that derived
+    # indexes, cached queries and the change set stay in step with the
+    # collections.
+    def _put_hotel(self, hotel: Hotel, changes: ChangeSet) -> None:
+        previous = self._hotels.get(hotel.hotel_id)
+        if self._call.undo is not None:
+            self._call.undo.append(
+                partial(self._put_hotel, previous, changes)
+                if previous is not None
+                else partial(self._drop_hotel, hotel.hotel_id, changes))
+        self._hotels[hotel.hotel_id] = hotel
+        changes.put(HOTELS, hotel.hotel_id)
+        if self._occupancy is not None:
+            self._occupancy.put_hotel(hotel)
+        if self._analytics is not None:
+            self._analytics.put_hotel(hotel)
+        if self._hotel_search is not None:
+            self._hotel_search.put(hotel.hotel_id, hotel)
+        self._forget_hotel(hotel)
+        if previous is not None:
+            self._forget_hotel(previous)
+
+    def _drop_hotel(self, hotel_id: str, changes: ChangeSet) -> None:
+        hotel = self._hotels.pop(hotel_id)
+        if self._call.undo is not None:
+            self._call.undo.append(partial(self._put_hotel, hotel, changes))
+        changes.delete(HOTELS, hotel_id)
+        if self._occupancy is not None:
+            self._occupancy.drop_hotel(hotel_id)
+        if self._analytics is not None:
+            self._analytics.drop_hotel(hotel_id)
+        if self._hotel_search is not None:
+            self._hotel_search.remove(hotel_id)
+        self._forget_hotel(hotel)
+
+    def _put_customer(self, customer: Customer, changes: ChangeSet) -> None:
+        if self._call.undo is not None:
+            previous = self._customers.get(customer.customer_id)
+            self._call.undo.append(
+                partial(self._put_customer, previous, changes)
+                if previous is not None
+                else partial(
+                    self._drop_customer, customer.customer_id, changes))
+        self._customers[customer.customer_id] = customer
+        changes.put(CUSTOMERS, customer.customer_id)
+        if self._customer_search is not None:
+            self._customer_search.put(customer.customer_id, customer)
+        self._forget_queries(("customer", customer.customer_id))
+
+    def _drop_customer(self, customer_id: str, changes: ChangeSet) -> None:
+        if self._call.undo is not None:
+            self._call.undo.append(partial(
+                self._put_customer, self._customers[customer_id], changes))
+        del self._customers[customer_id]
+        changes.delete(CUSTOMERS, customer_id)
+        if self._customer_search is not None:
+            self._customer_search.remove(customer_id)
+        self._forget_queries(("customer", customer_id))
+
+    def _put_reservation(
+            self, reservation: Reservation, changes: ChangeSet) -> None:
+        previous = self._reservations.get(reservation.reservation_id)
+        if self._call.undo is not None:
+            self._call.undo.append(
+                partial(self._put_reservation, previous, changes)
+                if previous is not None
+                else partial(
+                    self._drop_reservation, reservation.reservation_id,
+                    changes))
+        self._reservations.add(reservation)
+        changes.put(RESERVATIONS, reservation.reservation_id)
+        if self._occupancy is not None:
+            self._occupancy.set_room(
+                reservation.hotel_id, reservation.room, True)
+            if previous is not None:
+                self._occupancy.set_room(
+                    previous.hotel_id, previous.room,
+                    (previous.hotel_id, previous.room)
+                    in self._reservations.by_room)
+        if self._analytics is not None:
+            if previous is not None:
+                self._analytics.remove(previous)
+            self._analytics.add(reservation)
+        self._forget_bookings(reservation)
+        if previous is not None:
+            self._forget_bookings(previous)
+
+    def _drop_reservation(
+            self, reservation_id: str, changes: ChangeSet) -> None:
+        reservation = self._reservations.remove(reservation_id)
+        if self._call.undo is not None:
+            self._call.undo.append(
+                partial(self._put_reservation, reservation, changes))
+        changes.delete(RESERVATIONS, reservation_id)
+        if self._occupancy is not None:
+            room_key = (reservation.hotel_id, reservation.room)
+            self._occupancy.set_room(
+                reservation.hotel_id, reservation.room,
+                room_key in self._reservations.by_room)
+        if self._analytics is not None:
+            self._analytics.remove(reservation)
+        self._forget_bookings(reservation)
+
+    def _forget_hotel(self, hotel: Hotel) -> None:
+        self._forget_queries(
+            ("hotel", hotel.hotel_id),
+            ("location", normalize_location(hotel.location)))
+
+    def _forget_bookings(self, reservation: Reservation) -> None:
+        self._forget_queries(
+            ("hotel_bookings", reservation.hotel_id),
+            ("customer_bookings", reservation.customer_id))
+
+    def _load_hotels(self) -> list[Hotel]:
+        return [Hotel.from_dict(x) for x in self.storage.load(HOTELS)]
+
+    def _load_customers(self) -> list[Customer]:
+        return [
+            Customer.from_dict(x) for x in self.storage.load(CUSTOMERS)]
 
     @staticmethod
     def _require_non_empty(value: Any, name: str) -> str:
@@ -56,58 +992,241 @@ class ReservationSystem:
             raise ValueError(f"{name} must be > 0.")
         return number
 
+    def iter_entities(self, collection: str) -> Iterator[Any]:
+        """Yield every hotel, customer or reservation of a collection.
+
+        The collection must not be modified while the iterator is in use.
+        Without ``cached`` the entities are built one at a time from
+        ``backends.iter_records`` instead of loading the collection.
+        """
+        if not self.cached:
+            if collection not in MODELS:
+                raise ValueError(f"Unknown collection: {collection}.")
+            model = MODELS[collection]
+            for data in iter_records(self.storage, collection):
+                yield model.from_dict(data)
+            return
+        # Copies, as other threads may add or remove entities meanwhile.
+        if collection == HOTELS:
+            yield from list(self._hotel_map().values())
+        elif collection == CUSTOMERS:
+            yield from list(self._customer_map().values())
+        elif collection == RESERVATIONS:
+            yield from self._reservation_index()
+        else:
+            raise ValueError(f"Unknown collection: {collection}.")
+
+    @staticmethod
+    def _require_stay(check_in: date | None, check_out: date | None) -> None:
+        if (check_in is None) != (check_out is None):
+            raise ValueError("check_in and check_out must be given together.")
+        if check_in is not None and check_out is not None:
+            if check_out <= check_in:
+                raise ValueError("check_out must be after check_in.")
+
+    # Field checks that need no stored data, so bulk loaders can run
+    # them ahead of time, e.g. in worker processes.
+    @classmethod
+    def check_hotel(cls, hotel: Hotel) -> None:
+        """Raise ValueError if a hotel's fields are invalid."""
+        cls._require_non_empty(hotel.hotel_id, "hotel_id")
+        cls._require_non_empty(hotel.name, "name")
+        cls._require_non_empty(hotel.location, "location")
+        cls._require_positive_int(hotel.rooms, "rooms")
+
+    @classmethod
+    def check_customer(cls, customer: Customer) -> None:
+        """Raise ValueError if a customer's fields are invalid."""
+        cls._require_non_empty(customer.customer_id, "customer_id")
+        cls._require_non_empty(customer.name, "name")
+        cls._require_non_empty(customer.email, "email")
+
+    @classmethod
+    def check_reservation(cls, reservation: Reservation) -> None:
+        """Raise ValueError if a reservation's fields are invalid."""
+        cls._require_non_empty(reservation.reservation_id, "reservation_id")
+        cls._require_non_empty(reservation.hotel_id, "hotel_id")
+        cls._require_non_empty(reservation.customer_id, "customer_id")
+        cls._require_positive_int(reservation.room, "room")
+        cls._require_stay(reservation.check_in, reservation.check_out)
+
     # ---------- Hotel operations ----------
-    def create_hotel(self, hotel: Hotel) -> None:
-        """Create a new hotel."""
-        self._require_non_empty(hotel.hotel_id, "hotel_id")
-        self._require_non_empty(hotel.name, "name")
-        self._require_non_empty(hotel.location, "location")
-        _ = self._require_positive_int(hotel.rooms, "rooms")
+    def _apply_create_hotel(
+        self,
+        hotel: Hotel,
+        changes: ChangeSet,
+        checked: bool = False,
+    ) -> None:
+        if not checked:
+            self.check_hotel(hotel)
 
-        hotels = self._load_hotels()
-        if any(h.hotel_id == hotel.hotel_id for h in hotels):
+        hotels = self._hotel_map()
+        if hotel.hotel_id in hotels:
             raise ValueError("Hotel ID already exists.")
 
-        hotels.append(hotel)
-        self._save_hotels(hotels)
+        self._put_hotel(hotel, changes)
 
-    def delete_hotel(self, hotel_id: str) -> None:
-        """Delete hotel by ID (and its reservations)."""
+    def _apply_delete_hotel(self, hotel_id: str, changes: ChangeSet) -> None:
         hotel_id = self._require_non_empty(hotel_id, "hotel_id")
 
-        hotels = self._load_hotels()
-        new_hotels = [h for h in hotels if h.hotel_id != hotel_id]
-        if len(new_hotels) == len(hotels):
+        hotels = self._hotel_map()
+        if hotel_id not in hotels:
             raise ValueError("Hotel not found.")
 
-        reservations = self._load_reservations()
-        reservations = [r for r in reservations if r.hotel_id != hotel_id]
+        reservations = self._reservation_index()
+        for reservation in reservations.for_hotel(hotel_id):
+            self._drop_reservation(reservation.reservation_id, changes)
+        self._drop_hotel(hotel_id, changes)
 
-        self._save_hotels(new_hotels)
-        self._save_reservations(reservations)
+    @instrumented
+    def create_hotel(self, hotel: Hotel) -> None:
+        """Create a new hotel."""
+        storage = self._querying_storage()
+        if storage is not None:
+            self.check_hotel(hotel)
+            with self._commit_lock, storage.lock():
+                if storage.exists(HOTELS, hotel.hotel_id):
+                    raise ValueError("Hotel ID already exists.")
+                self._write_record(HOTELS, hotel.hotel_id, hotel)
+            self._forget_hotel(hotel)
+            return
+        self._run(
+            lambda changes: self._apply_create_hotel(hotel, changes),
+            lambda: (True, [hotel.hotel_id], []))
 
+    @instrumented
+    def create_hotels(
+        self,
+        hotels: Iterable[Hotel],
+        atomic: bool = True,
+        checked: bool = False,
+    ) -> list[BatchResult]:
+        """Create many hotels with a single load and save.
+
+        ``checked=True`` skips ``check_hotel`` for items that already
+        passed it, e.g. in the workers of a parallel import.
+        """
+        return self._run_batch(
+            hotels, partial(self._apply_create_hotel, checked=checked),
+            atomic)
+
+    @instrumented
+    def delete_hotel(self, hotel_id: str) -> None:
+        """Delete hotel by ID (and its reservations)."""
+        self._run(
+            lambda changes: self._apply_delete_hotel(hotel_id, changes),
+            lambda: (True, [str(hotel_id).strip()], [
+                r.customer_id for r in self._reservations.for_hotel(
+                    str(hotel_id).strip())]))
+
+    @instrumented
+    def delete_hotels(
+        self,
+        hotel_ids: Iterable[str],
+        atomic: bool = True,
+    ) -> list[BatchResult]:
+        """Delete many hotels (and their reservations) in one pass."""
+        return self._run_batch(hotel_ids, self._apply_delete_hotel, atomic)
+
+    @instrumented
     def display_hotel_info(self, hotel_id: str) -> Hotel:
         """Return hotel info."""
         hotel_id = self._require_non_empty(hotel_id, "hotel_id")
-        for hotel in self._load_hotels():
-            if hotel.hotel_id == hotel_id:
-                return hotel
-        raise ValueError("Hotel not found.")
 
+        def compute() -> tuple[Hotel, list[Tag]]:
+            if self.cached:
+                hotel = self._hotel_map().get(hotel_id)
+            else:
+                data = self.storage.get(HOTELS, hotel_id)
+                hotel = None if data is None else Hotel.from_dict(data)
+            if hotel is None:
+                raise ValueError("Hotel not found.")
+            return hotel, [("hotel", hotel_id)]
+
+        return self._cached_query(
+            ("display_hotel_info", hotel_id), (HOTELS,), compute)
+
+    def _relocations(
+        self,
+        hotel: Hotel,
+        rooms: int,
+        relocate: bool,
+    ) -> list[Reservation]:
+        """Return the bookings to move for a hotel to shrink to ``rooms``.
+
+        The bookings above the new capacity come from the sorted room
+        index. Without ``relocate`` any such booking is an error;
+        otherwise each is given the lowest room within the capacity that
+        is free for its stay, trying booked rooms before empty ones. The
+        whole plan is made before anything changes, so a failure leaves
+        the hotel as it was.
+        """
+        if rooms >= hotel.rooms:
+            return []
+        hotel_id = hotel.hotel_id
+        reservations = self._reservation_index()
+        stranded = reservations.beyond(hotel_id, rooms)
+        if not stranded:
+            return []
+        if not relocate:
+            raise ValueError(
+                "Reservations booked beyond the new capacity: "
+                f"{len(stranded)}.")
+
+        booked = reservations.rooms_booked(hotel_id, 1, rooms)
+        empty = takewhile(
+            lambda room: room <= rooms,
+            self._occupancy_index().rooms_with(hotel_id, False))
+        planned: dict[int, RoomSchedule] = {}
+        moved = []
+        for reservation in stranded:
+            start, end = stay(reservation)
+            room = next((
+                room for room in chain(booked, planned)
+                if reservations.room_holder(
+                    hotel_id, room, start, end) is None
+                and (room not in planned
+                     or planned[room].conflict(start, end) is None)),
+                None)
+            if room is None:
+                room = next(empty, None)
+            if room is None:
+                raise ValueError(
+                    "Not enough free rooms to relocate reservations.")
+            planned.setdefault(room, RoomSchedule()).add(
+                start, end, reservation.reservation_id)
+            moved.append(replace(reservation, room=room))
+        return moved
+
+    def _resize_scope(self, hotel_id: str, rooms: Any) -> Scope:
+        hotel_id = str(hotel_id).strip()
+        stranded = (
+            self._reservations.beyond(hotel_id, rooms)
+            if isinstance(rooms, int) else [])
+        return (True, [hotel_id], [r.customer_id for r in stranded])
+
+    @instrumented
     def modify_hotel_information(
         self,
         hotel_id: str,
         name: str | None = None,
         rooms: int | None = None,
         location: str | None = None,
+        relocate: bool = False,
     ) -> None:
-        """Modify hotel fields."""
+        """Modify hotel fields.
+
+        Lowering ``rooms`` below a booked room raises ValueError unless
+        ``relocate`` is set, which moves those bookings to free rooms
+        within the new capacity (or raises if there are not enough).
+        """
         hotel_id = self._require_non_empty(hotel_id, "hotel_id")
 
-        hotels = self._load_hotels()
-        for i, hotel in enumerate(hotels):
-            if hotel.hotel_id != hotel_id:
-                continue
+        def apply(changes: ChangeSet) -> None:
+            hotels = self._hotel_map()
+            hotel = hotels.get(hotel_id)
+            if hotel is None:
+                raise ValueError("Hotel not found.")
 
             data = hotel.to_dict()
             if name is not None:
@@ -119,50 +1238,151 @@ class ReservationSystem:
                 data["location"] = self._require_non_empty(
                     location, "location")
 
-            hotels[i] = Hotel.from_dict(data)
-            self._save_hotels(hotels)
-            return
+            updated = Hotel.from_dict(data)
+            for reservation in self._relocations(
+                    hotel, updated.rooms, relocate):
+                self._put_reservation(reservation, changes)
+            self._put_hotel(updated, changes)
+
+        self._run(apply, lambda: self._resize_scope(hotel_id, rooms))
+
+    def _apply_resize_hotel(
+        self,
+        item: tuple[str, int],
+        relocate: bool,
+        changes: ChangeSet,
+    ) -> None:
+        hotel_id, rooms = item
+        hotel_id = self._require_non_empty(hotel_id, "hotel_id")
+        rooms = self._require_positive_int(rooms, "rooms")
+
+        hotel = self._hotel_map().get(hotel_id)
+        if hotel is None:
+            raise ValueError("Hotel not found.")
 
-        raise ValueError("Hotel not found.")
+        for reservation in self._relocations(hotel, rooms, relocate):
+            self._put_reservation(reservation, changes)
+        self._put_hotel(replace(hotel, rooms=rooms), changes)
+
+    @instrumented
+    def resize_hotels(
+        self,
+        sizes: Mapping[str, int],
+        relocate: bool = False,
+        atomic: bool = True,
+    ) -> list[BatchResult]:
+        """Set the room counts of many hotels with a single load and save.
+
+        ``sizes`` maps hotel IDs to their new room counts; shrinking
+        follows the rules of ``modify_hotel_information``.
+        """
+        return self._run_batch(
+            sizes.items(),
+            lambda item, changes: self._apply_resize_hotel(
+                item, relocate, changes),
+            atomic)
 
     # ---------- Customer operations ----------
-    def create_customer(self, customer: Customer) -> None:
-        """Create a new customer."""
-        self._require_non_empty(customer.customer_id, "customer_id")
-        self._require_non_empty(customer.name, "name")
-        self._require_non_empty(customer.email, "email")
+    def _apply_create_customer(
+        self,
+        customer: Customer,
+        changes: ChangeSet,
+        checked: bool = False,
+    ) -> None:
+        if not checked:
+            self.check_customer(customer)
 
-        customers = self._load_customers()
-        if any(c.customer_id == customer.customer_id for c in customers):
+        customers = self._customer_map()
+        if customer.customer_id in customers:
             raise ValueError("Customer ID already exists.")
 
-        customers.append(customer)
-        self._save_customers(customers)
+        self._put_customer(customer, changes)
 
-    def delete_customer(self, customer_id: str) -> None:
-        """Delete customer by ID (and its reservations)."""
+    def _apply_delete_customer(
+            self, customer_id: str, changes: ChangeSet) -> None:
         customer_id = self._require_non_empty(customer_id, "customer_id")
 
-        customers = self._load_customers()
-        new_customers = [c for c in customers if c.customer_id != customer_id]
-        if len(new_customers) == len(customers):
+        customers = self._customer_map()
+        if customer_id not in customers:
             raise ValueError("Customer not found.")
 
-        reservations = self._load_reservations()
-        reservations = [
-            r for r in reservations if r.customer_id != customer_id]
+        reservations = self._reservation_index()
+        for reservation in reservations.for_customer(customer_id):
+            self._drop_reservation(reservation.reservation_id, changes)
+        self._drop_customer(customer_id, changes)
+
+    @instrumented
+    def create_customer(self, customer: Customer) -> None:
+        """Create a new customer."""
+        storage = self._querying_storage()
+        if storage is not None:
+            self.check_customer(customer)
+            with self._commit_lock, storage.lock():
+                if storage.exists(CUSTOMERS, customer.customer_id):
+                    raise ValueError("Customer ID already exists.")
+                self._write_record(
+                    CUSTOMERS, customer.customer_id, customer)
+            self._forget_queries(("customer", customer.customer_id))
+            return
+        self._run(
+            lambda changes: self._apply_create_customer(customer, changes),
+            lambda: (True, [], [customer.customer_id]))
+
+    @instrumented
+    def create_customers(
+        self,
+        customers: Iterable[Customer],
+        atomic: bool = True,
+        checked: bool = False,
+    ) -> list[BatchResult]:
+        """Create many customers with a single load and save.
+
+        ``checked=True`` skips ``check_customer``, as in ``create_hotels``.
+        """
+        return self._run_batch(
+            customers,
+            partial(self._apply_create_customer, checked=checked), atomic)
 
-        self._save_customers(new_customers)
-        self._save_reservations(reservations)
+    @instrumented
+    def delete_customer(self, customer_id: str) -> None:
+        """Delete customer by ID (and its reservations)."""
+        self._run(
+            lambda changes: self._apply_delete_customer(customer_id, changes),
+            lambda: (True, [
+                r.hotel_id for r in self._reservations.for_customer(
+                    str(customer_id).strip())],
+                [str(customer_id).strip()]))
+
+    @instrumented
+    def delete_customers(
+        self,
+        customer_ids: Iterable[str],
+        atomic: bool = True,
+    ) -> list[BatchResult]:
+        """Delete many customers (and their reservations) in one pass."""
+        return self._run_batch(
+            customer_ids, self._apply_delete_customer, atomic)
 
+    @instrumented
     def display_customer_info(self, customer_id: str) -> Customer:
         """Return customer info."""
         customer_id = self._require_non_empty(customer_id, "customer_id")
-        for customer in self._load_customers():
-            if customer.customer_id == customer_id:
-                return customer
-        raise ValueError("Customer not found.")
 
+        def compute() -> tuple[Customer, list[Tag]]:
+            if self.cached:
+                customer = self._customer_map().get(customer_id)
+            else:
+                data = self.storage.get(CUSTOMERS, customer_id)
+                customer = (
+                    None if data is None else Customer.from_dict(data))
+            if customer is None:
+                raise ValueError("Customer not found.")
+            return customer, [("customer", customer_id)]
+
+        return self._cached_query(
+            ("display_customer_info", customer_id), (CUSTOMERS,), compute)
+
+    @instrumented
     def modify_customer_information(
         self,
         customer_id: str,
@@ -172,10 +1392,11 @@ class ReservationSystem:
         """Modify customer fields."""
         customer_id = self._require_non_empty(customer_id, "customer_id")
 
-        customers = self._load_customers()
-        for i, customer in enumerate(customers):
-            if customer.customer_id != customer_id:
-                continue
+        def apply(changes: ChangeSet) -> None:
+            customers = self._customer_map()
+            customer = customers.get(customer_id)
+            if customer is None:
+                raise ValueError("Customer not found.")
 
             data = customer.to_dict()
             if name is not None:
@@ -183,59 +1404,418 @@ class ReservationSystem:
             if email is not None:
                 data["email"] = self._require_non_empty(email, "email")
 
-            customers[i] = Customer.from_dict(data)
-            self._save_customers(customers)
-            return
+            self._put_customer(Customer.from_dict(data), changes)
 
-        raise ValueError("Customer not found.")
+        self._run(apply, lambda: (True, [], [customer_id]))
 
     # ---------- Reservation operations ----------
-    def create_reservation(self, reservation: Reservation) -> None:
-        """Create a reservation if possible."""
-        self._require_non_empty(reservation.reservation_id, "reservation_id")
-        self._require_non_empty(reservation.hotel_id, "hotel_id")
-        self._require_non_empty(reservation.customer_id, "customer_id")
-        room = self._require_positive_int(reservation.room, "room")
+    def _checked_reservation(self, reservation: Reservation) -> Reservation:
+        """Check a new reservation's fields and return it with the room
+        and dates converted; callers may pass them as strings, which the
+        columnar table cannot store."""
+        stay_dates = (
+            parse_date(reservation.check_in),
+            parse_date(reservation.check_out))
+        if stay_dates != (reservation.check_in, reservation.check_out):
+            reservation = replace(
+                reservation, check_in=stay_dates[0], check_out=stay_dates[1])
+        self.check_reservation(reservation)
+        if type(reservation.room) is not int:
+            reservation = replace(reservation, room=int(reservation.room))
+        return reservation
 
-        hotels = self._load_hotels()
-        customers = self._load_customers()
-        reservations = self._load_reservations()
+    def _apply_create_reservation(
+        self,
+        reservation: Reservation,
+        changes: ChangeSet,
+        checked: bool = False,
+    ) -> None:
+        if not checked:
+            reservation = self._checked_reservation(reservation)
+        room = reservation.room
 
-        hotel = next((
-            h for h in hotels if h.hotel_id == reservation.hotel_id), None)
+        hotel = self._hotel_map().get(reservation.hotel_id)
         if hotel is None:
             raise ValueError("Hotel not found.")
 
-        customer_exists = any(
-            c.customer_id == reservation.customer_id for c in customers)
-        if not customer_exists:
+        if reservation.customer_id not in self._customer_map():
             raise ValueError("Customer not found.")
 
         if room > hotel.rooms:
             raise ValueError("Room exceeds hotel's room capacity.")
 
-        if any(
-                r.reservation_id == reservation.reservation_id
-                for r in reservations):
+        reservations = self._reservation_index()
+        if reservation.reservation_id in reservations:
             raise ValueError("Reservation ID already exists.")
 
-        if any(
-                r.hotel_id == reservation.hotel_id
-                and r.room == room for r in reservations):
+        holder = reservations.room_holder(
+            reservation.hotel_id, room,
+            reservation.check_in, reservation.check_out)
+        if holder is not None:
             raise ValueError("Room already reserved.")
 
-        reservations.append(reservation)
-        self._save_reservations(reservations)
+        self._put_reservation(reservation, changes)
 
-    def cancel_reservation(self, reservation_id: str) -> None:
-        """Cancel reservation by ID."""
+    def _apply_cancel_reservation(
+            self, reservation_id: str, changes: ChangeSet) -> None:
         reservation_id = self._require_non_empty(
             reservation_id, "reservation_id")
 
-        reservations = self._load_reservations()
-        new_reservations = [
-            r for r in reservations if r.reservation_id != reservation_id]
-        if len(new_reservations) == len(reservations):
+        reservations = self._reservation_index()
+        if reservation_id not in reservations:
             raise ValueError("Reservation not found.")
 
-        self._save_reservations(new_reservations)
+        self._drop_reservation(reservation_id, changes)
+
+    def _create_reservation_in_storage(
+            self, reservation: Reservation, storage: Any) -> None:
+        """Validate and save a reservation through database queries."""
+        reservation = self._checked_reservation(reservation)
+        with self._commit_lock, storage.lock():
+            data = storage.get(HOTELS, reservation.hotel_id)
+            if data is None:
+                raise ValueError("Hotel not found.")
+
+            if not storage.exists(CUSTOMERS, reservation.customer_id):
+                raise ValueError("Customer not found.")
+
+            if reservation.room > int(data["rooms"]):
+                raise ValueError("Room exceeds hotel's room capacity.")
+
+            if storage.exists(RESERVATIONS, reservation.reservation_id):
+                raise ValueError("Reservation ID already exists.")
+
+            holder = storage.room_conflict(
+                reservation.hotel_id, reservation.room,
+                reservation.check_in, reservation.check_out)
+            if holder is not None:
+                raise ValueError("Room already reserved.")
+
+            self._write_record(
+                RESERVATIONS, reservation.reservation_id, reservation)
+        self._forget_bookings(reservation)
+
+    @instrumented
+    def create_reservation(self, reservation: Reservation) -> None:
+        """Create a reservation if possible."""
+        storage = self._querying_storage()
+        if storage is not None:
+            self._create_reservation_in_storage(reservation, storage)
+            return
+        self._run(
+            lambda changes: self._apply_create_reservation(
+                reservation, changes),
+            lambda: (
+                False, [reservation.hotel_id], [reservation.customer_id]))
+
+    @instrumented
+    def create_reservations(
+        self,
+        reservations: Iterable[Reservation],
+        atomic: bool = True,
+        checked: bool = False,
+    ) -> list[BatchResult]:
+        """Create many reservations with a single load and save.
+
+        ``checked=True`` skips ``check_reservation`` and the conversion of
+        string rooms and dates, for items built by ``from_dict`` that
+        already passed the check.
+        """
+        return self._run_batch(
+            reservations,
+            partial(self._apply_create_reservation, checked=checked),
+            atomic)
+
+    def _reservation_scope(self, reservation_id: str) -> Scope:
+        reservation = self._reservations.get(str(reservation_id).strip())
+        if reservation is None:
+            return (False, [], [])
+        return (False, [reservation.hotel_id], [reservation.customer_id])
+
+    @instrumented
+    def cancel_reservation(self, reservation_id: str) -> None:
+        """Cancel reservation by ID."""
+        storage = self._querying_storage()
+        if storage is not None:
+            reservation_id = self._require_non_empty(
+                reservation_id, "reservation_id")
+            with self._commit_lock, storage.lock():
+                data = storage.get(RESERVATIONS, reservation_id)
+                if data is None:
+                    raise ValueError("Reservation not found.")
+                self._write_record(RESERVATIONS, reservation_id, None)
+            self._forget_bookings(Reservation.from_dict(data))
+            return
+        self._run(
+            lambda changes: self._apply_cancel_reservation(
+                reservation_id, changes),
+            lambda: self._reservation_scope(reservation_id))
+
+    @instrumented
+    def cancel_reservations(
+        self,
+        reservation_ids: Iterable[str],
+        atomic: bool = True,
+    ) -> list[BatchResult]:
+        """Cancel many reservations with a single load and save."""
+        return self._run_batch(
+            reservation_ids, self._apply_cancel_reservation, atomic)
+
+    @instrumented
+    def list_reservations_for_hotel(self, hotel_id: str) -> list[Reservation]:
+        """Return the reservations of a hotel."""
+        hotel_id = self._require_non_empty(hotel_id, "hotel_id")
+
+        def compute() -> tuple[list[Reservation], list[Tag]]:
+            if hotel_id not in self._hotel_map():
+                raise ValueError("Hotel not found.")
+            return (
+                self._reservation_index().for_hotel(hotel_id),
+                self._hotel_tags(hotel_id))
+
+        return self._cached_query(
+            ("list_reservations_for_hotel", hotel_id),
+            (HOTELS, RESERVATIONS), compute)
+
+    @instrumented
+    def list_reservations_for_customer(
+            self, customer_id: str) -> list[Reservation]:
+        """Return the reservations of a customer."""
+        customer_id = self._require_non_empty(customer_id, "customer_id")
+
+        def compute() -> tuple[list[Reservation], list[Tag]]:
+            if customer_id not in self._customer_map():
+                raise ValueError("Customer not found.")
+            return (
+                self._reservation_index().for_customer(customer_id),
+                [("customer", customer_id),
+                 ("customer_bookings", customer_id)])
+
+        return self._cached_query(
+            ("list_reservations_for_customer", customer_id),
+            (CUSTOMERS, RESERVATIONS), compute)
+
+    # ---------- Availability queries ----------
+    def _free_rooms(
+        self,
+        hotel_id: str,
+        limit: int | None,
+        check_in: date | None,
+        check_out: date | None,
+    ) -> list[int]:
+        occupancy = self._occupancy_index()
+        if check_in is None and check_out is None:
+            return list(occupancy.rooms_with(hotel_id, False, limit))
+
+        # Rooms with no reservations at all are free for any stay; only
+        # rooms with bookings need their schedule checked.
+        reservations = self._reservation_index()
+        rooms = list(occupancy.rooms_with(hotel_id, False))
+        rooms += [
+            room for room in occupancy.rooms_with(hotel_id, True)
+            if reservations.room_holder(
+                hotel_id, room, check_in, check_out) is None]
+        rooms.sort()
+        return rooms if limit is None else rooms[:limit]
+
+    @staticmethod
+    def _hotel_tags(hotel_id: str) -> list[Tag]:
+        return [("hotel", hotel_id), ("hotel_bookings", hotel_id)]
+
+    def _require_hotel(self, hotel_id: str) -> str:
+        hotel_id = self._require_non_empty(hotel_id, "hotel_id")
+        if hotel_id not in self._hotel_map():
+            raise ValueError("Hotel not found.")
+        return hotel_id
+
+    @instrumented
+    def free_rooms(
+        self,
+        hotel_id: str,
+        limit: int | None = None,
+        check_in: date | None = None,
+        check_out: date | None = None,
+    ) -> list[int]:
+        """Return the free rooms of a hotel, lowest numbers first.
+
+        Without dates a room is free when it has no reservations at all;
+        with dates it is free when nothing overlaps the stay.
+        """
+        self._require_stay(check_in, check_out)
+        hotel_id = self._require_non_empty(hotel_id, "hotel_id")
+        if limit is not None and limit < 0:
+            raise ValueError("limit must be >= 0.")
+
+        def compute() -> tuple[list[int], list[Tag]]:
+            with self._pinned():
+                self._require_hotel(hotel_id)
+                return (
+                    self._free_rooms(hotel_id, limit, check_in, check_out),
+                    self._hotel_tags(hotel_id))
+
+        return self._cached_query(
+            ("free_rooms", hotel_id, limit, check_in, check_out),
+            (HOTELS, RESERVATIONS), compute)
+
+    @instrumented
+    def count_free_rooms(
+        self,
+        hotel_id: str,
+        check_in: date | None = None,
+        check_out: date | None = None,
+    ) -> int:
+        """Return how many rooms of a hotel are free."""
+        self._require_stay(check_in, check_out)
+        hotel_id = self._require_non_empty(hotel_id, "hotel_id")
+
+        def compute() -> tuple[int, list[Tag]]:
+            with self._pinned():
+                self._require_hotel(hotel_id)
+                if check_in is None:
+                    free = self._occupancy_index().free_count(hotel_id)
+                else:
+                    free = len(self._free_rooms(
+                        hotel_id, None, check_in, check_out))
+                return free, self._hotel_tags(hotel_id)
+
+        return self._cached_query(
+            ("count_free_rooms", hotel_id, check_in, check_out),
+            (HOTELS, RESERVATIONS), compute)
+
+    @instrumented
+    def find_available_hotels(
+        self,
+        location: str,
+        min_free: int = 1,
+        check_in: date | None = None,
+        check_out: date | None = None,
+    ) -> list[tuple[Hotel, int]]:
+        """Return (hotel, free room count) for hotels at a location."""
+        location = self._require_non_empty(location, "location")
+        self._require_stay(check_in, check_out)
+
+        def compute() -> tuple[list[tuple[Hotel, int]], list[Tag]]:
+            with self._pinned():
+                hotels = self._hotel_map()
+                occupancy = self._occupancy_index()
+                found = []
+                tags: list[Tag] = [
+                    ("location", normalize_location(location))]
+                for hotel_id in occupancy.hotels_in(location):
+                    hotel = hotels.get(hotel_id)
+                    if hotel is None:
+                        continue  # deleted by another thread meanwhile
+                    tags += self._hotel_tags(hotel_id)
+                    if check_in is None:
+                        free = occupancy.free_count(hotel_id)
+                    else:
+                        free = len(self._free_rooms(
+                            hotel_id, None, check_in, check_out))
+                    if free >= min_free:
+                        found.append((hotel, free))
+                return found, tags
+
+        return self._cached_query(
+            ("find_available_hotels", normalize_location(location),
+             min_free, check_in, check_out),
+            (HOTELS, RESERVATIONS), compute)
+
+    # ---------- Analytics ----------
+    @instrumented
+    def hotel_occupancy(self, hotel_id: str) -> Occupancy:
+        """Return rooms, occupied rooms, bookings and nights of a hotel."""
+        with self._pinned():
+            hotel_id = self._require_hotel(hotel_id)
+            return self._occupancy_analytics().hotel(hotel_id)
+
+    @instrumented
+    def location_occupancy(self, location: str) -> Occupancy:
+        """Return the combined occupancy of the hotels at a location."""
+        location = self._require_non_empty(location, "location")
+        with self._pinned():
+            return self._occupancy_analytics().location(location)
+
+    @instrumented
+    def customer_activity(self, customer_id: str) -> Activity:
+        """Return how many bookings and nights a customer holds."""
+        customer_id = self._require_non_empty(customer_id, "customer_id")
+        with self._pinned():
+            if customer_id not in self._customer_map():
+                raise ValueError("Customer not found.")
+            return self._occupancy_analytics().customer(customer_id)
+
+    @instrumented
+    def top_hotels(self, count: int = 10) -> list[tuple[str, int]]:
+        """Return (hotel ID, bookings) of the most booked hotels."""
+        count = self._require_positive_int(count, "count")
+        with self._pinned():
+            return self._occupancy_analytics().top_hotels(count)
+
+    @instrumented
+    def occupancy_report(self, top: int = 10) -> OccupancyReport:
+        """Return the occupancy of every hotel and location, the activity
+        of every customer with bookings and the ``top`` hotels."""
+        top = self._require_positive_int(top, "top")
+        with self._pinned():
+            return self._occupancy_analytics().report(top)
+
+    # ---------- Search ----------
+    def _search(
+        self,
+        collection: str,
+        query: str,
+        fields: Iterable[str] | None,
+        substring: bool,
+        limit: int,
+        offset: int,
+    ) -> SearchPage[Any]:
+        query = self._require_non_empty(query, "query")
+        limit = self._require_positive_int(limit, "limit")
+        if offset < 0:
+            raise ValueError("offset must be >= 0.")
+        with self._pinned():
+            index = self._search_index(collection)
+            if substring and not index.grams_ready(fields):
+                with self._exclusive() if self.thread_safe else ExitStack():
+                    index.build_grams(fields)
+            ids, more = index.search(query, fields, substring, limit, offset)
+            entities = (
+                self._hotels if collection == HOTELS else self._customers)
+            found = [entities.get(key) for key in ids]
+            return SearchPage(
+                [entity for entity in found if entity is not None],
+                offset + limit if more else None)
+
+    @instrumented
+    def search_hotels(
+        self,
+        query: str,
+        fields: Iterable[str] | None = None,
+        substring: bool = False,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> SearchPage[Hotel]:
+        """Return a page of hotels whose name or location (or only the
+        given ``fields``) starts with, or contains, the query.
+
+        Matching ignores case and extra spaces, and a prefix may also
+        start at any word, so "pal" finds "Gran Palacio". Pass
+        ``next_offset`` back as ``offset`` for the next page.
+        """
+        return self._search(
+            HOTELS, query, fields, substring, limit, offset)
+
+    @instrumented
+    def search_customers(
+        self,
+        query: str,
+        fields: Iterable[str] | None = None,
+        substring: bool = False,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> SearchPage[Customer]:
+        """Return a page of customers whose name or email (or only the
+        given ``fields``) starts with, or contains, the query; see
+        ``search_hotels``."""
+        return self._search(
+            CUSTOMERS, query, fields, substring, limit, offset)
@@ -0,0 +1,181 @@
+"""Versioned binary snapshots read in place through mmap."""
+from __future__ import annotations
+
+import mmap
+import struct
+import zlib
+from datetime import date
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+MAGIC = b"RSNP"
+VERSION = 1
+SUFFIX = ".snap"
+
+# Field kinds: "s" string (offset and length into the string table),
+# "q" integer, "d" date stored as its ordinal, 0 meaning no date.
+Fields = tuple[tuple[str, str], ...]
+
+_HEADER = struct.Struct("<4sHHIIQQQ")
+_KIND_FORMATS = {"s": "II", "q": "q", "d": "i"}
+_SLOT = struct.Struct("<I")
+
+
+def _record_struct(fields: Fields) -> struct.Struct:
+    return struct.Struct(
+        "<" + "".join(_KIND_FORMATS[kind] for _, kind in fields))
+
+
+def _schema(fields: Fields) -> bytes:
+    return ",".join(f"{name}:{kind}" for name, kind in fields).encode()
+
+
+def _slot_count(count: int) -> int:
+    slots = 8
+    while slots < 2 * count:
+        slots *= 2
+    return slots
+
+
+def _hash(key: str) -> int:
+    return zlib.crc32(key.encode("utf-8"))
+
+
+def encode_snapshot(
+    fields: Fields,
+    records: Iterable[dict[str, Any]],
+) -> bytes:
+    """Serialize records into the snapshot format.
+
+    Layout: header, schema text, fixed-width records, an open-addressing
+    hash table of record numbers keyed by the first field, and finally a
+    string table in which equal strings are stored once.
+    """
+    record = _record_struct(fields)
+    strings = bytearray()
+    offsets: dict[str, tuple[int, int]] = {}
+    body = bytearray()
+    keys: list[str] = []
+
+    for data in records:
+        values: list[int] = []
+        for name, kind in fields:
+            value = data.get(name)
+            if kind == "s":
+                text = str(value)
+                span = offsets.get(text)
+                if span is None:
+                    encoded = text.encode("utf-8")
+                    span = (len(strings), len(encoded))
+                    offsets[text] = span
+                    strings += encoded
+                values.extend(span)
+            elif kind == "d":
+                values.append(
+                    date.fromisoformat(str(value)).toordinal()
+                    if value else 0)
+            else:
+                values.append(int(value))  # type: ignore[arg-type]
+        keys.append(str(data.get(fields[0][0])))
+        body += record.pack(*values)
+
+    slots = _slot_count(len(keys))
+    table = [0] * slots
+    for number, key in enumerate(keys):
+        slot = _hash(key) & (slots - 1)
+        while table[slot]:
+            slot = (slot + 1) & (slots - 1)
+        table[slot] = number + 1
+
+    schema = _schema(fields)
+    records_at = _HEADER.size + len(schema)
+    index_at = records_at + len(body)
+    strings_at = index_at + 4 * slots
+    header = _HEADER.pack(
+        MAGIC, VERSION, len(schema), len(keys), slots,
+        records_at, index_at, strings_at)
+    return header + schema + bytes(body) + struct.pack(
+        f"<{slots}I", *table) + bytes(strings)
+
+
+class Snapshot:
+    """Read-only view of one snapshot file.
+
+    The file is mapped with ``mmap``, so opening it only reads the header
+    and ``get`` touches a handful of pages: the hash slots it probes, one
+    record and that record's strings.
+    """
+
+    def __init__(self, path: Path, fields: Fields) -> None:
+        self.path = path
+        self.fields = fields
+        self._record = _record_struct(fields)
+        with path.open("rb") as handle:
+            self._map = mmap.mmap(
+                handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"Truncated snapshot: {path}")
+        (magic, version, schema_size, self._count, self._slots,
+         self._records_at, self._index_at, self._strings_at
+         ) = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a snapshot file: {path}")
+        if version != VERSION:
+            raise ValueError(
+                f"Unsupported snapshot version {version}: {path}")
+        schema = self._map[_HEADER.size:_HEADER.size + schema_size]
+        if schema != _schema(fields):
+            raise ValueError(f"Snapshot schema mismatch: {path}")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for number in range(self._count):
+            yield self.record(number)
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+    def record(self, number: int) -> dict[str, Any]:
+        """Decode the record stored at a position."""
+        values = self._record.unpack_from(
+            self._map, self._records_at + number * self._record.size)
+        data: dict[str, Any] = {}
+        position = 0
+        for name, kind in self.fields:
+            if kind == "s":
+                data[name] = self._string(*values[position:position + 2])
+                position += 2
+                continue
+            value = values[position]
+            position += 1
+            if kind == "d":
+                if value:
+                    data[name] = date.fromordinal(value).isoformat()
+            else:
+                data[name] = value
+        return data
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the record whose first field equals key, or None."""
+        mask = self._slots - 1
+        slot = _hash(key) & mask
+        while True:
+            (entry,) = _SLOT.unpack_from(self._map, self._index_at + 4 * slot)
+            if not entry:
+                return None
+            if self._key(entry - 1) == key:
+                return self.record(entry - 1)
+            slot = (slot + 1) & mask
+
+    def _key(self, number: int) -> str:
+        offset, length = struct.unpack_from(
+            "<II", self._map, self._records_at + number * self._record.size)
+        return self._string(offset, length)
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings_at + offset
+        return self._map[start:start + length].decode("utf-8")
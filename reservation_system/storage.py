@@ -1,7 +1,20 @@
 """JSON storage helpers for loading and saving lists of dictionaries."""
 import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+from reservation_system.metrics import registry
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no fcntl
+    fcntl = None  # type: ignore[assignment]
+
+FileSignature = tuple[int, int, int]
 
 
 def ensure_json_file(path: Path) -> None:
@@ -12,6 +25,15 @@ def ensure_json_file(path: Path) -> None:
         path.write_text("[]", encoding="utf-8")
 
 
+def file_signature(path: Path) -> FileSignature | None:
+    """Return (mtime_ns, size, inode) for path, or None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
 def load_list(path: Path) -> list[dict[str, Any]]:
     """
     Load list from JSON file.
@@ -24,12 +46,24 @@ def load_list(path: Path) -> list[dict[str, Any]]:
     ensure_json_file(path)
 
     try:
-        content = path.read_text(encoding="utf-8").strip()
+        started = time.perf_counter()
+        raw = path.read_bytes()
+        read = time.perf_counter()
+        registry.increment(
+            "reservation_storage_read_bytes_total", len(raw), file=path.name)
+        registry.observe(
+            "reservation_storage_read_seconds", read - started,
+            file=path.name)
+
+        content = raw.decode("utf-8").strip()
 
         if not content:
             return []
 
         data = json.loads(content)
+        registry.observe(
+            "reservation_storage_parse_seconds",
+            time.perf_counter() - read, file=path.name)
 
         if isinstance(data, list):
             return [item for item in data if isinstance(item, dict)]
@@ -42,11 +76,61 @@ def load_list(path: Path) -> list[dict[str, Any]]:
         return []
 
 
+def write_atomic(path: Path, data: str | bytes) -> None:
+    """Replace path with data so readers see the old or new file, never
+    a partial one.
+
+    The data (text is written as UTF-8) goes to a temporary file in the
+    same directory, is fsynced, and is then renamed over path with
+    ``os.replace``.
+    """
+    payload = data.encode("utf-8") if isinstance(data, str) else data
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(payload)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
 def save_list(path: Path, items: list[dict[str, Any]]) -> None:
     """Save list of dictionaries to JSON."""
-    ensure_json_file(path)
+    started = time.perf_counter()
+    payload = json.dumps(items, indent=2).encode("utf-8")
+    serialized = time.perf_counter()
+    write_atomic(path, payload)
+
+    registry.observe(
+        "reservation_storage_serialize_seconds", serialized - started,
+        file=path.name)
+    registry.observe(
+        "reservation_storage_write_seconds",
+        time.perf_counter() - serialized, file=path.name)
+    registry.increment(
+        "reservation_storage_written_bytes_total", len(payload),
+        file=path.name)
 
-    path.write_text(
-        json.dumps(items, indent=2),
-        encoding="utf-8",
-    )
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on path for the enclosed block.
+
+    Uses ``fcntl.flock``, so the lock is shared by cooperating processes
+    and threads on the same host. Where fcntl is unavailable this is a
+    no-op.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
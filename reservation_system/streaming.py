@@ -0,0 +1,238 @@
+"""Streaming JSON Lines import and export for each collection."""
+from __future__ import annotations
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, TextIO
+
+from reservation_system.backends import CUSTOMERS, HOTELS, RESERVATIONS
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import BatchResult, ReservationSystem
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_PARALLEL_CHUNK_SIZE = 10_000
+
+_PARSERS: dict[str, Callable[[dict[str, Any]], Any]] = {
+    HOTELS: Hotel.from_dict,
+    CUSTOMERS: Customer.from_dict,
+    RESERVATIONS: Reservation.from_dict,
+}
+
+_CHECKS: dict[str, Callable[[Any], None]] = {
+    HOTELS: ReservationSystem.check_hotel,
+    CUSTOMERS: ReservationSystem.check_customer,
+    RESERVATIONS: ReservationSystem.check_reservation,
+}
+
+
+@dataclass
+class ImportSummary:
+    """Counts of accepted and rejected rows of one import."""
+    accepted: int = 0
+    rejected: int = 0
+
+
+@dataclass
+class ParsedRow:
+    """One input line, parsed into an entity or rejected with a reason."""
+    line: int
+    text: str
+    entity: Any = None
+    error: str | None = None
+
+
+def parse_jsonl(
+    lines: Iterable[str],
+    collection: str,
+) -> Iterator[ParsedRow]:
+    """Lazily turn JSON lines into entities using ``from_dict``."""
+    parser = _PARSERS[collection]
+    for number, text in enumerate(lines, start=1):
+        text = text.strip()
+        if not text:
+            continue
+        try:
+            data = json.loads(text)
+            if not isinstance(data, dict):
+                raise ValueError("expected a JSON object")
+            yield ParsedRow(number, text, entity=parser(data))
+        except KeyError as exc:
+            yield ParsedRow(number, text, error=f"Missing field {exc}.")
+        except (TypeError, ValueError) as exc:
+            yield ParsedRow(number, text, error=f"Invalid record: {exc}.")
+
+
+def _chunks(rows: Iterator[ParsedRow], size: int) -> Iterator[list[ParsedRow]]:
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _reject(handle: TextIO | None, row: ParsedRow, error: str) -> None:
+    if handle is not None:
+        handle.write(json.dumps(
+            {"line": row.line, "error": error, "record": row.text}) + "\n")
+
+
+def import_jsonl(
+    system: ReservationSystem,
+    collection: str,
+    path: Path,
+    rejects_path: Path | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    commit_once: bool = False,
+) -> ImportSummary:
+    """Stream a JSON Lines file into the system, one chunk at a time.
+
+    Only ``chunk_size`` parsed rows are held at once. Every chunk goes
+    through the best-effort bulk API, so each row is validated against the
+    stored state and the earlier rows. Rows that fail to parse or validate
+    are written to ``rejects_path`` with their line number and reason.
+
+    Each chunk is committed on its own. That costs one append or a few
+    rows on the journal, SQLite, sharded and segment backends, but the
+    plain JSON and snapshot backends rewrite the whole collection per
+    chunk, so importing N rows costs O(N * N / chunk_size) I/O. There,
+    pass ``commit_once=True`` to stage every chunk in one
+    ``transaction()`` and save once at the end; the import then fails as
+    a whole with ValueError if another process writes meanwhile.
+    """
+    create: Callable[..., list[BatchResult]] = {
+        HOTELS: system.create_hotels,
+        CUSTOMERS: system.create_customers,
+        RESERVATIONS: system.create_reservations,
+    }[collection]
+
+    summary = ImportSummary()
+    rejects = (
+        rejects_path.open("w", encoding="utf-8")
+        if rejects_path is not None else None)
+    try:
+        with Path(path).open("r", encoding="utf-8") as source, (
+                system.transaction() if commit_once else ExitStack()):
+            rows = parse_jsonl(source, collection)
+            for chunk in _chunks(rows, chunk_size):
+                parsed = [row for row in chunk if row.error is None]
+                for row in chunk:
+                    if row.error is not None:
+                        _reject(rejects, row, row.error)
+                        summary.rejected += 1
+
+                results = create([row.entity for row in parsed], atomic=False)
+                for row, result in zip(parsed, results):
+                    if result.ok:
+                        summary.accepted += 1
+                    else:
+                        _reject(rejects, row, result.error or "Rejected.")
+                        summary.rejected += 1
+    finally:
+        if rejects is not None:
+            rejects.close()
+    return summary
+
+
+def _parse_chunk(
+    collection: str,
+    lines: list[str],
+) -> list[tuple[int, Any, str | None]]:
+    """Parse and field-check one chunk; runs in a worker process.
+
+    Returns (index in chunk, entity or None, error or None) per row, so
+    the text of the lines does not travel back to the parent.
+    """
+    check = _CHECKS[collection]
+    parsed = []
+    for row in parse_jsonl(lines, collection):
+        if row.error is None:
+            try:
+                check(row.entity)
+            except ValueError as exc:
+                row.entity, row.error = None, str(exc)
+        parsed.append((row.line - 1, row.entity, row.error))
+    return parsed
+
+
+def parallel_import_jsonl(
+    system: ReservationSystem,
+    collection: str,
+    path: Path,
+    rejects_path: Path | None = None,
+    chunk_size: int = DEFAULT_PARALLEL_CHUNK_SIZE,
+    workers: int | None = None,
+) -> ImportSummary:
+    """Import a large JSON Lines file using every core.
+
+    The file is split into chunks of ``chunk_size`` lines that worker
+    processes (``workers``, default one per CPU; 1 runs in-process) parse
+    and field-check in parallel. The surviving rows then go through one
+    best-effort bulk create, which resolves what only the whole input can
+    tell: duplicate IDs across chunks, references to hotels and
+    customers, and double-booked rooms; it skips the field checks the
+    workers already ran. It is saved with a single commit.
+    Unlike ``import_jsonl`` every parsed row is held in memory.
+    """
+    create: Callable[..., list[BatchResult]] = {
+        HOTELS: system.create_hotels,
+        CUSTOMERS: system.create_customers,
+        RESERVATIONS: system.create_reservations,
+    }[collection]
+
+    with Path(path).open("r", encoding="utf-8") as source:
+        chunks = list(iter(lambda: list(islice(source, chunk_size)), []))
+    parse = partial(_parse_chunk, collection)
+    if workers == 1:
+        results = list(map(parse, chunks))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(parse, chunks))
+
+    accepted: list[ParsedRow] = []
+    rejected: list[tuple[ParsedRow, str]] = []
+    for number, (lines, parsed) in enumerate(zip(chunks, results)):
+        first_line = number * chunk_size + 1
+        for index, entity, error in parsed:
+            row = ParsedRow(
+                first_line + index, lines[index].strip(), entity, error)
+            if error is None:
+                accepted.append(row)
+            else:
+                rejected.append((row, error))
+
+    # The workers already ran the field checks.
+    outcomes = create(
+        [row.entity for row in accepted], atomic=False, checked=True)
+    summary = ImportSummary()
+    for row, result in zip(accepted, outcomes):
+        if result.ok:
+            summary.accepted += 1
+        else:
+            rejected.append((row, result.error or "Rejected."))
+    summary.rejected = len(rejected)
+
+    if rejects_path is not None:
+        rejected.sort(key=lambda item: item[0].line)
+        with Path(rejects_path).open("w", encoding="utf-8") as rejects:
+            for row, error in rejected:
+                _reject(rejects, row, error)
+    return summary
+
+
+def export_jsonl(
+    system: ReservationSystem,
+    collection: str,
+    path: Path,
+) -> int:
+    """Write a collection as JSON Lines, one entity per line."""
+    count = 0
+    with Path(path).open("w", encoding="utf-8") as handle:
+        for entity in system.iter_entities(collection):
+            handle.write(json.dumps(entity.to_dict()) + "\n")
+            count += 1
+    return count
@@ -0,0 +1,142 @@
+"""Columnar storage for large reservation sets."""
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Mapping
+from datetime import date
+from typing import Any, Iterable, Iterator
+
+from reservation_system.models import Reservation, parse_date
+
+
+class StringPool:
+    """Interned strings addressed by small integer codes."""
+
+    def __init__(self) -> None:
+        self.codes: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def code(self, value: str) -> int:
+        """Return the code of a string, adding it to the pool if new."""
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            value = sys.intern(value)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+
+def _ordinal(value: date | None) -> int:
+    return 0 if value is None else value.toordinal()
+
+
+def _from_ordinal(value: int) -> date | None:
+    return None if value == 0 else date.fromordinal(value)
+
+
+class ReservationTable(Mapping[str, Reservation]):
+    """Reservations stored column by column instead of one object each.
+
+    Hotel and customer IDs are interned once in a ``StringPool`` and each
+    row only keeps their codes; rooms and stay dates (as ordinals, 0 for
+    none) live in ``array('i')`` columns. Removing a row moves the last
+    row into its slot, so the columns stay dense. ``rows`` maps each
+    reservation ID to its row and keeps insertion order for iteration.
+
+    Reading an entry builds a ``Reservation`` on the fly; nothing keeps
+    per-reservation objects alive.
+    """
+
+    def __init__(self, reservations: Iterable[Reservation] = ()) -> None:
+        self.rows: dict[str, int] = {}
+        self.ids: list[str] = []
+        self.hotels = StringPool()
+        self.customers = StringPool()
+        self.hotel_codes = array("i")
+        self.customer_codes = array("i")
+        self.rooms = array("i")
+        self.check_ins = array("i")
+        self.check_outs = array("i")
+        for reservation in reservations:
+            self.add(reservation)
+
+    def __getitem__(self, reservation_id: str) -> Reservation:
+        return self.reservation(self.rows[reservation_id])
+
+    def __contains__(self, reservation_id: object) -> bool:
+        return reservation_id in self.rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def reservation(self, row: int) -> Reservation:
+        """Build the Reservation stored in a row."""
+        return Reservation(
+            reservation_id=self.ids[row],
+            hotel_id=self.hotels.values[self.hotel_codes[row]],
+            customer_id=self.customers.values[self.customer_codes[row]],
+            room=self.rooms[row],
+            check_in=_from_ordinal(self.check_ins[row]),
+            check_out=_from_ordinal(self.check_outs[row]),
+        )
+
+    def add(self, reservation: Reservation) -> None:
+        """Append a reservation; its ID must not be in the table yet."""
+        self.append(
+            reservation.reservation_id, reservation.hotel_id,
+            reservation.customer_id, reservation.room,
+            reservation.check_in, reservation.check_out)
+
+    def add_record(self, data: dict[str, Any]) -> None:
+        """Append a stored record without building a Reservation for it."""
+        self.append(
+            str(data["reservation_id"]),
+            str(data["hotel_id"]),
+            str(data["customer_id"]),
+            int(data["room"]),
+            parse_date(data.get("check_in")),
+            parse_date(data.get("check_out")),
+        )
+
+    def append(
+        self,
+        reservation_id: str,
+        hotel_id: str,
+        customer_id: str,
+        room: int,
+        check_in: date | None,
+        check_out: date | None,
+    ) -> None:
+        """Append one row from its column values."""
+        reservation_id = sys.intern(reservation_id)
+        self.rows[reservation_id] = len(self.ids)
+        self.ids.append(reservation_id)
+        self.hotel_codes.append(self.hotels.code(hotel_id))
+        self.customer_codes.append(self.customers.code(customer_id))
+        self.rooms.append(room)
+        self.check_ins.append(_ordinal(check_in))
+        self.check_outs.append(_ordinal(check_out))
+
+    def remove(self, reservation_id: str) -> Reservation:
+        """Remove a reservation and return it."""
+        row = self.rows.pop(reservation_id)
+        reservation = self.reservation(row)
+        last = len(self.ids) - 1
+        columns = (
+            self.ids, self.hotel_codes, self.customer_codes, self.rooms,
+            self.check_ins, self.check_outs)
+        if row != last:
+            for column in columns:
+                column[row] = column[last]
+            self.rows[self.ids[row]] = row
+        for column in columns:
+            column.pop()
+        return reservation
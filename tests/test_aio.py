@@ -0,0 +1,99 @@
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from reservation_system import backends
+from reservation_system.aio import AsyncReservationSystem
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+from reservation_system.storage import load_list, save_list
+
+
+class TestAsyncReservationSystem(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.system = ReservationSystem(self.tmp.name, thread_safe=True)
+        self.system.create_hotel(Hotel("H1", "Hotel Uno", 50, "CDMX"))
+        self.system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_concurrent_writes_share_commits(self) -> None:
+        async def scenario() -> list:
+            async with AsyncReservationSystem(
+                    self.system, max_delay=0.05) as service:
+                return await asyncio.gather(*[
+                    service.create_reservation(
+                        Reservation(f"R{i}", "H1", "C1", i % 40 + 1))
+                    for i in range(40)] + [
+                    service.create_reservation(
+                        Reservation("R99", "H1", "C1", 1))],
+                    return_exceptions=True)
+
+        with mock.patch.object(
+                backends, "save_list", wraps=save_list) as spy:
+            outcomes = asyncio.run(scenario())
+
+        self.assertEqual(outcomes[:40], [None] * 40)
+        self.assertIsInstance(outcomes[40], ValueError)
+        self.assertLess(spy.call_count, 10)
+        reloaded = ReservationSystem(self.tmp.name)
+        self.assertEqual(len(reloaded.list_reservations_for_hotel("H1")), 40)
+
+    def test_reads_see_committed_writes(self) -> None:
+        async def scenario() -> Hotel:
+            async with AsyncReservationSystem(self.system) as service:
+                await service.modify_hotel_information("H1", name="Uno+")
+                return await service.display_hotel_info("H1")
+
+        self.assertEqual(asyncio.run(scenario()).name, "Uno+")
+
+    def test_loop_keeps_running_while_a_read_waits_for_a_commit(
+            self) -> None:
+        write = self.system.storage.write
+        writing = threading.Event()
+
+        def slow_write(*args: object) -> None:
+            writing.set()
+            time.sleep(0.5)
+            write(*args)
+
+        async def scenario() -> tuple[float, str]:
+            async with AsyncReservationSystem(self.system) as service:
+                # A batch from another thread holds every lock while it
+                # commits, and another process renames C1 meanwhile, so
+                # the read has to reload and wait for that commit.
+                batch = threading.Thread(
+                    target=self.system.create_reservations,
+                    args=([Reservation("R1", "H1", "C1", 1)],))
+                batch.start()
+                writing.wait()
+                path = Path(self.tmp.name) / "customers.json"
+                customers = load_list(path)
+                customers[0]["name"] = "Ana Maria"
+                save_list(path, customers)
+
+                reading = asyncio.ensure_future(
+                    service.display_customer_info("C1"))
+                longest, last = 0.0, time.perf_counter()
+                while not reading.done():
+                    await asyncio.sleep(0.01)
+                    now = time.perf_counter()
+                    longest, last = max(longest, now - last), now
+                batch.join()
+                return longest, (await reading).name
+
+        with mock.patch.object(self.system.storage, "write", slow_write):
+            longest, name = asyncio.run(scenario())
+
+        self.assertLess(longest, 0.2)
+        self.assertEqual(name, "Ana Maria")
+
+    def test_requires_thread_safe_system(self) -> None:
+        with self.assertRaises(ValueError):
+            AsyncReservationSystem(ReservationSystem(self.tmp.name))
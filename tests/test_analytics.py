@@ -0,0 +1,86 @@
+import tempfile
+import unittest
+from datetime import date
+
+from reservation_system import analytics
+from reservation_system.analytics import Activity, OccupancyAnalytics
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+
+
+class TestOccupancyAnalytics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.system = ReservationSystem(self.tmp.name, cached=True)
+        self.system.create_hotels([
+            Hotel("H1", "Hotel Uno", 4, "CDMX"),
+            Hotel("H2", "Hotel Dos", 2, "cdmx "),
+            Hotel("H3", "Hotel Tres", 5, "Monterrey"),
+        ])
+        self.system.create_customers([
+            Customer("C1", "Ana", "ana@mail.com"),
+            Customer("C2", "Luis", "luis@mail.com"),
+        ])
+        self.system.create_reservations([
+            Reservation("R1", "H1", "C1", 1,
+                        date(2024, 5, 1), date(2024, 5, 4)),
+            Reservation("R2", "H1", "C2", 1,
+                        date(2024, 5, 10), date(2024, 5, 12)),
+            Reservation("R3", "H1", "C2", 2),
+            Reservation("R4", "H2", "C1", 2,
+                        date(2024, 6, 1), date(2024, 6, 2)),
+        ])
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_aggregates(self) -> None:
+        hotel = self.system.hotel_occupancy("H1")
+        self.assertEqual(
+            (hotel.rooms, hotel.occupied, hotel.bookings, hotel.nights),
+            (4, 2, 3, 5))
+        self.assertEqual(hotel.rate, 0.5)
+        location = self.system.location_occupancy("CDMX")
+        self.assertEqual((location.rooms, location.occupied), (6, 3))
+        self.assertEqual(
+            self.system.customer_activity("C1"), Activity(2, 4))
+        self.assertEqual(
+            self.system.top_hotels(2), [("H1", 3), ("H2", 1)])
+
+    def test_writes_keep_aggregates_equal_to_a_rebuild(self) -> None:
+        self.system.hotel_occupancy("H1")
+        self.system.cancel_reservation("R1")
+        # Shrinking below a booked room is refused.
+        self.system.cancel_reservation("R3")
+        self.system.modify_hotel_information(
+            "H1", rooms=1, location="Monterrey")
+        self.system.delete_customer("C1")
+        self.system.delete_hotel("H2")
+        self.system.create_reservation(Reservation("R5", "H3", "C2", 5))
+
+        report = self.system.occupancy_report()
+        system = self.system
+        rebuilt = OccupancyAnalytics.build(
+            system.iter_entities("hotels"),
+            system._reservation_index().table).report()
+        self.assertEqual(report, rebuilt)
+        self.assertEqual(report.locations["monterrey"].occupied, 2)
+        self.assertNotIn("cdmx", report.locations)
+
+    def test_rolled_back_transaction_restores_aggregates(self) -> None:
+        before = self.system.occupancy_report()
+        with self.assertRaises(RuntimeError):
+            with self.system.transaction():
+                self.system.delete_hotel("H1")
+                raise RuntimeError("abort")
+        self.assertEqual(self.system.occupancy_report(), before)
+
+    @unittest.skipIf(analytics.np is None, "NumPy is not installed")
+    def test_vectorized_and_row_paths_agree(self) -> None:
+        table = self.system._reservation_index().table
+        self.assertEqual(
+            analytics._aggregate(table), analytics._aggregate_rows(table))
+
+
+if __name__ == "__main__":
+    unittest.main()
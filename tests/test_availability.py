@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+from datetime import date
+
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+
+
+class TestAvailability(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.system = ReservationSystem(self.tmp.name, cached=True)
+        self.system.create_hotels([
+            Hotel("H1", "Hotel Uno", 3, "CDMX"),
+            Hotel("H2", "Dos", 4, "Monterrey"),
+            Hotel("H3", "Tres", 2, "monterrey "),
+        ])
+        self.system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+        self.system.create_reservations([
+            Reservation("R1", "H2", "C1", 1),
+            Reservation("R2", "H2", "C1", 3),
+            Reservation("R3", "H3", "C1", 1),
+            Reservation("R4", "H3", "C1", 2,
+                        date(2026, 3, 1), date(2026, 3, 5)),
+        ])
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_free_rooms_follow_bookings(self) -> None:
+        self.assertEqual(self.system.free_rooms("H2"), [2, 4])
+        self.assertEqual(self.system.free_rooms("H2", limit=1), [2])
+
+        self.system.cancel_reservation("R1")
+
+        self.assertEqual(self.system.free_rooms("H2"), [1, 2, 4])
+        self.assertEqual(self.system.count_free_rooms("H2"), 3)
+
+    def test_negative_limit_is_rejected(self) -> None:
+        dated = {"check_in": date(2026, 3, 5), "check_out": date(2026, 3, 7)}
+        for stay in ({}, dated):
+            with self.assertRaisesRegex(ValueError, "limit must be >= 0"):
+                self.system.free_rooms("H2", limit=-1, **stay)
+            self.assertEqual(self.system.free_rooms("H2", 0, **stay), [])
+
+    def test_dated_search_checks_room_schedules(self) -> None:
+        self.assertEqual(self.system.free_rooms("H3"), [])
+        self.assertEqual(
+            self.system.free_rooms(
+                "H3", check_in=date(2026, 3, 5), check_out=date(2026, 3, 7)),
+            [2])
+
+    def test_find_available_hotels_by_location(self) -> None:
+        found = self.system.find_available_hotels("Monterrey")
+        self.assertEqual([(h.hotel_id, n) for h, n in found], [("H2", 2)])
+
+        self.system.modify_hotel_information("H1", location="Monterrey")
+        self.system.modify_hotel_information("H2", rooms=6)
+
+        found = self.system.find_available_hotels("MONTERREY", min_free=3)
+        self.assertEqual(
+            sorted((h.hotel_id, n) for h, n in found),
+            [("H1", 3), ("H2", 4)])
+
+    def test_deleted_hotel_leaves_index(self) -> None:
+        self.system.delete_hotel("H2")
+        self.assertEqual(self.system.find_available_hotels("Monterrey"), [])
+        with self.assertRaises(ValueError):
+            self.system.free_rooms("H2")
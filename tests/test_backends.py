@@ -0,0 +1,82 @@
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+from reservation_system.backends import RESERVATIONS, SQLiteStorage
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "reservations.db"
+        self.system = ReservationSystem(
+            storage=SQLiteStorage(self.db_path), cached=True)
+        self.system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+        self.system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+
+    def tearDown(self) -> None:
+        self.system.close()
+        self.tmp.cleanup()
+
+    def test_round_trip_through_database(self) -> None:
+        self.system.create_reservation(Reservation("R1", "H1", "C1", 1))
+        self.system.modify_hotel_information("H1", name="Uno Plus")
+
+        reopened = ReservationSystem(storage=SQLiteStorage(self.db_path))
+        self.assertEqual(reopened.display_hotel_info("H1").name, "Uno Plus")
+        self.assertEqual(
+            [r.reservation_id
+             for r in reopened.list_reservations_for_hotel("H1")],
+            ["R1"])
+        reopened.close()
+
+    def test_unique_room_constraint_rejects_double_booking(self) -> None:
+        storage = self.system.storage
+        self.system.create_reservation(Reservation("R1", "H1", "C1", 1))
+        stale = {"R2": Reservation("R2", "H1", "C1", 1)}
+
+        with self.assertRaises(ValueError):
+            storage.write(RESERVATIONS, stale, ["R2"], [])
+
+    def test_cascading_delete_removes_rows(self) -> None:
+        self.system.create_reservation(Reservation("R1", "H1", "C1", 1))
+        self.system.delete_customer("C1")
+
+        self.assertIsNone(self.system.storage.get(RESERVATIONS, "R1"))
+
+    def test_uncached_writes_are_validated_by_queries(self) -> None:
+        storage = SQLiteStorage(self.db_path)
+        system = ReservationSystem(storage=storage)
+        with mock.patch.object(
+                storage, "load", side_effect=AssertionError("full load")):
+            system.create_reservation(Reservation(
+                "R1", "H1", "C1", 2, date(2024, 5, 1), date(2024, 5, 4)))
+            system.create_reservation(Reservation(
+                "R2", "H1", "C1", 2, date(2024, 5, 4), date(2024, 5, 6)))
+            for reservation in (
+                    Reservation("R3", "H1", "C1", 2,
+                                date(2024, 5, 3), date(2024, 5, 5)),
+                    Reservation("R3", "H1", "C1", 6),
+                    Reservation("R3", "H9", "C1", 1),
+                    Reservation("R3", "H1", "C9", 1),
+                    Reservation("R1", "H1", "C1", 1)):
+                with self.assertRaises(ValueError):
+                    system.create_reservation(reservation)
+            system.cancel_reservation("R1")
+            with self.assertRaises(ValueError):
+                system.cancel_reservation("R1")
+            system.create_customer(Customer("C2", "Luis", "luis@mail.com"))
+            with self.assertRaises(ValueError):
+                system.create_hotel(Hotel("H1", "Otro", 2, "CDMX"))
+
+        self.assertEqual(
+            [r.reservation_id
+             for r in self.system.list_reservations_for_hotel("H1")],
+            ["R2"])
+        self.assertEqual(
+            self.system.display_customer_info("C2").name, "Luis")
+        system.close()
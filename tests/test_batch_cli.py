@@ -0,0 +1,124 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from reservation_system import backends
+from reservation_system.cli import batch_main, run_batch
+from reservation_system.commands import execute
+from reservation_system.services import ReservationSystem
+from reservation_system.storage import save_list
+
+HOTEL = {"hotel_id": "H1", "name": "Uno", "rooms": 3, "location": "CDMX"}
+CUSTOMER = {"customer_id": "C1", "name": "Ana", "email": "ana@mail.com"}
+
+
+def _line(command: str, **args: object) -> str:
+    return json.dumps({"command": command, "args": args}) + "\n"
+
+
+class TestCommands(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.system = ReservationSystem(self.tmp.name, cached=True)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_results_and_errors(self) -> None:
+        self.assertEqual(
+            execute(self.system, {"id": 1, "command": "create_hotel",
+                                  "args": {"hotel": HOTEL}}),
+            {"id": 1, "ok": True, "result": None})
+        self.assertEqual(
+            execute(self.system, {"command": "display_hotel_info",
+                                  "args": {"hotel_id": "H1"}})["result"],
+            HOTEL)
+        self.assertFalse(execute(self.system, {"command": "drop_tables"})[
+            "ok"])
+        self.assertIn("Invalid arguments", execute(self.system, {
+            "command": "free_rooms", "args": {"hotel": "H1"}})["error"])
+
+    def test_arguments_of_the_wrong_type_are_rejected(self) -> None:
+        execute(self.system, {"command": "create_hotel",
+                              "args": {"hotel": HOTEL}})
+        for command, args in (
+                ("create_hotel", {"hotel": "x"}),
+                ("create_hotels", {"hotels": ["x"]}),
+                ("free_rooms", {"hotel_id": "H1", "limit": "2"}),
+                ("search_hotels", {"query": "u", "offset": "1"}),
+                ("search_hotels", {"query": "u", "fields": 3}),
+                ("resize_hotels", {"sizes": [["H1", 2]]}),
+                ("resize_hotels", {"sizes": {"H1": "2"}}),
+                ("delete_hotels", {"hotel_ids": "H1"}),
+                ("modify_hotel_information", {"hotel_id": "H1",
+                                              "relocate": "yes"}),
+                ("display_hotel_info", {"hotel_id": ["H1"]}),
+                ("display_hotel_info", {})):
+            result = execute(
+                self.system, {"command": command, "args": args})
+            self.assertFalse(result["ok"], command)
+            self.assertIn("Invalid arguments", result["error"])
+
+    def test_errors_inside_a_method_are_not_argument_errors(self) -> None:
+        with mock.patch.object(
+                ReservationSystem, "_hotel_map",
+                side_effect=TypeError("bug")):
+            with self.assertRaisesRegex(TypeError, "bug"):
+                execute(self.system, {"command": "display_hotel_info",
+                                      "args": {"hotel_id": "H1"}})
+        self.assertEqual(execute(self.system, {
+            "command": "modify_hotel_information",
+            "args": {"hotel_id": "H9", "name": None}})["error"],
+            "Hotel not found.")
+
+
+class TestBatchMode(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.lines = [
+            _line("create_hotel", hotel=HOTEL),
+            _line("create_customer", customer=CUSTOMER),
+            "not json\n",
+            _line("create_reservation", reservation={
+                "reservation_id": "R1", "hotel_id": "H1",
+                "customer_id": "C1", "room": 1,
+                "check_in": "2025-01-01", "check_out": "2025-01-03"}),
+            _line("free_rooms", hotel_id="H1",
+                  check_in="2025-01-02", check_out="2025-01-04"),
+        ]
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_one_result_per_command_with_grouped_commits(self) -> None:
+        system = ReservationSystem(self.tmp.name, cached=True)
+        output = io.StringIO()
+        with mock.patch.object(
+                backends, "save_list", wraps=save_list) as spy:
+            summary = run_batch(system, self.lines, output, group_size=10)
+
+        results = [
+            json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([r["line"] for r in results], [1, 2, 3, 4, 5])
+        self.assertEqual([r["ok"] for r in results],
+                         [True, True, False, True, True])
+        self.assertEqual(results[4]["result"], [2, 3])
+        self.assertEqual((summary.commands, summary.failed), (5, 1))
+        self.assertEqual(spy.call_count, 3)
+
+    def test_entry_point_reads_file_and_writes_results(self) -> None:
+        commands = Path(self.tmp.name) / "commands.jsonl"
+        commands.write_text("".join(self.lines), encoding="utf-8")
+        output = Path(self.tmp.name) / "results.jsonl"
+
+        with mock.patch("sys.stderr", new=io.StringIO()) as stderr:
+            batch_main([
+                "--batch", str(commands), "--output", str(output),
+                "--data-dir", str(Path(self.tmp.name) / "data")])
+
+        self.assertEqual(
+            len(output.read_text(encoding="utf-8").splitlines()), 5)
+        self.assertIn("5 commands (1 failed)", stderr.getvalue())
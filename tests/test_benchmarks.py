@@ -0,0 +1,59 @@
+import inspect
+import unittest
+
+from benchmarks.compare import compare
+from benchmarks.generator import generate, parse_size
+from benchmarks.runner import CASES, run_mode
+from reservation_system.services import ReservationSystem
+
+
+def _report(p50: float, ops: float) -> dict:
+    return {"results": [{
+        "mode": "json", "case": "create_reservation", "iterations": 10,
+        "p50_us": p50, "p99_us": p50, "ops_per_sec": ops,
+        "peak_bytes": 0}]}
+
+
+class TestGenerator(unittest.TestCase):
+    def test_same_seed_gives_same_dataset(self) -> None:
+        self.assertEqual(generate(500, seed=3), generate(500, seed=3))
+        self.assertNotEqual(
+            generate(500, seed=3).reservations,
+            generate(500, seed=4).reservations)
+        self.assertEqual(parse_size("10K"), 10_000)
+
+    def test_generated_stays_do_not_overlap(self) -> None:
+        data = generate(2000)
+        last: dict = {}
+        for reservation in data.reservations:
+            key = (reservation.hotel_id, reservation.room)
+            self.assertGreaterEqual(reservation.check_in, last.get(
+                key, reservation.check_in))
+            last[key] = reservation.check_out
+
+
+class TestCompare(unittest.TestCase):
+    def test_flags_only_regressions_past_threshold(self) -> None:
+        baseline = _report(100.0, 1000.0)
+
+        self.assertEqual(compare(baseline, _report(110.0, 950.0)), [])
+        self.assertEqual(compare(baseline, _report(50.0, 2000.0)), [])
+        self.assertEqual(len(compare(baseline, _report(200.0, 400.0))), 2)
+
+
+class TestRunner(unittest.TestCase):
+    def test_every_case_runs_against_json(self) -> None:
+        results = run_mode("json", generate(200), iterations=2)
+
+        self.assertIn("create_reservation", {r.case for r in results})
+        self.assertTrue(all(r.p50_us > 0 for r in results))
+
+    def test_every_public_operation_has_a_case(self) -> None:
+        public = {
+            name for name, _ in inspect.getmembers(
+                ReservationSystem, inspect.isfunction)
+            if not name.startswith("_")}
+
+        self.assertEqual(
+            public - {case.name for case in CASES},
+            {"close", "transaction"})
@@ -0,0 +1,93 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from reservation_system import backends
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+from reservation_system.storage import save_list
+
+
+class TestBulkOperations(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.system = ReservationSystem(self.tmp.name)
+        self.system.create_hotels([
+            Hotel("H1", "Hotel Uno", 5, "CDMX"),
+            Hotel("H2", "Dos", 10, "Monterrey"),
+        ])
+        self.system.create_customers([
+            Customer("C1", "Ana", "ana@mail.com"),
+            Customer("C2", "Luis", "luis@mail.com"),
+        ])
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_batch_is_validated_against_itself(self) -> None:
+        results = self.system.create_reservations([
+            Reservation("R1", "H1", "C1", 1),
+            Reservation("R2", "H1", "C2", 1),
+            Reservation("R1", "H2", "C2", 1),
+        ], atomic=False)
+
+        self.assertEqual([r.ok for r in results], [True, False, False])
+        self.assertEqual(results[1].error, "Room already reserved.")
+        self.assertEqual(results[2].error, "Reservation ID already exists.")
+        self.assertEqual(
+            len(self.system.list_reservations_for_hotel("H1")), 1)
+
+    def test_atomic_batch_rolls_back_on_any_error(self) -> None:
+        results = self.system.create_reservations([
+            Reservation("R1", "H1", "C1", 1),
+            Reservation("R2", "H9", "C1", 1),
+        ])
+
+        self.assertFalse(any(r.ok for r in results))
+        self.assertEqual(results[1].error, "Hotel not found.")
+        self.assertEqual(self.system.list_reservations_for_hotel("H1"), [])
+
+    def test_batch_saves_once(self) -> None:
+        rows = [Reservation(f"R{i}", "H2", "C1", i) for i in range(1, 11)]
+        with mock.patch.object(
+                backends, "save_list", wraps=save_list) as spy:
+            self.system.create_reservations(rows)
+        spy.assert_called_once()
+
+    def test_bulk_cancel_and_delete(self) -> None:
+        self.system.create_reservations([
+            Reservation("R1", "H1", "C1", 1),
+            Reservation("R2", "H2", "C2", 1),
+            Reservation("R3", "H2", "C1", 2),
+        ])
+
+        cancelled = self.system.cancel_reservations(["R1", "R9"],
+                                                    atomic=False)
+        deleted = self.system.delete_customers(["C2"])
+
+        self.assertEqual([r.ok for r in cancelled], [True, False])
+        self.assertTrue(deleted[0].ok)
+        self.assertEqual(
+            [r.reservation_id
+             for r in self.system.list_reservations_for_hotel("H2")],
+            ["R3"])
+
+    def test_unexpected_error_discards_the_staged_items(self) -> None:
+        system = ReservationSystem(self.tmp.name, cached=True)
+        batch = [Hotel("H3", "Tres", 5, "CDMX"), None]
+        with self.assertRaises(AttributeError):
+            system.create_hotels(batch)  # type: ignore[list-item]
+        with self.assertRaisesRegex(ValueError, "not found"):
+            system.display_hotel_info("H3")
+
+        with system.transaction():
+            system.create_hotel(Hotel("H4", "Cuatro", 5, "CDMX"))
+            with self.assertRaises(AttributeError):
+                system.create_hotels(batch)  # type: ignore[list-item]
+            with self.assertRaisesRegex(ValueError, "not found"):
+                system.display_hotel_info("H3")
+
+        reloaded = ReservationSystem(self.tmp.name)
+        self.assertEqual(reloaded.display_hotel_info("H4").name, "Cuatro")
+        with self.assertRaisesRegex(ValueError, "not found"):
+            reloaded.display_hotel_info("H3")
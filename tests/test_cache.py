@@ -0,0 +1,47 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from reservation_system import backends
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+from reservation_system.storage import load_list, save_list
+
+
+class TestCachedReservationSystem(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tmp.name)
+        self.system = ReservationSystem(str(self.data_dir), cached=True)
+        self.system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+        self.system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_reads_do_not_reparse_unchanged_files(self) -> None:
+        self.system.display_hotel_info("H1")
+        with mock.patch.object(
+                backends, "load_list", wraps=load_list) as spy:
+            for _ in range(5):
+                self.system.display_hotel_info("H1")
+                self.system.display_customer_info("C1")
+        spy.assert_not_called()
+
+    def test_writes_go_through_to_disk(self) -> None:
+        self.system.create_reservation(Reservation("R1", "H1", "C1", 1))
+
+        other = ReservationSystem(str(self.data_dir))
+        other.cancel_reservation("R1")
+        self.assertEqual(load_list(self.data_dir / "reservations.json"), [])
+
+    def test_external_change_invalidates_cache(self) -> None:
+        self.system.display_hotel_info("H1")
+        save_list(self.data_dir / "hotels.json", [
+            Hotel("H2", "Hotel Dos", 3, "Monterrey").to_dict()])
+
+        self.assertEqual(self.system.display_hotel_info("H2").name,
+                         "Hotel Dos")
+        with self.assertRaises(ValueError):
+            self.system.display_hotel_info("H1")
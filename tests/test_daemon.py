@@ -0,0 +1,73 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from reservation_system.daemon import ReservationClient, ReservationServer
+from reservation_system.models import Customer, Hotel
+from reservation_system.services import ReservationSystem
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmp.name, "rs.sock")
+        self.system = ReservationSystem(self.tmp.name, thread_safe=True)
+        self.server = ReservationServer(self.system, self.socket_path)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.client = ReservationClient(self.socket_path, pool_size=2)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.tmp.cleanup()
+
+    def test_calls_reach_the_shared_system(self) -> None:
+        self.client.create_hotel(hotel=Hotel("H1", "Hotel Uno", 5, "CDMX"))
+
+        self.assertEqual(
+            self.client.display_hotel_info(hotel_id="H1")["name"],
+            "Hotel Uno")
+        self.assertEqual(self.system.display_hotel_info("H1").rooms, 5)
+        with self.assertRaises(ValueError):
+            self.client.display_hotel_info(hotel_id="H404")
+
+    def test_pipeline_keeps_order(self) -> None:
+        self.client.create_hotel(hotel=Hotel("H1", "Hotel Uno", 50, "CDMX"))
+        self.client.create_customer(
+            customer=Customer("C1", "Ana", "ana@mail.com"))
+        commands = [
+            ("create_reservation", {"reservation": {
+                "reservation_id": f"R{i}", "hotel_id": "H1",
+                "customer_id": "C1", "room": i % 25 + 1}})
+            for i in range(50)]
+        commands.append(("count_free_rooms", {"hotel_id": "H1"}))
+
+        results = self.client.pipeline(commands, window=8)
+
+        self.assertEqual([r["ok"] for r in results[:50]],
+                         [True] * 25 + [False] * 25)
+        self.assertEqual(results[50]["result"], 25)
+
+    def test_pooled_connections_serve_many_threads(self) -> None:
+        self.client.create_hotel(hotel=Hotel("H1", "Hotel Uno", 5, "CDMX"))
+        errors = []
+
+        def worker() -> None:
+            try:
+                for _ in range(20):
+                    self.client.free_rooms(hotel_id="H1", limit=2)
+            except Exception as exc:  # pylint: disable=broad-except
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(self.client._idle.qsize(), 2)
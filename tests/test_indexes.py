@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from reservation_system.indexes import ReservationIndex
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+
+
+class TestReservationIndex(unittest.TestCase):
+    def test_add_and_remove_keep_indexes_in_sync(self) -> None:
+        index = ReservationIndex([
+            Reservation("R1", "H1", "C1", 1),
+            Reservation("R2", "H1", "C2", 2),
+        ])
+        self.assertEqual(index.room_holder("H1", 2), "R2")
+
+        index.remove("R2")
+
+        self.assertIsNone(index.room_holder("H1", 2))
+        self.assertEqual(
+            [r.reservation_id for r in index.for_hotel("H1")], ["R1"])
+        self.assertEqual(index.for_customer("C2"), [])
+
+
+class TestReservationQueries(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.system = ReservationSystem(self.tmp.name, cached=True)
+        self.system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+        self.system.create_hotel(Hotel("H2", "Dos", 10, "Monterrey"))
+        self.system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+        self.system.create_customer(Customer("C2", "Luis", "luis@mail.com"))
+        self.system.create_reservation(Reservation("R1", "H1", "C1", 1))
+        self.system.create_reservation(Reservation("R2", "H2", "C1", 1))
+        self.system.create_reservation(Reservation("R3", "H1", "C2", 2))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_list_reservations_for_hotel_and_customer(self) -> None:
+        by_hotel = self.system.list_reservations_for_hotel("H1")
+        by_customer = self.system.list_reservations_for_customer("C1")
+
+        self.assertEqual([r.reservation_id for r in by_hotel], ["R1", "R3"])
+        self.assertEqual(
+            [r.reservation_id for r in by_customer], ["R1", "R2"])
+
+    def test_delete_hotel_cascades_through_index(self) -> None:
+        self.system.delete_hotel("H1")
+
+        self.assertEqual(
+            [r.reservation_id
+             for r in self.system.list_reservations_for_customer("C1")],
+            ["R2"])
+        reloaded = ReservationSystem(str(Path(self.tmp.name)))
+        self.assertEqual(reloaded.list_reservations_for_customer("C2"), [])
+
+    def test_cancelled_room_can_be_booked_again(self) -> None:
+        self.system.cancel_reservation("R1")
+        self.system.create_reservation(Reservation("R4", "H1", "C2", 1))
+
+        self.assertEqual(
+            len(self.system.list_reservations_for_customer("C2")), 2)
@@ -0,0 +1,138 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from reservation_system.journal import Journal
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+from reservation_system.storage import file_lock, load_list
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "hotels.json"
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_replay_applies_puts_and_deletes_in_order(self) -> None:
+        journal = Journal(self.path, "hotel_id")
+        journal.append(puts=[{"hotel_id": "H1", "name": "A"}])
+        journal.append(puts=[{"hotel_id": "H1", "name": "B"},
+                             {"hotel_id": "H2", "name": "C"}])
+        journal.append(deletes=["H2"])
+        journal.close()
+
+        self.assertEqual(Journal(self.path, "hotel_id").load(),
+                         [{"hotel_id": "H1", "name": "B"}])
+
+    def test_torn_last_line_is_ignored(self) -> None:
+        journal = Journal(self.path, "hotel_id")
+        journal.append(puts=[{"hotel_id": "H1", "name": "A"}])
+        journal.close()
+        with journal.journal_path.open("a", encoding="utf-8") as handle:
+            handle.write('{"op": "put", "item": {"hot')
+
+        self.assertEqual(len(Journal(self.path, "hotel_id").load()), 1)
+
+    def test_appends_after_a_torn_line_survive_reload(self) -> None:
+        journal = Journal(self.path, "hotel_id")
+        journal.append(puts=[{"hotel_id": "H1", "name": "A"}])
+        journal.close()
+        with journal.journal_path.open("a", encoding="utf-8") as handle:
+            handle.write('{"op": "put", "item": {"hot')
+
+        journal = Journal(self.path, "hotel_id")
+        journal.append(puts=[{"hotel_id": "H2", "name": "B"}])
+        journal.close()
+
+        self.assertEqual(
+            sorted(h["hotel_id"]
+                   for h in Journal(self.path, "hotel_id").load()),
+            ["H1", "H2"])
+
+    def test_corrupt_line_before_the_last_raises(self) -> None:
+        journal = Journal(self.path, "hotel_id")
+        journal.append(puts=[{"hotel_id": "H1", "name": "A"}])
+        journal.close()
+        with journal.journal_path.open("a", encoding="utf-8") as handle:
+            handle.write('{"op": "put", "item": {"hot\n')
+            handle.write('{"op": "delete", "key": "H1"}\n')
+
+        with self.assertRaises(ValueError):
+            Journal(self.path, "hotel_id").load()
+
+    def test_compaction_folds_journal_into_snapshot(self) -> None:
+        journal = Journal(self.path, "hotel_id", compact_bytes=1)
+        journal.append(puts=[{"hotel_id": "H1", "name": "A"}])
+        journal.wait()
+        journal.append(puts=[{"hotel_id": "H2", "name": "B"}])
+        journal.wait()
+        journal.compact()
+        journal.close()
+
+        self.assertEqual(len(load_list(self.path)), 2)
+        self.assertFalse(journal.pending_path.exists())
+        self.assertFalse(journal.journal_path.exists())
+
+    def test_only_one_process_folds_a_rotated_journal(self) -> None:
+        first = Journal(self.path, "hotel_id")
+        second = Journal(self.path, "hotel_id")
+        first.append(puts=[{"hotel_id": "H1", "name": "A"}])
+        first.close()
+
+        with mock.patch.object(threading, "excepthook") as failed:
+            with file_lock(first.compact_lock_path):
+                first.compact(background=True)
+                second.compact(background=True)
+            first.wait()
+            second.wait()
+
+        failed.assert_not_called()
+        self.assertEqual(load_list(self.path), [
+            {"hotel_id": "H1", "name": "A"}])
+        self.assertFalse(first.pending_path.exists())
+
+
+class TestJournaledReservationSystem(unittest.TestCase):
+    def test_state_survives_restart(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            system = ReservationSystem(tmp, cached=True, journal=True)
+            system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+            system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+            system.create_reservation(Reservation("R1", "H1", "C1", 1))
+            system.create_reservation(Reservation("R2", "H1", "C1", 2))
+            system.cancel_reservation("R1")
+            system.close()
+
+            reopened = ReservationSystem(tmp, journal=True)
+            self.assertEqual(
+                [r.reservation_id
+                 for r in reopened.list_reservations_for_hotel("H1")],
+                ["R2"])
+            reopened.close()
+
+    def test_writes_after_a_crashed_append_are_kept(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            system = ReservationSystem(tmp, journal=True)
+            system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+            system.close()
+            torn = Path(tmp) / "hotels.journal"
+            with torn.open("a", encoding="utf-8") as handle:
+                handle.write('{"op": "put", "item": {"hot')
+
+            system = ReservationSystem(tmp, journal=True)
+            system.create_hotel(Hotel("H2", "Hotel Dos", 5, "CDMX"))
+            self.assertEqual(system.display_hotel_info("H2").name,
+                             "Hotel Dos")
+            system.close()
+
+            reopened = ReservationSystem(tmp, journal=True)
+            self.assertEqual(reopened.display_hotel_info("H2").name,
+                             "Hotel Dos")
+            with self.assertRaisesRegex(ValueError, "already exists"):
+                reopened.create_hotel(Hotel("H2", "Again", 5, "CDMX"))
+            reopened.close()
@@ -0,0 +1,87 @@
+import multiprocessing
+import tempfile
+import unittest
+from pathlib import Path
+
+from reservation_system.backends import CUSTOMERS, JsonStorage
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+from reservation_system.storage import load_list, save_list
+
+
+def _add_customers(data_dir: str, worker: int, count: int) -> None:
+    system = ReservationSystem(data_dir, cached=True, write_retries=100)
+    for i in range(count):
+        system.create_customer(
+            Customer(f"C{worker}-{i}", "Ana", "ana@mail.com"))
+
+
+def _book_room(data_dir: str, worker: int, queue: multiprocessing.Queue
+               ) -> None:
+    system = ReservationSystem(data_dir, write_retries=100)
+    try:
+        system.create_reservation(Reservation(f"R{worker}", "H1", "C1", 1))
+    except ValueError as exc:
+        queue.put(str(exc))
+    else:
+        queue.put("ok")
+
+
+class TestMultiProcessWrites(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = self.tmp.name
+        system = ReservationSystem(self.data_dir)
+        system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+        system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_concurrent_writers_do_not_lose_updates(self) -> None:
+        workers = [
+            multiprocessing.Process(
+                target=_add_customers, args=(self.data_dir, w, 10))
+            for w in range(4)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+
+        customers = load_list(Path(self.data_dir) / "customers.json")
+        self.assertEqual(len(customers), 41)
+
+    def test_concurrent_bookings_of_one_room(self) -> None:
+        queue: multiprocessing.Queue = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(
+                target=_book_room, args=(self.data_dir, w, queue))
+            for w in range(4)]
+        for process in workers:
+            process.start()
+        outcomes = sorted(queue.get(timeout=30) for _ in workers)
+        for process in workers:
+            process.join()
+
+        self.assertEqual(outcomes.count("ok"), 1)
+        self.assertEqual(outcomes.count("Room already reserved."), 3)
+
+    def test_stale_write_is_retried_not_overwritten(self) -> None:
+        class RacingStorage(JsonStorage):
+            raced = False
+
+            def lock(self):  # type: ignore[no-untyped-def]
+                if not self.raced:
+                    self.raced = True
+                    path = self.paths[CUSTOMERS]
+                    save_list(path, load_list(path) + [
+                        Customer("C2", "Luis", "luis@mail.com").to_dict()])
+                return super().lock()
+
+        system = ReservationSystem(
+            storage=RacingStorage(Path(self.data_dir)), cached=True)
+        system.create_customer(Customer("C3", "Eva", "eva@mail.com"))
+
+        path = Path(self.data_dir) / "customers.json"
+        ids = [c["customer_id"] for c in load_list(path)]
+        self.assertEqual(ids, ["C1", "C2", "C3"])
@@ -0,0 +1,77 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from reservation_system.metrics import Metrics, error_category, registry
+from reservation_system.models import Customer, Hotel
+from reservation_system.services import ReservationSystem
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        registry.reset()
+        self.samples: list = []
+        registry.add_hook(self.samples.append)
+
+    def tearDown(self) -> None:
+        registry.remove_hook(self.samples.append)
+        registry.reset()
+        self.tmp.cleanup()
+
+    def test_operations_errors_and_io_are_recorded(self) -> None:
+        system = ReservationSystem(self.tmp.name)
+        system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+        with self.assertRaises(ValueError):
+            system.display_customer_info("C404")
+
+        self.assertEqual(registry.counter(
+            "reservation_operations_total", operation="create_hotel"), 1)
+        self.assertEqual(registry.counter(
+            "reservation_operation_errors_total",
+            operation="display_customer_info",
+            category="customer_not_found"), 1)
+        self.assertGreater(registry.counter(
+            "reservation_storage_written_bytes_total",
+            file="hotels.json"), 0)
+        self.assertEqual(registry.histogram(
+            "reservation_phase_seconds", phase="commit").count, 1)
+        self.assertIn(
+            "reservation_storage_parse_seconds",
+            {sample.name for sample in self.samples})
+
+    def test_prometheus_dump(self) -> None:
+        system = ReservationSystem(self.tmp.name)
+        system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+        path = Path(self.tmp.name) / "metrics.prom"
+
+        registry.write_prometheus(path)
+
+        text = path.read_text(encoding="utf-8")
+        self.assertIn("# TYPE reservation_operations_total counter", text)
+        self.assertIn(
+            'reservation_operations_total{operation="create_customer"} 1',
+            text)
+        self.assertIn(
+            'reservation_operation_seconds_bucket{operation='
+            '"create_customer",le="+Inf"} 1', text)
+
+
+class TestMetrics(unittest.TestCase):
+    def test_error_categories_drop_details(self) -> None:
+        self.assertEqual(
+            error_category(ValueError("Storage constraint failed: x")),
+            "storage_constraint_failed")
+        self.assertEqual(
+            error_category(ValueError("Room already reserved.")),
+            "room_already_reserved")
+
+    def test_failing_hook_does_not_break_recording(self) -> None:
+        metrics = Metrics()
+        metrics.add_hook(lambda sample: 1 / 0)
+        metrics.increment("calls", kind="a")
+        metrics.observe("latency", 0.002)
+
+        self.assertEqual(metrics.counter("calls", kind="a"), 1)
+        self.assertEqual(metrics.histogram("latency").cumulative()[5],
+                         (0.0025, 1))
@@ -0,0 +1,104 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.query_cache import QueryCache
+from reservation_system.services import ReservationSystem
+from reservation_system.storage import save_list
+
+
+class TestQueryCache(unittest.TestCase):
+    def test_lru_eviction_and_ttl_expiry(self) -> None:
+        now = [0.0]
+        cache = QueryCache(max_entries=2, ttl=10, clock=lambda: now[0])
+        for key in ("a", "b"):
+            cache.put(key, key.upper(), [], [], cache.generation)
+        self.assertEqual(cache.get("a", {}), (True, "A"))
+        cache.put("c", "C", [], [], cache.generation)
+
+        self.assertEqual(cache.get("b", {}), (False, None))
+        now[0] = 11
+        self.assertEqual(cache.get("a", {}), (False, None))
+        stats = cache.stats()
+        self.assertEqual((stats.evictions, stats.expirations), (1, 1))
+        self.assertEqual((stats.hits, stats.misses), (1, 2))
+
+    def test_put_after_invalidation_is_ignored(self) -> None:
+        cache = QueryCache()
+        generation = cache.generation
+        cache.invalidate(("hotel", "H1"))
+        cache.put("k", 1, [("hotel", "H1")], [], generation)
+        self.assertEqual(len(cache), 0)
+
+
+class TestCachedQueries(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tmp.name)
+        self.system = ReservationSystem(
+            str(self.data_dir), cached=True, query_cache_size=64)
+        self.system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+        self.system.create_hotel(Hotel("H2", "Hotel Dos", 3, "CDMX"))
+        self.system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_repeated_reads_hit(self) -> None:
+        cache = self.system.query_cache
+        self.system.display_hotel_info("H1")
+        self.system.find_available_hotels("cdmx")
+        self.system.display_hotel_info("H1")
+        rooms = self.system.free_rooms("H1")
+        rooms.clear()
+
+        self.assertEqual(self.system.free_rooms("H1"), [1, 2, 3, 4, 5])
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses), (2, 3))
+
+    def test_writes_invalidate_only_what_they_touch(self) -> None:
+        self.system.display_hotel_info("H1")
+        self.system.display_hotel_info("H2")
+        self.system.list_reservations_for_hotel("H1")
+        self.system.count_free_rooms("H2")
+        self.system.create_reservation(Reservation("R1", "H1", "C1", 1))
+
+        self.assertEqual(
+            [r.reservation_id
+             for r in self.system.list_reservations_for_hotel("H1")],
+            ["R1"])
+        self.assertEqual(self.system.count_free_rooms("H2"), 3)
+        self.system.display_hotel_info("H1")
+        self.system.display_hotel_info("H2")
+        # Only the H1 listing was recomputed.
+        self.assertEqual(self.system.query_cache.stats().hits, 3)
+
+        self.system.modify_hotel_information("H2", location="Monterrey")
+        self.assertEqual(
+            [h.hotel_id for h, _ in self.system.find_available_hotels(
+                "Monterrey")], ["H2"])
+        self.system.cancel_reservation("R1")
+        self.assertEqual(self.system.list_reservations_for_hotel("H1"), [])
+        self.assertEqual(self.system.count_free_rooms("H1"), 5)
+
+    def test_external_change_drops_entries(self) -> None:
+        self.system.display_hotel_info("H1")
+        save_list(self.data_dir / "hotels.json", [
+            Hotel("H1", "Renamed", 5, "CDMX").to_dict()])
+        self.assertEqual(self.system.display_hotel_info("H1").name,
+                         "Renamed")
+
+    def test_failed_atomic_batch_leaves_no_stale_entries(self) -> None:
+        self.system.list_reservations_for_customer("C1")
+        results = self.system.create_reservations([
+            Reservation("R1", "H1", "C1", 1),
+            Reservation("R2", "H9", "C1", 1),
+        ])
+        self.assertFalse(results[0].ok)
+        self.assertEqual(
+            self.system.list_reservations_for_customer("C1"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+from reservation_system import backends
+from reservation_system.indexes import ReservationIndex
+from reservation_system.metrics import error_category
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+
+
+def _rooms(system: ReservationSystem, hotel_id: str) -> dict[str, int]:
+    return {
+        r.reservation_id: r.room
+        for r in system.list_reservations_for_hotel(hotel_id)}
+
+
+class TestRoomIndex(unittest.TestCase):
+    def test_beyond_follows_adds_and_removes(self) -> None:
+        index = ReservationIndex([
+            Reservation("R1", "H1", "C1", 2),
+            Reservation("R2", "H1", "C1", 7,
+                        date(2024, 5, 1), date(2024, 5, 3)),
+            Reservation("R3", "H1", "C1", 7,
+                        date(2024, 5, 3), date(2024, 5, 5)),
+            Reservation("R4", "H1", "C1", 9),
+            Reservation("R5", "H2", "C1", 9),
+        ])
+        self.assertEqual(index.rooms_booked("H1"), [2, 7, 9])
+        self.assertEqual(
+            [r.reservation_id for r in index.beyond("H1", 5)],
+            ["R2", "R3", "R4"])
+
+        index.remove("R4")
+        index.remove("R2")
+        self.assertEqual(index.rooms_booked("H1", 3), [7])
+        index.remove("R3")
+        index.remove("R1")
+        self.assertNotIn("H1", index.booked_rooms)
+
+
+class TestResizeHotels(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.system = ReservationSystem(
+            self.tmp.name, cached=True, query_cache_size=16)
+        self.system.create_hotels([
+            Hotel("H1", "Hotel Uno", 6, "CDMX"),
+            Hotel("H2", "Hotel Dos", 4, "CDMX"),
+        ])
+        self.system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+        self.system.create_reservations([
+            Reservation("R1", "H1", "C1", 1,
+                        date(2024, 5, 1), date(2024, 5, 3)),
+            Reservation("R2", "H1", "C1", 5,
+                        date(2024, 5, 3), date(2024, 5, 6)),
+            Reservation("R3", "H1", "C1", 6),
+            Reservation("R4", "H2", "C1", 4),
+        ])
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_shrinking_below_a_booking_is_refused(self) -> None:
+        with self.assertRaises(ValueError):
+            self.system.modify_hotel_information("H1", rooms=5)
+        self.assertEqual(self.system.display_hotel_info("H1").rooms, 6)
+        self.assertEqual(_rooms(self.system, "H1"), {
+            "R1": 1, "R2": 5, "R3": 6})
+
+        self.system.modify_hotel_information("H2", rooms=5)
+        self.system.modify_hotel_information("H2", rooms=4)
+        self.assertEqual(self.system.display_hotel_info("H2").rooms, 4)
+
+    def test_refusals_share_one_error_category(self) -> None:
+        errors = []
+        for hotel_id, rooms in (("H1", 5), ("H1", 1), ("H2", 3)):
+            with self.assertRaises(ValueError) as raised:
+                self.system.modify_hotel_information(hotel_id, rooms=rooms)
+            errors.append(raised.exception)
+
+        self.assertEqual(
+            [str(e) for e in errors],
+            ["Reservations booked beyond the new capacity: 1.",
+             "Reservations booked beyond the new capacity: 2.",
+             "Reservations booked beyond the new capacity: 1."])
+        self.assertEqual(
+            {error_category(e) for e in errors},
+            {"reservations_booked_beyond_the_new_capacity"})
+
+    def test_relocation_moves_bookings_into_free_rooms(self) -> None:
+        self.system.free_rooms("H1")
+        self.system.modify_hotel_information("H1", rooms=2, relocate=True)
+
+        # R2 fits after R1 in room 1; the undated R3 needs an empty room.
+        self.assertEqual(_rooms(self.system, "H1"), {
+            "R1": 1, "R2": 1, "R3": 2})
+        self.assertEqual(self.system.free_rooms("H1"), [])
+        self.assertEqual(self.system.hotel_occupancy("H1").occupied, 2)
+        reloaded = ReservationSystem(self.tmp.name)
+        self.assertEqual(_rooms(reloaded, "H1"), _rooms(self.system, "H1"))
+
+        with self.assertRaises(ValueError):
+            self.system.modify_hotel_information(
+                "H1", rooms=1, relocate=True)
+        self.assertEqual(self.system.display_hotel_info("H1").rooms, 2)
+
+    def test_bulk_resize_saves_once(self) -> None:
+        with mock.patch.object(
+                backends, "save_list", wraps=backends.save_list) as spy:
+            results = self.system.resize_hotels(
+                {"H1": 3, "H2": 8}, relocate=True)
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual(
+            sorted(call.args[0].name for call in spy.call_args_list),
+            ["hotels.json", "reservations.json"])
+        self.assertEqual(_rooms(self.system, "H1"), {
+            "R1": 1, "R2": 1, "R3": 2})
+
+        results = self.system.resize_hotels({"H1": 1, "H2": 2})
+        self.assertEqual([r.ok for r in results], [False, False])
+        self.assertEqual(self.system.display_hotel_info("H2").rooms, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
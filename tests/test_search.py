@@ -0,0 +1,79 @@
+import tempfile
+import unittest
+
+from reservation_system.models import Customer, Hotel
+from reservation_system.search import TextIndex
+from reservation_system.services import ReservationSystem
+
+
+class TestTextIndex(unittest.TestCase):
+    def test_prefix_and_substring_follow_updates(self) -> None:
+        index = TextIndex.build([("C1", "Ana  García"), ("C2", "Andrés")])
+        index.substring("rcí")
+        index.put("C3", "Mariana")
+        index.put("C1", "Ana Lopez")
+        index.remove("C2")
+
+        self.assertEqual([k for _, k in index.prefix("an")], ["C1"])
+        self.assertEqual([k for _, k in index.prefix("lo")], ["C1"])
+        self.assertEqual(sorted(index.substring("ana")), ["C1", "C3"])
+        self.assertEqual(index.substring("rcí"), [])
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.system = ReservationSystem(self.tmp.name, cached=True)
+        self.system.create_customers([
+            Customer(f"C{i}", f"Cliente {i:02}", f"c{i}@mail.com")
+            for i in range(25)])
+        self.system.create_customer(
+            Customer("A1", "Ana Garcia", "ana@hotmail.com"))
+        self.system.create_hotels([
+            Hotel("H1", "Gran Palacio", 10, "CDMX"),
+            Hotel("H2", "Hotel Playa", 5, "Cancun"),
+        ])
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_pages_through_prefix_matches(self) -> None:
+        first = self.system.search_customers("cliente", limit=20)
+        self.assertEqual(len(first.items), 20)
+        self.assertEqual(first.items[0].customer_id, "C0")
+        rest = self.system.search_customers(
+            "CLIENTE", limit=20, offset=first.next_offset)
+        self.assertEqual(
+            [c.customer_id for c in rest.items], [f"C{i}" for i in range(
+                20, 25)])
+        self.assertIsNone(rest.next_offset)
+
+    def test_fields_words_and_substring(self) -> None:
+        self.assertEqual(
+            [c.customer_id
+             for c in self.system.search_customers("garc").items], ["A1"])
+        self.assertEqual(
+            self.system.search_customers("ana", fields=["email"]).items,
+            [self.system.display_customer_info("A1")])
+        self.assertEqual(
+            [h.hotel_id for h in self.system.search_hotels(
+                "a", fields=["location"], substring=True).items], ["H2"])
+        with self.assertRaises(ValueError):
+            self.system.search_hotels("x", fields=["rooms"])
+
+    def test_writes_update_the_index(self) -> None:
+        self.system.search_hotels("pal")
+        self.system.modify_hotel_information("H1", name="Casa Azul")
+        self.system.delete_hotel("H2")
+        self.system.create_hotel(Hotel("H3", "Palmeras", 3, "Cancun"))
+
+        self.assertEqual(
+            [h.hotel_id for h in self.system.search_hotels("pal").items],
+            ["H3"])
+        self.assertEqual(
+            [h.hotel_id for h in self.system.search_hotels("azul").items],
+            ["H1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from reservation_system import backends
+from reservation_system.backends import (
+    CUSTOMERS,
+    HOTELS,
+    SegmentStorage,
+    migrate_to_segments,
+)
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+from reservation_system.storage import save_list, write_atomic
+
+
+class TestSegmentStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tmp.name)
+        self.storage = SegmentStorage(self.data_dir, segment_size=2)
+        self.system = ReservationSystem(
+            self.tmp.name, cached=True, storage=self.storage)
+        self.system.create_hotels([
+            Hotel(f"H{i}", f"Hotel {i}", 5, "CDMX") for i in range(5)])
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def manifest(self) -> dict:
+        path = self.data_dir / "segments" / HOTELS / "manifest.json"
+        return json.loads(path.read_text(encoding="utf-8"))["segments"]
+
+    def test_write_replaces_only_dirty_segments(self) -> None:
+        before = self.manifest()
+        self.assertEqual(len(before), 3)
+        with mock.patch.object(
+                backends, "write_atomic", wraps=write_atomic) as spy:
+            self.system.modify_hotel_information("H3", name="Renamed")
+
+        after = self.manifest()
+        self.assertEqual(len(spy.call_args_list), 2)
+        self.assertEqual(
+            [n for n in after if after[n] != before[n]], ["1"])
+        files = {p.name for p in (self.data_dir / "segments" / HOTELS)
+                 .glob("0*.json")}
+        self.assertEqual(files, set(after.values()))
+
+        self.system.delete_hotels(["H0", "H1"])
+        self.assertNotIn("0", self.manifest())
+
+    def test_other_instances_see_writes(self) -> None:
+        other = ReservationSystem(self.tmp.name, cached=True)
+        self.assertIsInstance(other.storage, SegmentStorage)
+        self.assertEqual(other.display_hotel_info("H4").name, "Hotel 4")
+
+        other.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+        other.create_reservation(Reservation("R1", "H4", "C1", 1))
+        self.assertEqual(
+            [r.reservation_id
+             for r in self.system.list_reservations_for_hotel("H4")],
+            ["R1"])
+        self.assertEqual(
+            self.storage.get(CUSTOMERS, "C1"),
+            Customer("C1", "Ana", "ana@mail.com").to_dict())
+
+    def test_failed_manifest_write_keeps_previous_state(self) -> None:
+        def fail_on_manifest(path: Path, data: object) -> None:
+            if path.name == "manifest.json":
+                raise OSError("disk full")
+            write_atomic(path, data)
+
+        with mock.patch.object(
+                backends, "write_atomic", side_effect=fail_on_manifest):
+            with self.assertRaises(OSError):
+                self.system.create_hotel(Hotel("H9", "Nueve", 5, "CDMX"))
+
+        self.assertIsNone(self.storage.get(HOTELS, "H9"))
+        self.system.create_hotel(Hotel("H8", "Ocho", 5, "CDMX"))
+        fresh = ReservationSystem(self.tmp.name)
+        self.assertEqual(
+            sorted(h.hotel_id for h in fresh.iter_entities(HOTELS)),
+            ["H0", "H1", "H2", "H3", "H4", "H8"])
+        files = {p.name for p in (self.data_dir / "segments" / HOTELS)
+                 .glob("0*.json")}
+        self.assertEqual(files, set(self.manifest().values()))
+
+
+class TestSegmentMigration(unittest.TestCase):
+    def test_json_directory_is_migrated(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            save_list(Path(tmp) / "hotels.json", [
+                Hotel("H1", "Hotel Uno", 5, "CDMX").to_dict()])
+            save_list(Path(tmp) / "customers.json", [
+                Customer("C1", "Ana", "ana@mail.com").to_dict()])
+
+            self.assertEqual(migrate_to_segments(Path(tmp)), 2)
+
+            migrated = ReservationSystem(tmp)
+            self.assertIsInstance(migrated.storage, SegmentStorage)
+            self.assertEqual(
+                migrated.display_customer_info("C1").name, "Ana")
+            self.assertTrue(
+                (Path(tmp) / "hotels.json.premigration").exists())
+            with self.assertRaises(ValueError):
+                migrate_to_segments(Path(tmp))
+
+
+if __name__ == "__main__":
+    unittest.main()
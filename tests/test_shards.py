@@ -0,0 +1,76 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from reservation_system import backends
+from reservation_system.backends import (
+    RESERVATIONS,
+    ShardedStorage,
+    migrate_to_shards,
+)
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+from reservation_system.storage import save_list
+
+
+class TestShardedStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tmp.name)
+        self.storage = ShardedStorage(self.data_dir, shards=8)
+        self.system = ReservationSystem(
+            self.tmp.name, cached=True, storage=self.storage)
+        self.system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+        self.system.create_hotel(Hotel("H2", "Hotel Dos", 5, "Monterrey"))
+        self.system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+        self.system.create_reservation(Reservation("R1", "H1", "C1", 1))
+        self.system.create_reservation(Reservation("R2", "H2", "C1", 1))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_booking_rewrites_only_its_shard(self) -> None:
+        with mock.patch.object(
+                backends, "save_list", wraps=save_list) as spy:
+            self.system.create_reservation(Reservation("R3", "H2", "C1", 2))
+
+        written = {call.args[0] for call in spy.call_args_list}
+        self.assertEqual(
+            written,
+            {self.storage._shard_path(self.storage.shard_of("H2"))})
+
+    def test_cancel_and_delete_hotel_survive_reload(self) -> None:
+        self.system.cancel_reservation("R2")
+        self.system.delete_hotel("H1")
+
+        reloaded = ReservationSystem(self.tmp.name)
+        self.assertIsInstance(reloaded.storage, ShardedStorage)
+        self.assertEqual(reloaded.list_reservations_for_customer("C1"), [])
+        self.assertIsNone(self.storage.get(RESERVATIONS, "R2"))
+
+    def test_get_uses_directory(self) -> None:
+        self.assertEqual(
+            self.storage.get(RESERVATIONS, "R2"),
+            Reservation("R2", "H2", "C1", 1).to_dict())
+
+
+class TestMigration(unittest.TestCase):
+    def test_single_file_layout_is_migrated(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            system = ReservationSystem(tmp, journal=True)
+            system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+            system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+            system.create_reservation(Reservation("R1", "H1", "C1", 1))
+            system.create_reservation(Reservation("R2", "H1", "C1", 2))
+            system.close()
+
+            self.assertEqual(migrate_to_shards(Path(tmp), shards=4), 2)
+
+            migrated = ReservationSystem(tmp)
+            self.assertIsInstance(migrated.storage, ShardedStorage)
+            self.assertEqual(
+                [r.room for r in migrated.list_reservations_for_hotel("H1")],
+                [1, 2])
+            with self.assertRaises(ValueError):
+                migrate_to_shards(Path(tmp))
@@ -0,0 +1,99 @@
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+from reservation_system import backends
+from reservation_system.backends import (
+    HOTELS,
+    JsonStorage,
+    SnapshotStorage,
+    copy_storage,
+)
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+from reservation_system.snapshot import Snapshot
+from reservation_system.storage import load_list
+
+
+class TestSnapshotStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tmp.name)
+        system = ReservationSystem(
+            self.tmp.name, storage=SnapshotStorage(self.data_dir))
+        system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+        system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+        system.create_customer(Customer("C2", "Luis", "luis@mail.com"))
+        system.create_reservation(Reservation(
+            "R1", "H1", "C1", 1, date(2024, 5, 1), date(2024, 5, 3)))
+        system.create_reservation(Reservation("R2", "H1", "C2", 2))
+        system.close()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_directory_with_snapshots_is_detected(self) -> None:
+        system = ReservationSystem(self.tmp.name)
+
+        self.assertIsInstance(system.storage, SnapshotStorage)
+        self.assertEqual(
+            [r.reservation_id
+             for r in system.list_reservations_for_hotel("H1")],
+            ["R1", "R2"])
+        self.assertEqual(
+            system.list_reservations_for_customer("C1")[0].check_out,
+            date(2024, 5, 3))
+        system.close()
+
+    def test_lookup_reads_one_record(self) -> None:
+        system = ReservationSystem(self.tmp.name)
+        with mock.patch.object(Snapshot, "__iter__") as full_scan:
+            customer = system.display_customer_info("C2")
+            with self.assertRaises(ValueError):
+                system.display_customer_info("C3")
+        full_scan.assert_not_called()
+        self.assertEqual(customer.email, "luis@mail.com")
+        system.close()
+
+    def test_replaced_mappings_are_closed(self) -> None:
+        storage = SnapshotStorage(self.data_dir)
+        system = ReservationSystem(self.tmp.name, storage=storage)
+        with mock.patch.object(
+                Snapshot, "close", autospec=True,
+                side_effect=Snapshot.close) as close:
+            for i in range(5):
+                system.modify_hotel_information("H1", name=f"Uno {i}")
+                system.display_hotel_info("H1")
+        self.assertEqual(close.call_count, 5)
+        self.assertEqual(storage._readers, {})
+
+        with storage._snapshot(HOTELS) as held:
+            system.modify_hotel_information("H1", name="Uno 5")
+            self.assertEqual(system.display_hotel_info("H1").name, "Uno 5")
+            self.assertEqual(held.get("H1")["name"], "Uno 4")
+        self.assertEqual(list(storage._readers), [])
+        system.close()
+
+    def test_export_to_json_and_back(self) -> None:
+        export_dir = self.data_dir / "export"
+        copy_storage(SnapshotStorage(self.data_dir), JsonStorage(export_dir))
+        self.assertEqual(
+            load_list(export_dir / "hotels.json"),
+            [Hotel("H1", "Hotel Uno", 5, "CDMX").to_dict()])
+
+        import_dir = self.data_dir / "import"
+        copy_storage(JsonStorage(export_dir), SnapshotStorage(import_dir))
+        self.assertEqual(
+            backends.open_storage(import_dir).load(HOTELS),
+            load_list(export_dir / "hotels.json"))
+
+    def test_rejects_unknown_version(self) -> None:
+        path = self.data_dir / "hotels.snap"
+        data = bytearray(path.read_bytes())
+        data[4] = 99
+        path.write_bytes(bytes(data))
+
+        with self.assertRaises(ValueError):
+            SnapshotStorage(self.data_dir).load(HOTELS)
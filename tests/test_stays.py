@@ -0,0 +1,96 @@
+import sqlite3
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+from reservation_system.backends import SQLiteStorage
+from reservation_system.indexes import RoomSchedule
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+from reservation_system.storage import save_list
+
+
+def _stay(rid: str, start: int, end: int, room: int = 1) -> Reservation:
+    return Reservation(
+        rid, "H1", "C1", room, date(2026, 3, start), date(2026, 3, end))
+
+
+class TestRoomSchedule(unittest.TestCase):
+    def test_conflict_checks_neighbours_only(self) -> None:
+        schedule = RoomSchedule()
+        schedule.add(date(2026, 3, 1), date(2026, 3, 4), "R1")
+        schedule.add(date(2026, 3, 10), date(2026, 3, 12), "R2")
+
+        self.assertIsNone(schedule.conflict(date(2026, 3, 4),
+                                            date(2026, 3, 10)))
+        self.assertEqual(schedule.conflict(date(2026, 3, 3),
+                                           date(2026, 3, 5)), "R1")
+        self.assertEqual(schedule.conflict(date(2026, 3, 5),
+                                           date(2026, 3, 11)), "R2")
+
+
+class TestDatedReservations(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.system = ReservationSystem(self.tmp.name, cached=True)
+        self.system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+        self.system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_back_to_back_stays_share_a_room(self) -> None:
+        self.system.create_reservation(_stay("R1", 1, 4))
+        self.system.create_reservation(_stay("R2", 4, 6))
+
+        with self.assertRaises(ValueError):
+            self.system.create_reservation(_stay("R3", 5, 7))
+
+    def test_undated_reservation_blocks_every_stay(self) -> None:
+        self.system.create_reservation(_stay("R1", 1, 4, room=2))
+        with self.assertRaises(ValueError):
+            self.system.create_reservation(Reservation("R2", "H1", "C1", 2))
+
+    def test_invalid_stay_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            self.system.create_reservation(_stay("R1", 5, 5))
+        with self.assertRaises(ValueError):
+            self.system.create_reservation(Reservation(
+                "R2", "H1", "C1", 1, check_in=date(2026, 3, 1)))
+
+    def test_dates_round_trip_and_legacy_rows_load(self) -> None:
+        self.system.create_reservation(_stay("R1", 1, 4))
+        path = Path(self.tmp.name) / "reservations.json"
+        save_list(path, [
+            _stay("R1", 1, 4).to_dict(),
+            {"reservation_id": "R0", "hotel_id": "H1",
+             "customer_id": "C1", "room": 3},
+        ])
+
+        loaded = self.system.list_reservations_for_hotel("H1")
+        self.assertEqual(loaded[0].check_out, date(2026, 3, 4))
+        self.assertIsNone(loaded[1].check_in)
+
+
+class TestSQLiteStays(unittest.TestCase):
+    def test_legacy_database_is_migrated(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "reservations.db"
+            conn = sqlite3.connect(db_path)
+            conn.executescript(
+                "CREATE TABLE reservations (reservation_id TEXT PRIMARY KEY,"
+                " hotel_id TEXT NOT NULL, customer_id TEXT NOT NULL,"
+                " room INTEGER NOT NULL, UNIQUE (hotel_id, room));"
+                "INSERT INTO reservations VALUES ('R0', 'H1', 'C1', 3);")
+            conn.close()
+
+            system = ReservationSystem(storage=SQLiteStorage(db_path))
+            system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+            system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+            system.create_reservation(_stay("R1", 1, 4))
+            system.create_reservation(_stay("R2", 4, 6))
+
+            self.assertEqual(
+                len(system.list_reservations_for_hotel("H1")), 3)
+            system.close()
@@ -0,0 +1,141 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from reservation_system import backends
+from reservation_system.backends import (
+    CUSTOMERS,
+    HOTELS,
+    RESERVATIONS,
+    SQLiteStorage,
+)
+from reservation_system.models import Customer, Hotel
+from reservation_system.services import ReservationSystem
+from reservation_system.streaming import (
+    export_jsonl,
+    import_jsonl,
+    parallel_import_jsonl,
+)
+
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.system = ReservationSystem(str(self.root / "data"), cached=True)
+        self.system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+        self.system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_import_sends_bad_rows_to_rejects_file(self) -> None:
+        source = self.root / "reservations.jsonl"
+        rejects = self.root / "rejects.jsonl"
+        rows = [
+            {"reservation_id": "R1", "hotel_id": "H1",
+             "customer_id": "C1", "room": 1},
+            {"reservation_id": "R2", "hotel_id": "H1",
+             "customer_id": "C1", "room": 1},
+            {"reservation_id": "R3", "hotel_id": "H1"},
+        ]
+        lines = [json.dumps(row) for row in rows] + ["not json"]
+        source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        summary = import_jsonl(
+            self.system, RESERVATIONS, source, rejects, chunk_size=2)
+
+        self.assertEqual((summary.accepted, summary.rejected), (1, 3))
+        reasons = [
+            json.loads(line)
+            for line in rejects.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual([r["line"] for r in reasons], [2, 3, 4])
+        self.assertEqual(reasons[0]["error"], "Room already reserved.")
+
+    def test_export_then_import_round_trip(self) -> None:
+        target = self.root / "hotels.jsonl"
+        self.assertEqual(export_jsonl(self.system, HOTELS, target), 1)
+        export_jsonl(self.system, CUSTOMERS, self.root / "customers.jsonl")
+
+        fresh = ReservationSystem(str(self.root / "copy"))
+        summary = import_jsonl(fresh, HOTELS, target)
+
+        self.assertEqual(summary.accepted, 1)
+        self.assertEqual(fresh.display_hotel_info("H1").location, "CDMX")
+
+    def test_uncached_export_streams_and_import_commits_once(self) -> None:
+        storage = SQLiteStorage(self.root / "db.sqlite")
+        source = ReservationSystem(storage=storage)
+        source.create_hotels([
+            Hotel(f"H{i}", f"Hotel {i}", 5, "CDMX") for i in range(5)])
+        target = self.root / "hotels.jsonl"
+        with mock.patch.object(
+                storage, "load", side_effect=AssertionError("full load")):
+            self.assertEqual(export_jsonl(source, HOTELS, target), 5)
+        source.close()
+
+        fresh = ReservationSystem(str(self.root / "copy"))
+        with mock.patch.object(
+                backends, "save_list", wraps=backends.save_list) as save:
+            summary = import_jsonl(
+                fresh, HOTELS, target, chunk_size=2, commit_once=True)
+        self.assertEqual(summary.accepted, 5)
+        self.assertEqual(save.call_count, 1)
+        self.assertEqual(
+            ReservationSystem(str(self.root / "copy")).display_hotel_info(
+                "H4").name, "Hotel 4")
+
+    def test_parallel_import_resolves_conflicts_across_chunks(self) -> None:
+        source = self.root / "reservations.jsonl"
+        rejects = self.root / "rejects.jsonl"
+        rows = [
+            {"reservation_id": "R1", "hotel_id": "H1",
+             "customer_id": "C1", "room": 1},
+            {"reservation_id": "R2", "hotel_id": "H1",
+             "customer_id": "C1", "room": 0},
+            {"reservation_id": "R1", "hotel_id": "H1",
+             "customer_id": "C1", "room": 2},
+            {"reservation_id": "R3", "hotel_id": "H1",
+             "customer_id": "C1", "room": 1},
+            {"reservation_id": "R4", "hotel_id": "H1",
+             "customer_id": "C1", "room": 3},
+        ]
+        lines = [json.dumps(row) for row in rows] + ["", "not json"]
+        source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        summary = parallel_import_jsonl(
+            self.system, RESERVATIONS, source, rejects,
+            chunk_size=2, workers=2)
+
+        self.assertEqual((summary.accepted, summary.rejected), (2, 4))
+        reasons = [
+            json.loads(line)
+            for line in rejects.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual([r["line"] for r in reasons], [2, 3, 4, 7])
+        self.assertEqual(
+            [r["error"] for r in reasons[:3]],
+            ["room must be > 0.", "Reservation ID already exists.",
+             "Room already reserved."])
+        self.assertEqual(
+            [r.room for r in self.system.list_reservations_for_hotel("H1")],
+            [1, 3])
+
+    def test_parallel_import_in_process(self) -> None:
+        source = self.root / "customers.jsonl"
+        source.write_text("".join(
+            json.dumps({"customer_id": f"C{i}", "name": "N",
+                        "email": "n@mail.com"}) + "\n"
+            for i in range(2, 12)), encoding="utf-8")
+
+        # The merge pass does not repeat the workers' field checks.
+        with mock.patch.object(
+                ReservationSystem, "check_customer") as check:
+            summary = parallel_import_jsonl(
+                self.system, CUSTOMERS, source, chunk_size=3, workers=1)
+
+        check.assert_not_called()
+        self.assertEqual((summary.accepted, summary.rejected), (10, 0))
+        self.assertEqual(
+            sum(1 for _ in self.system.iter_entities(CUSTOMERS)), 11)
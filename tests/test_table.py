@@ -0,0 +1,75 @@
+import dataclasses
+import tempfile
+import unittest
+from datetime import date
+
+from reservation_system.indexes import ReservationIndex
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+from reservation_system.table import ReservationTable
+
+
+class TestModels(unittest.TestCase):
+    def test_models_are_slotted_and_frozen(self) -> None:
+        hotel = Hotel("H1", "Hotel Uno", 5, "CDMX")
+        self.assertFalse(hasattr(hotel, "__dict__"))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            hotel.rooms = 10  # type: ignore[misc]
+
+
+class TestReservationTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.table = ReservationTable([
+            Reservation("R1", "H1", "C1", 1),
+            Reservation("R2", "H1", "C2", 2,
+                        date(2024, 5, 1), date(2024, 5, 3)),
+            Reservation("R3", "H2", "C1", 7),
+        ])
+
+    def test_rows_round_trip_and_share_pooled_ids(self) -> None:
+        self.assertEqual(
+            self.table["R2"],
+            Reservation("R2", "H1", "C2", 2,
+                        date(2024, 5, 1), date(2024, 5, 3)))
+        self.assertEqual(len(self.table.hotels), 2)
+        self.assertEqual(list(self.table.hotel_codes), [0, 0, 1])
+
+    def test_remove_moves_last_row_into_the_gap(self) -> None:
+        removed = self.table.remove("R1")
+
+        self.assertEqual(removed.room, 1)
+        self.assertEqual(list(self.table), ["R2", "R3"])
+        self.assertEqual(self.table["R3"].room, 7)
+        self.assertEqual(len(self.table.rooms), 2)
+
+    def test_index_from_records_matches_index_from_objects(self) -> None:
+        records = [r.to_dict() for r in self.table.values()]
+        index = ReservationIndex.from_records(records)
+
+        self.assertEqual(list(index), list(self.table.values()))
+        self.assertEqual(
+            index.room_holder("H1", 2, date(2024, 5, 2), date(2024, 5, 4)),
+            "R2")
+        self.assertEqual(
+            [r.reservation_id for r in index.for_customer("C1")],
+            ["R1", "R3"])
+
+
+class TestLooseReservationInput(unittest.TestCase):
+    def test_string_room_and_dates_are_stored_normalized(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            system = ReservationSystem(tmp, cached=True)
+            system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+            system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+            system.create_reservation(Reservation(
+                "R1", "H1", "C1", "2",  # type: ignore[arg-type]
+                "2024-05-01", "2024-05-03"))  # type: ignore[arg-type]
+
+            self.assertEqual(
+                ReservationSystem(tmp).list_reservations_for_hotel("H1"),
+                [Reservation("R1", "H1", "C1", 2,
+                             date(2024, 5, 1), date(2024, 5, 3))])
+            with self.assertRaises(ValueError):
+                system.create_reservation(Reservation(
+                    "R2", "H1", "C1", 3,
+                    "2024-05-01", "later"))  # type: ignore[arg-type]
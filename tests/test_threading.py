@@ -0,0 +1,225 @@
+import random
+import tempfile
+import threading
+import time
+import unittest
+from collections import Counter
+from datetime import date
+from unittest import mock
+
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.services import ReservationSystem
+
+HOTELS = 4
+ROOMS = 5
+CUSTOMERS = 8
+
+
+def hammer(
+    system: ReservationSystem,
+    threads: int = 8,
+    attempts: int = 60,
+    seed: int = 7,
+    readers: int = 0,
+) -> Counter:
+    """Book and cancel random rooms from many threads at once, while
+    ``readers`` threads list the bookings of every hotel and customer.
+
+    Returns a Counter of outcomes ("ok", "cancelled" or the error text);
+    failed or inconsistent reads are counted under "bad read".
+    """
+    outcomes: Counter = Counter()
+    outcomes_lock = threading.Lock()
+    start = threading.Barrier(threads + readers)
+    done = threading.Event()
+
+    def worker(worker_id: int) -> None:
+        rng = random.Random(seed + worker_id)
+        start.wait()
+        for attempt in range(attempts):
+            reservation = Reservation(
+                f"R{worker_id}-{attempt}",
+                f"H{rng.randrange(HOTELS)}",
+                f"C{rng.randrange(CUSTOMERS)}",
+                rng.randrange(1, ROOMS + 1))
+            try:
+                system.create_reservation(reservation)
+                outcome = "ok"
+                if rng.random() < 0.3:
+                    system.cancel_reservation(reservation.reservation_id)
+                    outcome = "cancelled"
+            except ValueError as exc:
+                outcome = str(exc)
+            with outcomes_lock:
+                outcomes[outcome] += 1
+
+    def reader() -> None:
+        start.wait()
+        while not done.is_set():
+            try:
+                for h in range(HOTELS):
+                    for r in system.list_reservations_for_hotel(f"H{h}"):
+                        assert r.hotel_id == f"H{h}", r
+                for c in range(CUSTOMERS):
+                    for r in system.list_reservations_for_customer(
+                            f"C{c}"):
+                        assert r.customer_id == f"C{c}", r
+            except ValueError:
+                pass  # e.g. a customer deleted meanwhile
+            except Exception as exc:
+                with outcomes_lock:
+                    outcomes["bad read"] += 1
+                    outcomes[repr(exc)] += 1
+
+    pool = [
+        threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    reading = [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in pool + reading:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    done.set()
+    for thread in reading:
+        thread.join()
+    return outcomes
+
+
+class TestThreadSafeReservationSystem(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.system = ReservationSystem(self.tmp.name, thread_safe=True)
+        self.system.create_hotels([
+            Hotel(f"H{i}", f"Hotel {i}", ROOMS, "CDMX")
+            for i in range(HOTELS)])
+        self.system.create_customers([
+            Customer(f"C{i}", f"Guest {i}", f"g{i}@mail.com")
+            for i in range(CUSTOMERS)])
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_no_room_is_double_booked_under_contention(self) -> None:
+        outcomes = hammer(self.system, readers=2)
+
+        self.assertEqual(outcomes["bad read"], 0, outcomes)
+        self.assertGreater(outcomes["Room already reserved."], 0)
+        booked = [
+            (r.hotel_id, r.room)
+            for h in range(HOTELS)
+            for r in self.system.list_reservations_for_hotel(f"H{h}")]
+        self.assertEqual(len(booked), len(set(booked)))
+        self.assertEqual(len(booked), outcomes["ok"])
+
+        reloaded = ReservationSystem(self.tmp.name)
+        for h in range(HOTELS):
+            self.assertEqual(
+                reloaded.list_reservations_for_hotel(f"H{h}"),
+                self.system.list_reservations_for_hotel(f"H{h}"))
+
+    def test_cascading_deletes_race_with_bookings(self) -> None:
+        deleter = threading.Thread(
+            target=lambda: [
+                self.system.delete_customer(f"C{i}")
+                for i in range(0, CUSTOMERS, 2)])
+        deleter.start()
+        outcomes = hammer(self.system, threads=4, attempts=30, readers=2)
+        deleter.join()
+
+        self.assertEqual(outcomes["bad read"], 0, outcomes)
+
+        for h in range(HOTELS):
+            for reservation in self.system.list_reservations_for_hotel(
+                    f"H{h}"):
+                self.system.display_customer_info(reservation.customer_id)
+
+    def test_reads_do_not_wait_for_a_slow_write(self) -> None:
+        write = self.system.storage.write
+        writing = threading.Event()
+
+        def slow_write(*args: object) -> None:
+            writing.set()
+            time.sleep(0.5)
+            write(*args)
+
+        with mock.patch.object(self.system.storage, "write", slow_write):
+            booking = threading.Thread(
+                target=self.system.create_reservation,
+                args=(Reservation("R1", "H0", "C0", 1),))
+            booking.start()
+            writing.wait()
+            started = time.perf_counter()
+            self.system.list_reservations_for_hotel("H1")
+            self.system.list_reservations_for_customer("C1")
+            self.system.free_rooms("H1")
+            elapsed = time.perf_counter() - started
+            booking.join()
+
+        self.assertLess(elapsed, 0.25)
+        self.assertEqual(
+            len(ReservationSystem(self.tmp.name).list_reservations_for_hotel(
+                "H0")), 1)
+
+    def test_reads_race_with_hotel_deletes(self) -> None:
+        doomed = [f"D{i}" for i in range(60)]
+        self.system.create_hotels([
+            Hotel(hotel_id, f"Doomed {hotel_id}", ROOMS, "Lyon")
+            for hotel_id in doomed])
+        self.system.create_reservations([
+            Reservation(f"X{hotel_id}", hotel_id, "C0", 1)
+            for hotel_id in doomed])
+        self.system.search_hotels("oome", substring=True)
+        reads = {
+            "find_available_hotels": lambda h: self.system.
+            find_available_hotels("Lyon"),
+            "dated find_available_hotels": lambda h: self.system.
+            find_available_hotels("Lyon", 1, date(2025, 1, 1),
+                                  date(2025, 1, 3)),
+            "free_rooms": lambda h: self.system.free_rooms(h),
+            "dated free_rooms": lambda h: self.system.free_rooms(
+                h, None, date(2025, 1, 1), date(2025, 1, 3)),
+            "count_free_rooms": lambda h: self.system.count_free_rooms(h),
+            "search_hotels": lambda h: self.system.search_hotels(
+                "oome", substring=True, limit=500),
+        }
+        failures: Counter = Counter()
+        done = threading.Event()
+
+        def reader(name: str) -> None:
+            read = reads[name]
+            while not done.is_set():
+                for hotel_id in doomed[::5]:
+                    try:
+                        read(hotel_id)
+                    except ValueError:
+                        pass  # the hotel is already gone
+                    except Exception as exc:
+                        failures[f"{name}: {exc!r}"] += 1
+
+        readers = [
+            threading.Thread(target=reader, args=(name,)) for name in reads]
+        for thread in readers:
+            thread.start()
+        for hotel_id in doomed:
+            self.system.delete_hotel(hotel_id)
+        done.set()
+        for thread in readers:
+            thread.join()
+
+        self.assertEqual(failures, Counter())
+        self.assertEqual(self.system.find_available_hotels("Lyon"), [])
+
+    def test_reads_see_writes_of_other_processes(self) -> None:
+        self.assertEqual(
+            self.system.display_hotel_info("H1").name, "Hotel 1")
+
+        other = ReservationSystem(self.tmp.name)
+        other.modify_hotel_information("H1", name="Renamed")
+        other.create_hotel(Hotel("H9", "Hotel 9", ROOMS, "Oaxaca"))
+        other.create_reservation(Reservation("X1", "H9", "C0", 1))
+
+        self.assertEqual(
+            self.system.display_hotel_info("H1").name, "Renamed")
+        self.assertEqual(
+            self.system.list_reservations_for_hotel("H9"),
+            [Reservation("X1", "H9", "C0", 1)])
+        self.assertEqual(self.system.free_rooms("H9", limit=1), [2])
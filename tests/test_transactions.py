@@ -0,0 +1,157 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from reservation_system import backends
+from reservation_system.backends import (
+    RESERVATIONS,
+    JsonStorage,
+    SQLiteStorage,
+)
+from reservation_system.models import Customer, Hotel, Reservation
+from reservation_system.recovery import CommitLog
+from reservation_system.services import ReservationSystem
+from reservation_system.storage import save_list
+
+
+class TestTransactions(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.system = ReservationSystem(self.tmp.name, cached=True)
+        self.system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+        self.system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_commit_writes_each_collection_once(self) -> None:
+        with mock.patch.object(
+                backends, "save_list", wraps=save_list) as spy:
+            with self.system.transaction():
+                self.system.create_hotel(Hotel("H2", "Dos", 3, "Puebla"))
+                self.system.create_reservation(
+                    Reservation("R1", "H2", "C1", 1))
+                self.system.create_reservation(
+                    Reservation("R2", "H1", "C1", 1))
+                self.assertEqual(spy.call_count, 0)
+
+        self.assertEqual(spy.call_count, 2)
+        other = ReservationSystem(self.tmp.name)
+        self.assertEqual(len(other.list_reservations_for_customer("C1")), 2)
+        self.assertFalse(CommitLog(Path(self.tmp.name)).pending())
+
+    def test_exception_discards_staged_changes(self) -> None:
+        with self.assertRaises(RuntimeError):
+            with self.system.transaction():
+                self.system.create_reservation(
+                    Reservation("R1", "H1", "C1", 1))
+                self.system.delete_customer("C1")
+                raise RuntimeError("abort")
+
+        self.assertEqual(
+            self.system.display_customer_info("C1").name, "Ana")
+        self.assertEqual(self.system.list_reservations_for_hotel("H1"), [])
+
+    def test_failed_atomic_batch_keeps_earlier_staged_work(self) -> None:
+        with self.system.transaction():
+            self.system.create_reservation(Reservation("R1", "H1", "C1", 1))
+            results = self.system.create_reservations([
+                Reservation("R2", "H1", "C1", 2),
+                Reservation("R3", "H1", "C1", 1),
+            ])
+            self.assertFalse(any(r.ok for r in results))
+            with self.assertRaises(ValueError):
+                with self.system.transaction():
+                    pass
+
+        other = ReservationSystem(self.tmp.name)
+        self.assertEqual(
+            [r.reservation_id
+             for r in other.list_reservations_for_hotel("H1")], ["R1"])
+        self.assertEqual(self.system.free_rooms("H1"), [2, 3, 4, 5])
+
+
+class TestRecovery(unittest.TestCase):
+    def test_interrupted_cascade_is_rolled_forward(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            system = ReservationSystem(tmp)
+            system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+            system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+            system.create_reservation(Reservation("R1", "H1", "C1", 1))
+
+            original = JsonStorage.write
+
+            def crash(storage, collection, *args):
+                if collection == RESERVATIONS:
+                    raise OSError("power loss")
+                return original(storage, collection, *args)
+
+            with mock.patch.object(JsonStorage, "write", crash):
+                with self.assertRaises(OSError) as raised:
+                    system.delete_hotel("H1")
+            self.assertIn(
+                "will be completed by the next write",
+                raised.exception.__notes__[0])
+            self.assertTrue(CommitLog(Path(tmp)).pending())
+
+            restarted = ReservationSystem(tmp)
+            self.assertEqual(
+                restarted.list_reservations_for_customer("C1"), [])
+            self.assertFalse(CommitLog(Path(tmp)).pending())
+
+    def test_failed_cascade_write_is_finished_before_returning(
+            self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            system = ReservationSystem(tmp, cached=True)
+            system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+            system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+            system.create_reservation(Reservation("R1", "H1", "C1", 1))
+
+            original = JsonStorage.write
+            failures = [OSError("disk hiccup")]
+
+            def flaky(storage, collection, *args):
+                if collection == RESERVATIONS and failures:
+                    raise failures.pop()
+                return original(storage, collection, *args)
+
+            with mock.patch.object(JsonStorage, "write", flaky):
+                system.delete_hotel("H1")
+
+            self.assertFalse(CommitLog(Path(tmp)).pending())
+            for current in (system, ReservationSystem(tmp)):
+                self.assertEqual(
+                    current.list_reservations_for_customer("C1"), [])
+                with self.assertRaisesRegex(ValueError, "not found"):
+                    current.display_hotel_info("H1")
+
+    def test_sqlite_cascade_is_one_sql_transaction(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "db" / "reservations.db"
+            system = ReservationSystem(
+                str(Path(tmp) / "unused"), storage=SQLiteStorage(path))
+            system.create_hotel(Hotel("H1", "Hotel Uno", 5, "CDMX"))
+            system.create_customer(Customer("C1", "Ana", "ana@mail.com"))
+            system.create_reservation(Reservation("R1", "H1", "C1", 1))
+
+            original = SQLiteStorage.write
+
+            def crash(storage, collection, *args):
+                result = original(storage, collection, *args)
+                if collection == RESERVATIONS:
+                    raise OSError("power loss")
+                return result
+
+            with mock.patch.object(SQLiteStorage, "write", crash):
+                with self.assertRaises(OSError):
+                    system.delete_hotel("H1")
+            system.storage.close()
+
+            reopened = ReservationSystem(
+                str(Path(tmp) / "unused"), storage=SQLiteStorage(path))
+            self.assertEqual(
+                reopened.display_hotel_info("H1").name, "Hotel Uno")
+            self.assertEqual(
+                len(reopened.list_reservations_for_customer("C1")), 1)
+            self.assertFalse((Path(tmp) / "unused").exists())